@@ -0,0 +1,75 @@
+"""Benchmark the cold start import time of cogentic.
+
+Each import runs in a fresh interpreter, so nothing is cached between runs. Importing the
+configuration modules (cogentic, cogentic.llm, cogentic.observability) must not load the
+orchestration, openai, or any credentials; only CogenticGroupChat pays for autogen_agentchat.
+
+Usage:
+
+    python benchmarks/import_time.py [--max-ms 100]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+MODULES = {
+    "cogentic": "import cogentic",
+    "cogentic.llm": "import cogentic.llm",
+    "cogentic.observability": "import cogentic.observability",
+    "CogenticGroupChat": "from cogentic import CogenticGroupChat",
+}
+# Modules which must not be loaded by the configuration imports
+HEAVY_MODULES = ("autogen_agentchat", "openai", "azure.identity", "dotenv", "langfuse")
+
+
+def measure(statement: str, number: int) -> float:
+    """Median time in ms of running `statement` in a fresh interpreter, less the interpreter startup."""
+
+    def run(code: str) -> float:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        return time.perf_counter() - start
+
+    baseline = statistics.median(run("pass") for _ in range(number))
+    return (statistics.median(run(statement) for _ in range(number)) - baseline) * 1000
+
+
+def loaded_heavy_modules(statement: str) -> list[str]:
+    code = f"import sys; {statement}; print(' '.join(sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    modules = set(output.split())
+    return [module for module in HEAVY_MODULES if module in modules]
+
+
+def main() -> None:
+    assert __doc__ is not None
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=5)
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=None,
+        help="Fail if a configuration import takes longer than this",
+    )
+    args = parser.parse_args()
+
+    failed = False
+    for name, statement in MODULES.items():
+        ms = measure(statement, args.number)
+        heavy = loaded_heavy_modules(statement)
+        print(f"{name:<25} {ms:8.1f} ms  loads: {', '.join(heavy) or '-'}")
+        if name == "CogenticGroupChat":
+            continue
+        if heavy or (args.max_ms is not None and ms > args.max_ms):
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
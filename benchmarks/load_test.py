@@ -0,0 +1,344 @@
+"""Load test concurrent CogenticGroupChat runs against a local stub model server.
+
+The stub server (CogenticStubServer) runs in its own process, so it doesn't compete with the runs for the
+event loop. It speaks the Azure OpenAI chat completions API, with configurable latency, token rate, server
+errors and throttling, and answers every orchestrator prompt with a valid response. The runs use the real
+client stack: get_model_client, CogenticChatCompletionClient and AzureOpenAIChatCompletionClient, for the
+orchestrator and for AssistantAgent team members.
+
+For each concurrency level, this reports the run throughput, the p50/p95/p99 run latency, the event loop
+lag (how late a periodic timer fires, which grows as the loop saturates) and the memory per concurrent run.
+
+Usage:
+
+    python benchmarks/load_test.py --concurrency 1 8 32 128 --latency 0.5 --latency-distribution lognormal \\
+        --tokens-per-second 80 --throttle-rate 0.02 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+import warnings
+from multiprocessing.connection import Connection
+
+from autogen_agentchat.agents import AssistantAgent
+from autogen_core.models import ModelInfo
+
+from cogentic import CogenticGroupChat
+from cogentic.llm import (
+    CogenticClientPool,
+    CogenticModelRegistry,
+    ModelDetails,
+    get_model_client,
+)
+from cogentic.testing import (
+    CogenticFakeScenario,
+    CogenticStubServer,
+    CogenticStubServerConfig,
+)
+
+MODEL = "gpt-4o"
+TEAM = ("Alice", "Bob")
+
+
+def serve(config_json: str, connection: Connection) -> None:
+    """Run the stub server until told to stop, answering requests for its stats."""
+
+    async def main() -> None:
+        server = CogenticStubServer(
+            CogenticStubServerConfig.model_validate_json(config_json)
+        )
+        await server.start()
+        connection.send(server.port)
+        loop = asyncio.get_running_loop()
+        while (command := await loop.run_in_executor(None, connection.recv)) != "stop":
+            assert command == "stats"
+            connection.send(server.stats.model_dump())
+        await server.close()
+
+    asyncio.run(main())
+
+
+def rss_bytes() -> int:
+    """The resident memory of this process."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        # The peak rather than the current memory, in KB on Linux and bytes on macOS
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def percentile(values: list[float], q: float) -> float:
+    """The nearest-rank percentile, q in [0, 100]."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+class LoopMonitor:
+    """Samples the event loop lag and the memory while the runs are going."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.lags: list[float] = []
+        self.peak_rss = 0
+        self._task: asyncio.Task[None] | None = None
+
+    async def _sample(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(time.perf_counter() - start - self.interval)
+            self.peak_rss = max(self.peak_rss, rss_bytes())
+
+    def __enter__(self) -> "LoopMonitor":
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        return self
+
+    def __exit__(self, *_) -> None:
+        assert self._task is not None
+        self._task.cancel()
+
+
+async def run_team(
+    index: int, registry: CogenticModelRegistry, pool: CogenticClientPool, stream: bool
+) -> None:
+    session_id = f"load-{index}"
+
+    def client(name: str):
+        return get_model_client(
+            MODEL, name=name, session_id=session_id, pool=pool, registry=registry
+        )
+
+    team = CogenticGroupChat(
+        participants=[
+            AssistantAgent(
+                name,
+                model_client=client(name),
+                description=f"{name} is a helpful assistant.",
+            )
+            for name in TEAM
+        ],
+        model_client=client("orchestrator"),
+        stream_output=stream,
+    )
+    # The marker tells the stub server which scenario the requests belong to
+    await team.run(task=f"[run {session_id}] What is the answer?")
+
+
+async def run_level(
+    concurrency: int,
+    runs: int,
+    first_index: int,
+    registry: CogenticModelRegistry,
+    pool: CogenticClientPool,
+    stream: bool,
+) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    failures = 0
+
+    async def run(index: int) -> None:
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await run_team(index, registry, pool, stream)
+            except Exception as e:
+                failures += 1
+                logging.getLogger(__name__).warning("Run %d failed: %r", index, e)
+                return
+            latencies.append(time.perf_counter() - start)
+
+    baseline_rss = rss_bytes()
+    start = time.perf_counter()
+    with LoopMonitor() as monitor:
+        await asyncio.gather(*(run(first_index + i) for i in range(runs)))
+    elapsed = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "runs": runs,
+        "failed": failures,
+        "seconds": elapsed,
+        "runs_per_second": len(latencies) / elapsed,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "lag_p50_ms": percentile(monitor.lags, 50) * 1000,
+        "lag_p99_ms": percentile(monitor.lags, 99) * 1000,
+        "lag_max_ms": max(monitor.lags, default=0.0) * 1000,
+        "mb_per_run": max(0, monitor.peak_rss - baseline_rss) / concurrency / 2**20,
+    }
+
+
+async def load_test(
+    args: argparse.Namespace, endpoint: str, server: Connection
+) -> list[dict]:
+    registry = CogenticModelRegistry(
+        [
+            ModelDetails(
+                name=MODEL,
+                info=ModelInfo(
+                    family="gpt-4o",
+                    vision=True,
+                    function_calling=True,
+                    json_output=True,
+                ),
+                endpoint=endpoint,
+                api_key="load-test",
+            )
+        ]
+    )
+    pool = CogenticClientPool(max_connections=args.max_connections)
+    results = []
+    index = 0
+    try:
+        for concurrency in args.concurrency:
+            runs = args.runs or 2 * concurrency
+            server.send("stats")
+            before = server.recv()
+            result = await run_level(
+                concurrency, runs, index, registry, pool, args.stream
+            )
+            server.send("stats")
+            after = server.recv()
+            result["requests"] = after["requests"] - before["requests"]
+            result["throttled"] = after["throttled"] - before["throttled"]
+            result["errors"] = after["errors"] - before["errors"]
+            result["requests_per_second"] = result["requests"] / result["seconds"]
+            results.append(result)
+            index += runs
+            print_result(result, header=len(results) == 1)
+    finally:
+        await pool.close()
+    return results
+
+
+# Key, title and format of each column
+COLUMNS = (
+    ("concurrency", "conc", "d"),
+    ("runs", "runs", "d"),
+    ("failed", "fail", "d"),
+    ("runs_per_second", "runs/s", ".2f"),
+    ("requests_per_second", "req/s", ".1f"),
+    ("p50", "p50 s", ".2f"),
+    ("p95", "p95 s", ".2f"),
+    ("p99", "p99 s", ".2f"),
+    ("lag_p50_ms", "lag p50", ".1f"),
+    ("lag_p99_ms", "lag p99", ".1f"),
+    ("lag_max_ms", "lag max", ".1f"),
+    ("mb_per_run", "MB/run", ".2f"),
+    ("throttled", "429s", "d"),
+    ("errors", "5xx", "d"),
+)
+WIDTH = 8
+
+
+def print_result(result: dict, header: bool) -> None:
+    if header:
+        print(" ".join(f"{title:>{WIDTH}}" for _, title, _ in COLUMNS))
+    print(
+        " ".join(f"{result[key]:>{WIDTH}{fmt}}" for key, _, fmt in COLUMNS),
+        flush=True,
+    )
+
+
+def main() -> None:
+    assert __doc__ is not None
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 8, 32],
+        help="Concurrent runs, per level",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=None,
+        help="Runs per level. Defaults to twice the concurrency",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.2, help="Seconds to the first token"
+    )
+    parser.add_argument(
+        "--latency-distribution",
+        choices=["fixed", "uniform", "lognormal", "exponential"],
+        default="lognormal",
+    )
+    parser.add_argument("--latency-spread", type=float, default=0.5)
+    parser.add_argument("--tokens-per-second", type=float, default=None)
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Share of requests failing with a 500",
+    )
+    parser.add_argument(
+        "--throttle-rate",
+        type=float,
+        default=0.0,
+        help="Share of requests failing with a 429",
+    )
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--hypotheses", type=int, default=2)
+    parser.add_argument("--tests-per-hypothesis", type=int, default=2)
+    parser.add_argument("--turns-per-test", type=int, default=1)
+    parser.add_argument(
+        "--stream", action="store_true", help="Stream the orchestrator's reasoning"
+    )
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+
+    # The team's chatter isn't interesting here
+    logging.basicConfig(level=logging.ERROR)
+    warnings.simplefilter("ignore")
+
+    config = CogenticStubServerConfig(
+        latency=args.latency,
+        latency_distribution=args.latency_distribution,
+        latency_spread=args.latency_spread,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        # What Azure reports for the gpt-4o deployments
+        model="gpt-4o-2024-08-06",
+        scenario=CogenticFakeScenario(
+            hypotheses=args.hypotheses,
+            tests_per_hypothesis=args.tests_per_hypothesis,
+            turns_per_test=args.turns_per_test,
+        ),
+        seed=args.seed,
+    )
+    connection, server_connection = multiprocessing.Pipe()
+    server = multiprocessing.Process(
+        target=serve, args=(config.model_dump_json(), server_connection), daemon=True
+    )
+    server.start()
+    try:
+        port = connection.recv()
+        results = asyncio.run(load_test(args, f"http://127.0.0.1:{port}", connection))
+    finally:
+        connection.send("stop")
+        server.join(timeout=5)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
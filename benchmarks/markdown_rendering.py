@@ -0,0 +1,99 @@
+"""Benchmark markdown rendering of large plans.
+
+Compares a full pydantic re-serialization against the cached fragment rendering used by
+CogenticBaseModel, both for unchanged plans and for plans where a single test changed between
+renders (the common case between two replans).
+
+Usage:
+
+    python benchmarks/markdown_rendering.py
+"""
+
+import timeit
+
+from cogentic.orchestration.models.action import CogenticAction
+from cogentic.orchestration.models.evidence import CogenticTestEvidence
+from cogentic.orchestration.models.hypothesis import CogenticHypothesis
+from cogentic.orchestration.models.plan import CogenticPlan
+from cogentic.orchestration.models.test import CogenticTest, CogenticTestTeamMemberPlan
+
+TEXT = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4
+
+
+def create_large_plan(
+    hypotheses: int = 20, tests: int = 5, evidence: int = 200, actions: int = 400
+) -> CogenticPlan:
+    return CogenticPlan(
+        hypotheses=[
+            CogenticHypothesis(
+                name=f"hypothesis-{i}",
+                hypothesis=f"Hypothesis {i}: {TEXT}",
+                state="unverified",
+                completion_summary=None,
+                tests=[
+                    CogenticTest(
+                        name=f"test-{i}-{j}",
+                        description=TEXT,
+                        goal=TEXT,
+                        state="incomplete",
+                        plan=[
+                            CogenticTestTeamMemberPlan(
+                                name=f"member-{k}", action=TEXT, rationale=TEXT
+                            )
+                            for k in range(3)
+                        ],
+                        result_summary=None,
+                    )
+                    for j in range(tests)
+                ],
+            )
+            for i in range(hypotheses)
+        ],
+        evidence=[
+            CogenticTestEvidence(
+                test_name=f"test-{i}", team_member_name="member-0", content=TEXT
+            )
+            for i in range(evidence)
+        ],
+        actions=[
+            CogenticAction(
+                goal=TEXT,
+                outcome=TEXT,
+                test_name=f"test-{i}",
+                team_member_name="member-0",
+            )
+            for i in range(actions)
+        ],
+    )
+
+
+def main(number: int = 50) -> None:
+    plan = create_large_plan()
+    size = len(plan.model_dump_json(indent=2))
+    print(f"Plan size: {size / 1024:.0f} KiB of json")
+
+    def pydantic_render() -> str:
+        return f"```json\n{plan.model_dump_json(indent=2)}\n```"
+
+    def mutate() -> None:
+        test = plan.hypotheses[0].tests[0]
+        test.state = "complete" if test.state == "incomplete" else "incomplete"
+
+    assert plan.model_dump_markdown() == pydantic_render()
+
+    results = {
+        "pydantic (unchanged)": timeit.timeit(pydantic_render, number=number),
+        "cached (unchanged)": timeit.timeit(plan.model_dump_markdown, number=number),
+        "pydantic (one test changed)": timeit.timeit(
+            lambda: (mutate(), pydantic_render()), number=number
+        ),
+        "cached (one test changed)": timeit.timeit(
+            lambda: (mutate(), plan.model_dump_markdown()), number=number
+        ),
+    }
+    for name, seconds in results.items():
+        print(f"{name:<30} {seconds / number * 1000:8.3f} ms/render")
+
+
+if __name__ == "__main__":
+    main()
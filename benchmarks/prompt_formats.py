@@ -0,0 +1,93 @@
+"""Benchmark the prompt tokens of the plan render formats.
+
+Renders the current state, replan and final answer prompts of a large plan in each format (see
+CogenticRenderFormat), and reports their prompt tokens, as counted by a model client's `count_tokens`, and
+the savings over the default indented json.
+
+Counting uses OpenAIChatCompletionClient (tiktoken) for `--model`. When its encoding can't be loaded,
+e.g. offline, the fake client's estimate of four characters per token is used instead.
+
+Usage:
+
+    python benchmarks/prompt_formats.py --model gpt-4o
+"""
+
+import argparse
+
+from autogen_core.models import ChatCompletionClient, LLMMessage, UserMessage
+from markdown_rendering import create_large_plan
+
+from cogentic.orchestration.models.render import CogenticRenderFormat
+from cogentic.orchestration.prompts import (
+    create_current_state_prompt,
+    create_final_answer_prompt,
+)
+from cogentic.testing import CogenticFakeChatCompletionClient
+
+FORMATS: list[CogenticRenderFormat] = ["json", "compact_json", "table", "yaml"]
+TEAM = "| Name | Description |\n| ---- | ----------- |\n| member-0 | A team member |"
+
+
+def token_counter(model: str) -> tuple[str, ChatCompletionClient]:
+    """A client counting tokens for the model, or the fake client's estimate if its encoding is unavailable."""
+    try:
+        from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+        client = OpenAIChatCompletionClient(model=model, api_key="unused")
+        client.count_tokens([UserMessage(content="warm up", source="user")])
+        return model, client
+    except Exception as e:
+        print(
+            f"Can't count tokens for {model} ({type(e).__name__}), estimating instead"
+        )
+        return "estimate", CogenticFakeChatCompletionClient()
+
+
+def prompts(format: CogenticRenderFormat) -> dict[str, list[LLMMessage]]:
+    plan = create_large_plan(hypotheses=8, tests=4, evidence=60, actions=120)
+    question = "What is the answer?"
+    # The replan prompt renders the current state too, so it shares its size
+    return {
+        "current_state": [
+            UserMessage(
+                content=create_current_state_prompt(question, TEAM, plan, format),
+                source="user",
+            )
+        ],
+        "final_answer": [
+            UserMessage(
+                content=create_final_answer_prompt(
+                    question, "No work remaining.", plan, format
+                ),
+                source="user",
+            )
+        ],
+    }
+
+
+def main() -> None:
+    assert __doc__ is not None
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model", default="gpt-4o")
+    args = parser.parse_args()
+
+    counter_name, counter = token_counter(args.model)
+    counts = {
+        format: {
+            prompt: counter.count_tokens(messages)
+            for prompt, messages in prompts(format).items()
+        }
+        for format in FORMATS
+    }
+    print(f"Prompt tokens ({counter_name})")
+    print(f"{'format':<14} {'prompt':<14} {'tokens':>8} {'saved':>7}")
+    for format, prompt_counts in counts.items():
+        for prompt, tokens in prompt_counts.items():
+            baseline = counts["json"][prompt]
+            print(
+                f"{format:<14} {prompt:<14} {tokens:>8} {1 - tokens / baseline:>7.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Benchmark the CPU overhead of the orchestrator, with fake models and team members.
+
+Every model call is answered instantly by CogenticFakeChatCompletionClient, so the measured time is the
+orchestrator's own work: prompt rendering, JSON parsing and validation, plan updates and message routing.
+Runs are measured per turn (one team member reply and progress ledger), per replan cycle and per run, while
+the plan and the message thread grow. Each benchmark fails when it exceeds its threshold.
+
+Usage:
+
+    python -m pytest benchmarks/test_orchestrator_overhead.py
+
+Thresholds are in CPU milliseconds, and can be scaled for slower machines with COGENTIC_BENCHMARK_SLACK
+(e.g. COGENTIC_BENCHMARK_SLACK=2).
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from cogentic import CogenticGroupChat
+from cogentic.testing import (
+    CogenticFakeChatCompletionClient,
+    CogenticFakeParticipant,
+    CogenticFakeScenario,
+)
+
+SLACK = float(os.environ.get("COGENTIC_BENCHMARK_SLACK", "1"))
+
+# CPU milliseconds
+MAX_TURN_MS = 40.0
+MAX_REPLAN_MS = 80.0
+MAX_RUN_MS = 250.0
+# How much more a turn may cost in the largest plan (or longest thread) than in the smallest
+MAX_TURN_GROWTH = 3.0
+
+
+def run_team(
+    scenario: CogenticFakeScenario, **kwargs
+) -> CogenticFakeChatCompletionClient:
+    """Run a fake team through the scenario, returning the fake client for its call log."""
+    client = CogenticFakeChatCompletionClient(scenario)
+    team = CogenticGroupChat(
+        participants=[CogenticFakeParticipant("Alice"), CogenticFakeParticipant("Bob")],
+        model_client=client,
+        max_turns_total=None,
+        max_turns_per_hypothesis=None,
+        max_turns_per_test=None,
+        **kwargs,
+    )
+    asyncio.run(team.run(task="What is the answer?"))
+    return client
+
+
+def turns(client: CogenticFakeChatCompletionClient) -> int:
+    return client.calls.count("CogenticProgressLedgerWithSpeakers")
+
+
+def benchmark_turns(benchmark, scenario: CogenticFakeScenario, **kwargs) -> float:
+    """Benchmark a run, and return the CPU milliseconds per turn."""
+    client = benchmark.pedantic(
+        run_team, args=(scenario,), kwargs=kwargs, rounds=5, warmup_rounds=1
+    )
+    turn_ms = benchmark.stats.stats.mean * 1000 / turns(client)
+    benchmark.extra_info["turns"] = turns(client)
+    benchmark.extra_info["turn_ms"] = turn_ms
+    assert turn_ms < MAX_TURN_MS * SLACK
+    return turn_ms
+
+
+PLAN_SIZES = [1, 8, 32]
+THREAD_LENGTHS = [1, 16, 64]
+_plan_turn_ms: dict[int, float] = {}
+_thread_turn_ms: dict[int, float] = {}
+
+
+@pytest.mark.benchmark(group="run", timer=time.process_time)
+@pytest.mark.parametrize("use_plan_patches", [False, True])
+def test_run(benchmark, use_plan_patches):
+    benchmark.pedantic(
+        run_team,
+        args=(CogenticFakeScenario(),),
+        kwargs={"use_plan_patches": use_plan_patches},
+        rounds=10,
+        warmup_rounds=1,
+    )
+    assert benchmark.stats.stats.mean * 1000 < MAX_RUN_MS * SLACK
+
+
+@pytest.mark.benchmark(group="turn-by-plan-size", timer=time.process_time)
+@pytest.mark.parametrize("hypotheses", PLAN_SIZES)
+def test_turn_by_plan_size(benchmark, hypotheses):
+    _plan_turn_ms[hypotheses] = benchmark_turns(
+        benchmark, CogenticFakeScenario(hypotheses=hypotheses, tests_per_hypothesis=4)
+    )
+
+
+def test_turn_cost_is_flat_in_plan_size():
+    if len(_plan_turn_ms) < len(PLAN_SIZES):
+        pytest.skip("Plan size benchmarks did not run")
+    growth = _plan_turn_ms[PLAN_SIZES[-1]] / _plan_turn_ms[PLAN_SIZES[0]]
+    assert growth < MAX_TURN_GROWTH * SLACK
+
+
+@pytest.mark.benchmark(group="turn-by-thread-length", timer=time.process_time)
+@pytest.mark.parametrize("turns_per_test", THREAD_LENGTHS)
+def test_turn_by_thread_length(benchmark, turns_per_test):
+    _thread_turn_ms[turns_per_test] = benchmark_turns(
+        benchmark,
+        CogenticFakeScenario(
+            hypotheses=1, tests_per_hypothesis=1, turns_per_test=turns_per_test
+        ),
+    )
+
+
+def test_turn_cost_is_flat_in_thread_length():
+    if len(_thread_turn_ms) < len(THREAD_LENGTHS):
+        pytest.skip("Thread length benchmarks did not run")
+    growth = _thread_turn_ms[THREAD_LENGTHS[-1]] / _thread_turn_ms[THREAD_LENGTHS[0]]
+    assert growth < MAX_TURN_GROWTH * SLACK
+
+
+@pytest.mark.benchmark(group="replan", timer=time.process_time)
+@pytest.mark.parametrize("use_plan_patches", [False, True])
+def test_replan(benchmark, use_plan_patches):
+    # Every replan adds a hypothesis with a single one-turn test, so a replan cycle is a hypothesis
+    # update, a plan update, a next step and a single turn
+    replans = 16
+    benchmark.pedantic(
+        run_team,
+        args=(
+            CogenticFakeScenario(hypotheses=1, tests_per_hypothesis=1, replans=replans),
+        ),
+        kwargs={"use_plan_patches": use_plan_patches},
+        rounds=5,
+        warmup_rounds=1,
+    )
+    replan_ms = benchmark.stats.stats.mean * 1000 / (replans + 1)
+    benchmark.extra_info["replan_ms"] = replan_ms
+    assert replan_ms < MAX_REPLAN_MS * SLACK
@@ -1,5 +1,32 @@
-from cogentic.orchestration import CogenticGroupChat
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from cogentic.orchestration import (
+        CogenticBatchRunner,
+        CogenticGroupChat,
+        CogenticProcessPoolRunner,
+    )
+
+
+def __getattr__(name: str) -> Any:
+    # Imported on first use, so that importing a subpackage doesn't load the orchestration (and autogen_agentchat)
+    if name == "CogenticGroupChat":
+        from cogentic.orchestration import CogenticGroupChat
+
+        return CogenticGroupChat
+    if name == "CogenticBatchRunner":
+        from cogentic.orchestration import CogenticBatchRunner
+
+        return CogenticBatchRunner
+    if name == "CogenticProcessPoolRunner":
+        from cogentic.orchestration import CogenticProcessPoolRunner
+
+        return CogenticProcessPoolRunner
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "CogenticGroupChat",
+    "CogenticBatchRunner",
+    "CogenticProcessPoolRunner",
 ]
@@ -0,0 +1,60 @@
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from cogentic.distributed.messages import (
+        CogenticParticipantRequest,
+        CogenticParticipantReset,
+        CogenticParticipantResponse,
+        participant_message_serializers,
+    )
+    from cogentic.distributed.participant import (
+        CogenticParticipantAgent,
+        CogenticRemoteParticipant,
+        participant_agent_type,
+        register_participant,
+    )
+    from cogentic.distributed.worker import (
+        connect,
+        run_participant_worker,
+        serve_participant,
+    )
+
+# Imported on first use, so importing cogentic.distributed doesn't require autogen-ext[grpc]
+_LAZY_IMPORTS = {
+    "CogenticParticipantRequest": "cogentic.distributed.messages",
+    "CogenticParticipantReset": "cogentic.distributed.messages",
+    "CogenticParticipantResponse": "cogentic.distributed.messages",
+    "participant_message_serializers": "cogentic.distributed.messages",
+    "CogenticParticipantAgent": "cogentic.distributed.participant",
+    "CogenticRemoteParticipant": "cogentic.distributed.participant",
+    "participant_agent_type": "cogentic.distributed.participant",
+    "register_participant": "cogentic.distributed.participant",
+    "connect": "cogentic.distributed.worker",
+    "run_participant_worker": "cogentic.distributed.worker",
+    "serve_participant": "cogentic.distributed.worker",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = [
+    "CogenticParticipantRequest",
+    "CogenticParticipantReset",
+    "CogenticParticipantResponse",
+    "participant_message_serializers",
+    "CogenticParticipantAgent",
+    "CogenticRemoteParticipant",
+    "participant_agent_type",
+    "register_participant",
+    "connect",
+    "run_participant_worker",
+    "serve_participant",
+]
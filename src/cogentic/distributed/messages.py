@@ -0,0 +1,65 @@
+from typing import Any
+
+from autogen_agentchat.messages import AgentEvent, ChatMessage, MultiModalMessage
+from autogen_core import Image, MessageSerializer, try_get_known_serializers_for_type
+from pydantic import BaseModel, Field, field_validator
+
+
+def _load_multimodal_message(value: Any) -> Any:
+    """Load a serialized MultiModalMessage, which autogen can't validate when its content has text."""
+    if not (isinstance(value, dict) and value.get("type") == "MultiModalMessage"):
+        return value
+    content = [
+        Image.from_base64(item["data"]) if isinstance(item, dict) else item
+        for item in value.get("content", [])
+    ]
+    return MultiModalMessage.model_construct(**{**value, "content": content})
+
+
+class CogenticParticipantRequest(BaseModel):
+    """Asks a remote participant to act on the messages since its previous turn."""
+
+    messages: list[ChatMessage] = Field(
+        description="The messages the participant hasn't seen yet"
+    )
+
+    @field_validator("messages", mode="before")
+    @classmethod
+    def _load_messages(cls, value: Any) -> Any:
+        return [_load_multimodal_message(message) for message in value]
+
+
+class CogenticParticipantResponse(BaseModel):
+    """What a remote participant produced on its turn."""
+
+    chat_message: ChatMessage
+    inner_messages: list[AgentEvent | ChatMessage] | None = None
+
+    @field_validator("chat_message", mode="before")
+    @classmethod
+    def _load_chat_message(cls, value: Any) -> Any:
+        return _load_multimodal_message(value)
+
+    @field_validator("inner_messages", mode="before")
+    @classmethod
+    def _load_inner_messages(cls, value: Any) -> Any:
+        if value is None:
+            return None
+        return [_load_multimodal_message(message) for message in value]
+
+
+class CogenticParticipantReset(BaseModel):
+    """Asks a remote participant to forget the conversation."""
+
+
+def participant_message_serializers() -> list[MessageSerializer[Any]]:
+    """The serializers of the messages exchanged with remote participants, to add to every runtime involved."""
+    return [
+        serializer
+        for message_type in (
+            CogenticParticipantRequest,
+            CogenticParticipantResponse,
+            CogenticParticipantReset,
+        )
+        for serializer in try_get_known_serializers_for_type(message_type)
+    ]
@@ -0,0 +1,143 @@
+import random
+from collections.abc import Callable, Sequence
+from uuid import uuid4
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import ChatAgent, Response
+from autogen_agentchat.messages import ChatMessage, TextMessage
+from autogen_core import (
+    AgentId,
+    AgentRuntime,
+    CancellationToken,
+    MessageContext,
+    RoutedAgent,
+    message_handler,
+)
+
+from cogentic.distributed.messages import (
+    CogenticParticipantRequest,
+    CogenticParticipantReset,
+    CogenticParticipantResponse,
+    participant_message_serializers,
+)
+
+
+def participant_agent_type(name: str, worker: int = 0) -> str:
+    """The agent type a worker serves a participant under. Every worker of a participant has its own type."""
+    return f"cogentic.participant.{name}.{worker}"
+
+
+class CogenticParticipantAgent(RoutedAgent):
+    """Hosts a participant in a worker runtime, answering the requests of a `CogenticRemoteParticipant`.
+
+    The runtime creates an agent per team (the agent key), so every team talks to its own participant.
+    """
+
+    def __init__(self, participant: ChatAgent):
+        super().__init__(participant.description)
+        self._participant = participant
+
+    @message_handler
+    async def handle_request(
+        self, message: CogenticParticipantRequest, ctx: MessageContext
+    ) -> CogenticParticipantResponse:
+        response = await self._participant.on_messages(
+            message.messages, ctx.cancellation_token
+        )
+        return CogenticParticipantResponse(
+            chat_message=response.chat_message,
+            inner_messages=list(response.inner_messages)
+            if response.inner_messages
+            else None,
+        )
+
+    @message_handler
+    async def handle_reset(
+        self, message: CogenticParticipantReset, ctx: MessageContext
+    ) -> None:
+        await self._participant.on_reset(ctx.cancellation_token)
+
+
+async def register_participant(
+    runtime: AgentRuntime,
+    name: str,
+    factory: Callable[[], ChatAgent],
+    worker: int = 0,
+) -> None:
+    """Serve a participant from a runtime.
+
+    Args:
+        runtime (AgentRuntime): The runtime of the worker.
+        name (str): The name of the participant, as used by the `CogenticRemoteParticipant`.
+        factory (Callable[[], ChatAgent]): Creates the participant. Called for every team the participant joins.
+        worker (int): The number of this worker, when several workers serve the participant. Defaults to 0.
+    """
+    runtime.add_message_serializer(participant_message_serializers())
+    await CogenticParticipantAgent.register(
+        runtime,
+        participant_agent_type(name, worker),
+        lambda: CogenticParticipantAgent(factory()),
+    )
+
+
+class CogenticRemoteParticipant(BaseChatAgent):
+    """A team member living in another runtime, e.g. a worker process connected through autogen's gRPC host.
+
+    Add it to a `CogenticGroupChat` in place of the actual participant, which is served by one or more
+    workers with `register_participant` (or `serve_participant`). The orchestrator and the other participants
+    stay in the team's process, while heavy participants such as web surfers and code executors run on
+    their own workers. Each team is assigned one of the workers, which keeps the participant's conversation.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        runtime: AgentRuntime,
+        workers: int = 1,
+        produced_message_types: Sequence[type[ChatMessage]] = (TextMessage,),
+    ):
+        """Initialize the remote participant.
+
+        Args:
+            name (str): The name of the participant, as served by the workers.
+            description (str): The description of the participant, used by the orchestrator.
+            runtime (AgentRuntime): A started runtime connected to the workers, e.g. a GrpcWorkerAgentRuntime. Can be shared by many teams.
+            workers (int): The number of workers serving the participant. Defaults to 1.
+            produced_message_types (Sequence[type[ChatMessage]]): The message types the participant produces. Defaults to TextMessage.
+        """
+        super().__init__(name=name, description=description)
+        runtime.add_message_serializer(participant_message_serializers())
+        self._runtime = runtime
+        self._produced_message_types = tuple(produced_message_types)
+        # Every team gets its own participant, on a random worker
+        self._agent_id = AgentId(
+            participant_agent_type(name, random.randrange(workers)), uuid4().hex
+        )
+
+    @property
+    def produced_message_types(self) -> Sequence[type[ChatMessage]]:
+        return self._produced_message_types
+
+    async def on_messages(
+        self, messages: Sequence[ChatMessage], cancellation_token: CancellationToken
+    ) -> Response:
+        response = await self._runtime.send_message(
+            CogenticParticipantRequest(messages=list(messages)),
+            self._agent_id,
+            cancellation_token=cancellation_token,
+        )
+        if not isinstance(response, CogenticParticipantResponse):
+            raise TypeError(
+                f"Expected a CogenticParticipantResponse from {self.name}, got {type(response).__name__}."
+            )
+        return Response(
+            chat_message=response.chat_message, inner_messages=response.inner_messages
+        )
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        await self._runtime.send_message(
+            CogenticParticipantReset(),
+            self._agent_id,
+            cancellation_token=cancellation_token,
+        )
@@ -0,0 +1,62 @@
+import asyncio
+import signal
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from autogen_agentchat.base import ChatAgent
+
+from cogentic.distributed.messages import participant_message_serializers
+from cogentic.distributed.participant import register_participant
+
+if TYPE_CHECKING:
+    from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntime
+
+
+async def connect(host_address: str) -> "GrpcWorkerAgentRuntime":
+    """Start a worker runtime connected to a gRPC host, for the teams' `CogenticRemoteParticipant`s.
+
+    Requires `autogen-ext[grpc]`.
+
+    Args:
+        host_address (str): The address of the GrpcWorkerAgentRuntimeHost, e.g. "localhost:50051".
+    """
+    from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntime
+
+    runtime = GrpcWorkerAgentRuntime(host_address=host_address)
+    runtime.add_message_serializer(participant_message_serializers())
+    await runtime.start()
+    return runtime
+
+
+async def serve_participant(
+    host_address: str,
+    name: str,
+    factory: Callable[[], ChatAgent],
+    worker: int = 0,
+) -> "GrpcWorkerAgentRuntime":
+    """Serve a participant from a worker runtime connected to a gRPC host. Stop the returned runtime when done.
+
+    Args:
+        host_address (str): The address of the GrpcWorkerAgentRuntimeHost, e.g. "localhost:50051".
+        name (str): The name of the participant, as used by the `CogenticRemoteParticipant`.
+        factory (Callable[[], ChatAgent]): Creates the participant. Called for every team the participant joins.
+        worker (int): The number of this worker, when several workers serve the participant. Defaults to 0.
+    """
+    runtime = await connect(host_address)
+    await register_participant(runtime, name, factory, worker)
+    return runtime
+
+
+def run_participant_worker(
+    host_address: str,
+    name: str,
+    factory: Callable[[], ChatAgent],
+    worker: int = 0,
+) -> None:
+    """Serve a participant until SIGTERM or SIGINT. The target of a worker process, see `serve_participant`."""
+
+    async def main() -> None:
+        runtime = await serve_participant(host_address, name, factory, worker)
+        await runtime.stop_when_signal((signal.SIGTERM, signal.SIGINT))
+
+    asyncio.run(main())
@@ -1,10 +1,60 @@
-import os
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from cogentic.llm.balancer import (
+        CogenticBalancedChatCompletionClient,
+        CogenticDeploymentState,
+    )
+    from cogentic.llm.pool import (
+        DEFAULT_CLIENT_POOL,
+        CogenticClientPool,
+        close_model_clients,
+    )
+    from cogentic.llm.registry import (
+        CogenticModelRegistry,
+        ModelDeployment,
+        ModelDetails,
+        get_model_client,
+        get_model_registry,
+    )
+    from cogentic.llm.tokens import CogenticTokenManager
+
+# Imported on first use, so importing cogentic.llm has no side effects and stays fast
+_LAZY_IMPORTS = {
+    "get_model_client": "cogentic.llm.registry",
+    "get_model_registry": "cogentic.llm.registry",
+    "CogenticModelRegistry": "cogentic.llm.registry",
+    "ModelDetails": "cogentic.llm.registry",
+    "ModelDeployment": "cogentic.llm.registry",
+    "CogenticBalancedChatCompletionClient": "cogentic.llm.balancer",
+    "CogenticDeploymentState": "cogentic.llm.balancer",
+    "close_model_clients": "cogentic.llm.pool",
+    "CogenticClientPool": "cogentic.llm.pool",
+    "DEFAULT_CLIENT_POOL": "cogentic.llm.pool",
+    "CogenticTokenManager": "cogentic.llm.tokens",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
 
-if os.environ.get("AZURE_OPENAI_API_KEY") is not None:
-    from cogentic.llm.api import get_model_client
-else:
-    from cogentic.llm.entra import get_model_client
 
 __all__ = [
     "get_model_client",
+    "get_model_registry",
+    "CogenticModelRegistry",
+    "ModelDetails",
+    "ModelDeployment",
+    "CogenticBalancedChatCompletionClient",
+    "CogenticDeploymentState",
+    "close_model_clients",
+    "CogenticClientPool",
+    "DEFAULT_CLIENT_POOL",
+    "CogenticTokenManager",
 ]
@@ -1,90 +1,40 @@
-import os
+"""Deprecated: models are looked up in the model registry, see `cogentic.llm.get_model_client`.
 
-from autogen_core.models import ModelInfo
-from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
-from cogentic.observability import CogenticChatCompletionClient
-from pydantic import BaseModel
+Models with an API key use it, and the others use Entra ID, so this module and `cogentic.llm.entra`
+now forward to the same registry.
+"""
 
-AZURE_OPENAI_ENDPOINT = os.environ.get("AZURE_OPENAI_ENDPOINT")
-AZURE_OPENAI_API_VERSION = os.environ.get("OPENAI_API_VERSION")
-AZURE_OPENAI_API_KEY = os.environ.get("AZURE_OPENAI_API_KEY")
-AZURE_R1_ENDPOINT = os.environ.get("AZURE_R1_ENDPOINT")
-AZURE_R1_API_KEY = os.environ.get("AZURE_R1_API_KEY")
+import warnings
+from typing import TYPE_CHECKING, Any
 
-assert AZURE_OPENAI_ENDPOINT, "Azure OpenAI endpoint not set."
-assert AZURE_OPENAI_API_VERSION, "Azure OpenAI API version not set."
-assert AZURE_OPENAI_API_KEY, "Azure OpenAI API key not set."
-
-assert AZURE_R1_ENDPOINT, "Azure R1 endpoint not set."
-assert AZURE_R1_API_KEY, "Azure R1 API key not set."
-
-
-class ModelDetails(BaseModel):
-    name: str
-    info: ModelInfo
-    endpoint: str = AZURE_OPENAI_ENDPOINT
-    api_version: str = AZURE_OPENAI_API_VERSION
-    api_key: str = AZURE_OPENAI_API_KEY
-
-
-MODELS: dict[str, ModelDetails] = {
-    "gpt-4o": ModelDetails(
-        name="gpt-4o",
-        info=ModelInfo(
-            family="gpt-4o",
-            function_calling=True,
-            json_output=True,
-            vision=True,
-        ),
-    ),
-    "gpt-4o-mini": ModelDetails(
-        name="gpt-4o-mini",
-        info=ModelInfo(
-            family="gpt-4o",
-            function_calling=True,
-            json_output=True,
-            vision=True,
-        ),
-    ),
-    "o1-mini": ModelDetails(
-        name="o1-mini",
-        info=ModelInfo(
-            family="o1",
-            function_calling=False,
-            json_output=False,
-            vision=False,
-        ),
-    ),
-    "r1": ModelDetails(
-        name="r1",
-        info=ModelInfo(
-            family="r1",
-            function_calling=False,
-            json_output=False,
-            vision=False,
-        ),
-        api_key=AZURE_R1_API_KEY,
-        endpoint=AZURE_R1_ENDPOINT,
-    ),
-}
+if TYPE_CHECKING:
+    from cogentic.observability.client import CogenticChatCompletionClient
 
 
 def get_model_client(
     model: str,
     name: str | None = None,
     session_id: str | None = None,
-) -> CogenticChatCompletionClient:
-    model_details = MODELS[model]
-
-    model_client = AzureOpenAIChatCompletionClient(
-        model=model,
-        azure_endpoint=model_details.endpoint,
-        api_version=model_details.api_version,
-        api_key=model_details.api_key,
+) -> "CogenticChatCompletionClient":
+    """Deprecated, use `cogentic.llm.get_model_client`."""
+    from cogentic.llm.registry import get_model_client
+
+    warnings.warn(
+        "get_model_client of cogentic.llm.api and cogentic.llm.entra is deprecated, use cogentic.llm.get_model_client.",
+        DeprecationWarning,
+        stacklevel=2,
     )
+    return get_model_client(model, name=name, session_id=session_id)
 
-    return CogenticChatCompletionClient(
-        model_client=model_client,
-        name=name or model_details.name,
-        session_id=session_id,
-    )
+
+def __getattr__(name: str) -> Any:
+    # MODELS used to be read from the environment on import, so the registry is only configured on first use
+    if name == "MODELS":
+        from cogentic.llm.registry import get_model_registry
+
+        return get_model_registry().models
+    if name == "ModelDetails":
+        from cogentic.llm.registry import ModelDetails
+
+        return ModelDetails
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
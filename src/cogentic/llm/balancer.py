@@ -0,0 +1,252 @@
+import logging
+import time
+from collections.abc import AsyncGenerator, Mapping, Sequence
+from typing import Any, Literal, Optional, Union
+
+from autogen_core import CancellationToken
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    RequestUsage,
+)
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+CogenticBalancingStrategy = Literal["least_outstanding", "ewma"]
+
+
+class CogenticDeploymentState(BaseModel):
+    """Point in time state of one deployment behind a balanced client."""
+
+    name: str
+    outstanding: int = 0
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    ewma_latency: float | None = None
+    ejected_until: float = 0.0
+
+    def available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+
+def is_deployment_error(error: Exception) -> bool:
+    """Check whether an error is caused by the deployment (throttling, server errors, connectivity), rather than the request."""
+    status_code = getattr(error, "status_code", None)
+    if status_code is not None:
+        return status_code == 429 or status_code >= 500
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    # openai's APIConnectionError and APITimeoutError, without importing openai
+    return any(cls.__name__ == "APIConnectionError" for cls in type(error).__mro__)
+
+
+def _retry_after(error: Exception) -> float | None:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class CogenticBalancedChatCompletionClient(ChatCompletionClient):
+    """Balances requests over several deployments of the same model, failing over between them.
+
+    Deployments failing with throttling, server or connection errors are ejected for a cooldown, and the
+    request is retried on the next deployment. Errors caused by the request itself are raised immediately.
+    """
+
+    def __init__(
+        self,
+        deployments: Sequence[tuple[str, ChatCompletionClient]],
+        strategy: CogenticBalancingStrategy = "least_outstanding",
+        cooldown: float = 30.0,
+        max_cooldown: float = 300.0,
+        ewma_alpha: float = 0.3,
+    ):
+        """Initialize the balanced client.
+
+        Args:
+            deployments (Sequence[tuple[str, ChatCompletionClient]]): The name and client of each deployment.
+            strategy (CogenticBalancingStrategy): How to pick a deployment. "least_outstanding" picks the deployment with the fewest requests in flight. "ewma" also weighs them by their recent latency. Defaults to "least_outstanding".
+            cooldown (float): Seconds a failing deployment is ejected for, doubled for each consecutive failure. A throttled deployment is ejected for its retry-after period instead, if given. Defaults to 30 seconds.
+            max_cooldown (float): The maximum cooldown in seconds. Defaults to 5 minutes.
+            ewma_alpha (float): The weight of the latest latency in the moving average. Defaults to 0.3.
+        """
+        assert deployments, "At least one deployment is required."
+        self._clients = [client for _, client in deployments]
+        self._states = [CogenticDeploymentState(name=name) for name, _ in deployments]
+        self.strategy = strategy
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.ewma_alpha = ewma_alpha
+        self._next = 0
+
+    def _score(self, state: CogenticDeploymentState) -> float:
+        if self.strategy == "ewma":
+            # Untried deployments score 0, so they get tried
+            return (state.ewma_latency or 0.0) * (state.outstanding + 1)
+        return state.outstanding
+
+    def _select(self, excluded: set[int]) -> int | None:
+        """Pick the next deployment, or None when all deployments were tried."""
+        now = time.monotonic()
+        candidates = [i for i in range(len(self._states)) if i not in excluded]
+        if not candidates:
+            return None
+        available = [i for i in candidates if self._states[i].available(now)]
+        if not available:
+            # Everything is ejected, try the deployment which is back the soonest
+            return min(candidates, key=lambda i: self._states[i].ejected_until)
+        # Rotate the starting point, so ties are spread round-robin
+        self._next = (self._next + 1) % len(self._states)
+        available.sort(key=lambda i: (i - self._next) % len(self._states))
+        return min(available, key=lambda i: self._score(self._states[i]))
+
+    def _succeeded(self, state: CogenticDeploymentState, latency: float) -> None:
+        state.consecutive_failures = 0
+        state.ejected_until = 0.0
+        if state.ewma_latency is None:
+            state.ewma_latency = latency
+        else:
+            state.ewma_latency += self.ewma_alpha * (latency - state.ewma_latency)
+
+    def _failed(self, state: CogenticDeploymentState, error: Exception) -> None:
+        state.failures += 1
+        state.consecutive_failures += 1
+        cooldown = _retry_after(error)
+        if cooldown is None:
+            cooldown = min(
+                self.max_cooldown,
+                self.cooldown * 2 ** (state.consecutive_failures - 1),
+            )
+        state.ejected_until = time.monotonic() + cooldown
+        logger.warning(
+            "Ejecting deployment %s for %.0fs after %s",
+            state.name,
+            cooldown,
+            type(error).__name__,
+        )
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        tried: set[int] = set()
+        while True:
+            index = self._select(tried)
+            assert index is not None
+            tried.add(index)
+            state = self._states[index]
+            state.outstanding += 1
+            state.requests += 1
+            start = time.monotonic()
+            try:
+                result = await self._clients[index].create(
+                    messages,
+                    tools=tools,
+                    json_output=json_output,
+                    extra_create_args=extra_create_args,
+                    cancellation_token=cancellation_token,
+                )
+            except Exception as e:
+                if not is_deployment_error(e):
+                    raise
+                self._failed(state, e)
+                if len(tried) == len(self._states):
+                    raise
+                continue
+            finally:
+                state.outstanding -= 1
+            self._succeeded(state, time.monotonic() - start)
+            return result
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        tried: set[int] = set()
+        while True:
+            index = self._select(tried)
+            assert index is not None
+            tried.add(index)
+            state = self._states[index]
+            state.outstanding += 1
+            state.requests += 1
+            start = time.monotonic()
+            streamed = False
+            try:
+                async for chunk in self._clients[index].create_stream(
+                    messages,
+                    tools=tools,
+                    json_output=json_output,
+                    extra_create_args=extra_create_args,
+                    cancellation_token=cancellation_token,
+                ):
+                    streamed = True
+                    yield chunk
+            except Exception as e:
+                if not is_deployment_error(e):
+                    raise
+                self._failed(state, e)
+                # Only fail over if nothing was streamed to the caller yet
+                if streamed or len(tried) == len(self._states):
+                    raise
+                continue
+            finally:
+                state.outstanding -= 1
+            self._succeeded(state, time.monotonic() - start)
+            return
+
+    def snapshot(self) -> list[CogenticDeploymentState]:
+        """Get a copy of the state of each deployment."""
+        return [state.model_copy() for state in self._states]
+
+    def remaining_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self._clients[0].remaining_tokens(messages, tools=tools)
+
+    def count_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self._clients[0].count_tokens(messages, tools=tools)
+
+    def actual_usage(self) -> RequestUsage:
+        return RequestUsage(
+            prompt_tokens=sum(c.actual_usage().prompt_tokens for c in self._clients),
+            completion_tokens=sum(
+                c.actual_usage().completion_tokens for c in self._clients
+            ),
+        )
+
+    def total_usage(self) -> RequestUsage:
+        return RequestUsage(
+            prompt_tokens=sum(c.total_usage().prompt_tokens for c in self._clients),
+            completion_tokens=sum(
+                c.total_usage().completion_tokens for c in self._clients
+            ),
+        )
+
+    @property
+    def capabilities(self):
+        return self._clients[0].capabilities
+
+    @property
+    def model_info(self):
+        return self._clients[0].model_info
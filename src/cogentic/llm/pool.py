@@ -0,0 +1,97 @@
+import asyncio
+import hashlib
+from collections.abc import Callable, Hashable
+
+import httpx
+from autogen_core.models import ChatCompletionClient
+
+
+def credential_key(api_key: str | None) -> str:
+    """Identify credentials for a pool key without keeping the secret in it."""
+    if api_key is None:
+        return "entra"
+    return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+class CogenticClientPool:
+    """Shares one model client, and with it one HTTP connection pool, per model, endpoint and credentials.
+
+    The pooled clients are wrapped in lightweight `CogenticChatCompletionClient` views, one per session, so
+    connection setup and TLS handshakes are paid once per process instead of once per run. The pool is meant
+    to be used from a single event loop; call `close()` before the loop shuts down.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 60.0,
+        timeout: float = 600.0,
+        connect_timeout: float = 5.0,
+    ):
+        """Initialize the pool.
+
+        Args:
+            max_connections (int): The maximum number of concurrent connections per pooled client. Defaults to 100.
+            max_keepalive_connections (int): The maximum number of idle connections kept open per pooled client. Defaults to 20.
+            keepalive_expiry (float): Seconds an idle connection is kept open. Defaults to 60 seconds.
+            timeout (float): The request timeout in seconds. Defaults to 600 seconds, the same as the openai client.
+            connect_timeout (float): The connection timeout in seconds. Defaults to 5 seconds.
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._clients: dict[
+            Hashable, tuple[ChatCompletionClient, httpx.AsyncClient]
+        ] = {}
+        self._shared: dict[Hashable, ChatCompletionClient] = {}
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get_or_create(
+        self,
+        key: Hashable,
+        factory: Callable[[httpx.AsyncClient], ChatCompletionClient],
+    ) -> ChatCompletionClient:
+        """Get the pooled client for `key`, creating it with `factory(http_client)` on first use."""
+        pooled = self._clients.get(key)
+        if pooled is None:
+            http_client = httpx.AsyncClient(
+                limits=self.limits, timeout=self.timeout, follow_redirects=True
+            )
+            pooled = (factory(http_client), http_client)
+            self._clients[key] = pooled
+        return pooled[0]
+
+    def get_or_create_shared(
+        self, key: Hashable, factory: Callable[[], ChatCompletionClient]
+    ) -> ChatCompletionClient:
+        """Get the shared client for `key`, creating it with `factory()` on first use.
+
+        For clients built from other pooled clients, e.g. a client balancing over several deployments.
+        """
+        client = self._shared.get(key)
+        if client is None:
+            client = factory()
+            self._shared[key] = client
+        return client
+
+    async def close(self) -> None:
+        """Close the connections of all pooled clients. Clients requested afterwards are created anew."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._shared.clear()
+        # The model clients don't own their connections, closing the HTTP clients is enough
+        await asyncio.gather(*(http_client.aclose() for _, http_client in clients))
+
+
+DEFAULT_CLIENT_POOL = CogenticClientPool()
+
+
+async def close_model_clients() -> None:
+    """Close the clients pooled by `get_model_client`."""
+    await DEFAULT_CLIENT_POOL.close()
@@ -0,0 +1,261 @@
+import functools
+import os
+from typing import Any
+from urllib.parse import urlparse
+
+import httpx
+from autogen_core.models import ChatCompletionClient, ModelInfo
+from pydantic import BaseModel, Field
+
+from cogentic.llm.balancer import (
+    CogenticBalancedChatCompletionClient,
+    CogenticBalancingStrategy,
+)
+from cogentic.llm.pool import DEFAULT_CLIENT_POOL, CogenticClientPool, credential_key
+from cogentic.observability.client import CogenticChatCompletionClient
+from cogentic.observability.instrumentation import load_environment
+from cogentic.observability.rate_limit import CogenticRateLimiter, get_rate_limiter
+
+DEFAULT_API_VERSION = "2024-12-01-preview"
+
+
+class ModelDeployment(BaseModel):
+    endpoint: str
+    # Name of the Azure deployment. None means the model name.
+    deployment: str | None = None
+    api_version: str = DEFAULT_API_VERSION
+    # None means authenticating with Entra ID
+    api_key: str | None = None
+    # Quota of the deployment, shared by every client in the process. None means unlimited.
+    requests_per_minute: int | None = None
+    tokens_per_minute: int | None = None
+
+
+class ModelDetails(ModelDeployment):
+    name: str
+    info: ModelInfo
+    # Further deployments of the model, e.g. in other regions. Requests are balanced over all deployments.
+    replicas: list[ModelDeployment] = Field(default_factory=list)
+    balancing: CogenticBalancingStrategy = "least_outstanding"
+
+    @property
+    def deployments(self) -> list[ModelDeployment]:
+        return [self, *self.replicas]
+
+
+class CogenticModelRegistry:
+    """The models available to `get_model_client`."""
+
+    def __init__(self, models: list[ModelDetails] | None = None):
+        self._models: dict[str, ModelDetails] = {
+            model.name: model for model in models or []
+        }
+
+    @classmethod
+    def from_env(cls) -> "CogenticModelRegistry":
+        """Create the registry of the Azure OpenAI deployments configured in the environment (and `.env`).
+
+        - AZURE_OPENAI_ENDPOINT: Endpoint of the gpt-4o, gpt-4o-mini, o1-mini and o3-mini deployments.
+        - OPENAI_API_VERSION: API version to use. Defaults to DEFAULT_API_VERSION.
+        - AZURE_OPENAI_API_KEY: API key of the endpoint. If not set, Entra ID is used.
+        - AZURE_OPENAI_REPLICA_ENDPOINTS: Comma separated endpoints with the same deployments (and API key), to balance requests over.
+        - AZURE_R1_ENDPOINT, AZURE_R1_API_KEY: Endpoint and API key of the r1 deployment.
+        """
+        load_environment()
+        registry = cls()
+        endpoint = os.environ.get("AZURE_OPENAI_ENDPOINT")
+        api_version = os.environ.get("OPENAI_API_VERSION", DEFAULT_API_VERSION)
+        api_key = os.environ.get("AZURE_OPENAI_API_KEY")
+        replica_endpoints = os.environ.get("AZURE_OPENAI_REPLICA_ENDPOINTS", "")
+        replicas = [
+            ModelDeployment(
+                endpoint=replica.strip(), api_version=api_version, api_key=api_key
+            )
+            for replica in replica_endpoints.split(",")
+            if replica.strip()
+        ]
+        if endpoint:
+            for name, family, function_calling, json_output, vision in (
+                ("gpt-4o", "gpt-4o", True, True, True),
+                ("gpt-4o-mini", "gpt-4o", True, True, True),
+                ("o1-mini", "o1", False, False, False),
+                ("o3-mini", "o3", True, True, False),
+            ):
+                registry.register(
+                    ModelDetails(
+                        name=name,
+                        info=ModelInfo(
+                            family=family,
+                            function_calling=function_calling,
+                            json_output=json_output,
+                            vision=vision,
+                        ),
+                        endpoint=endpoint,
+                        api_version=api_version,
+                        api_key=api_key,
+                        replicas=replicas,
+                    )
+                )
+
+        r1_endpoint = os.environ.get("AZURE_R1_ENDPOINT")
+        r1_api_key = os.environ.get("AZURE_R1_API_KEY")
+        if r1_endpoint and r1_api_key:
+            registry.register(
+                ModelDetails(
+                    name="r1",
+                    info=ModelInfo(
+                        family="r1",
+                        function_calling=False,
+                        json_output=False,
+                        vision=False,
+                    ),
+                    endpoint=r1_endpoint,
+                    api_version=api_version,
+                    api_key=r1_api_key,
+                )
+            )
+        return registry
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._models
+
+    @property
+    def models(self) -> dict[str, ModelDetails]:
+        """The registered models by name."""
+        return dict(self._models)
+
+    def register(self, model: ModelDetails) -> None:
+        """Add a model, replacing any model of the same name."""
+        self._models[model.name] = model
+
+    def get(self, name: str) -> ModelDetails:
+        """Get a model by name."""
+        model = self._models.get(name)
+        if model is None:
+            raise ValueError(
+                f"Unknown model '{name}'. Available models: {sorted(self._models)}. Azure OpenAI models are configured with AZURE_OPENAI_ENDPOINT, and r1 with AZURE_R1_ENDPOINT and AZURE_R1_API_KEY."
+            )
+        return model
+
+
+@functools.cache
+def get_model_registry() -> CogenticModelRegistry:
+    """Get the default model registry, configured from the environment on first use."""
+    return CogenticModelRegistry.from_env()
+
+
+def _deployment_client(
+    model: str, deployment: ModelDeployment, pool: CogenticClientPool
+) -> ChatCompletionClient:
+    """Get the pooled client of one deployment."""
+
+    def create_model_client(http_client: httpx.AsyncClient) -> ChatCompletionClient:
+        from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
+
+        # http_client isn't in the client's typed config, but is passed on to the AsyncAzureOpenAI client
+        client_args: dict[str, Any] = {"http_client": http_client}
+        if deployment.api_key:
+            # Use the API key for authentication
+            client_args["api_key"] = deployment.api_key
+        else:
+            from cogentic.llm.entra import get_aoai_token_provider
+
+            client_args["azure_ad_token_provider"] = get_aoai_token_provider()
+        return AzureOpenAIChatCompletionClient(
+            model=model,
+            azure_endpoint=deployment.endpoint,
+            azure_deployment=deployment.deployment or model,
+            api_version=deployment.api_version,
+            **client_args,
+        )
+
+    return pool.get_or_create(_deployment_key(model, deployment), create_model_client)
+
+
+def _deployment_key(model: str, deployment: ModelDeployment) -> tuple[str, ...]:
+    return (
+        model,
+        deployment.endpoint,
+        deployment.deployment or model,
+        deployment.api_version,
+        credential_key(deployment.api_key),
+    )
+
+
+def _rate_limiter(
+    model: str, deployment: ModelDeployment
+) -> CogenticRateLimiter | None:
+    """The rate limiter of a deployment, if it has a quota."""
+    if not (deployment.requests_per_minute or deployment.tokens_per_minute):
+        return None
+    return get_rate_limiter(
+        deployment.endpoint,
+        deployment.deployment or model,
+        requests_per_minute=deployment.requests_per_minute,
+        tokens_per_minute=deployment.tokens_per_minute,
+    )
+
+
+def get_model_client(
+    model: str,
+    name: str | None = None,
+    session_id: str | None = None,
+    pool: CogenticClientPool | None = None,
+    registry: CogenticModelRegistry | None = None,
+) -> CogenticChatCompletionClient:
+    """Get a client for a model, sharing the underlying client and its connections with other sessions.
+
+    Models with replicas get a client balancing requests over all of their deployments.
+
+    Args:
+        model (str): The name of the model in the registry.
+        name (str | None): The name of the client, used for tracing and metrics. Defaults to the model name.
+        session_id (str | None): The session (run) the client belongs to.
+        pool (CogenticClientPool | None): The pool to share clients from. Defaults to DEFAULT_CLIENT_POOL.
+        registry (CogenticModelRegistry | None): The registry to look the model up in. Defaults to the registry configured from the environment.
+    """
+    model_details = (registry or get_model_registry()).get(model)
+    if pool is None:
+        pool = DEFAULT_CLIENT_POOL
+
+    if not model_details.replicas:
+        return CogenticChatCompletionClient(
+            model_client=_deployment_client(model, model_details, pool),
+            name=name or model_details.name,
+            session_id=session_id,
+            rate_limiter=_rate_limiter(model, model_details),
+        )
+
+    def create_balanced_client() -> ChatCompletionClient:
+        # Each deployment is rate limited on its own, and fails fast when throttled, so the balancer can fail over
+        deployments: list[tuple[str, ChatCompletionClient]] = []
+        for deployment in model_details.deployments:
+            deployment_name = (
+                f"{model}@{urlparse(deployment.endpoint).netloc or deployment.endpoint}"
+            )
+            deployments.append(
+                (
+                    deployment_name,
+                    CogenticChatCompletionClient(
+                        model_client=_deployment_client(model, deployment, pool),
+                        name=deployment_name,
+                        rate_limiter=_rate_limiter(model, deployment),
+                        max_rate_limit_retries=0,
+                    ),
+                )
+            )
+        return CogenticBalancedChatCompletionClient(
+            deployments, strategy=model_details.balancing
+        )
+
+    return CogenticChatCompletionClient(
+        model_client=pool.get_or_create_shared(
+            (
+                "balanced",
+                *(_deployment_key(model, d) for d in model_details.deployments),
+            ),
+            create_balanced_client,
+        ),
+        name=name or model_details.name,
+        session_id=session_id,
+    )
@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, Protocol
+
+from pydantic import BaseModel, Field
+
+from cogentic.observability.metrics import CogenticHistogram
+
+logger = logging.getLogger(__name__)
+
+
+class CogenticAccessToken(Protocol):
+    token: str
+    expires_on: int
+
+
+class CogenticCredential(Protocol):
+    """A source of access tokens, e.g. any `azure.identity.aio` credential."""
+
+    async def get_token(self, *scopes: str, **kwargs: Any) -> CogenticAccessToken: ...
+
+
+class CogenticTokenRefreshMetrics(BaseModel):
+    """Refresh metrics for the tokens of one scope."""
+
+    scope: str
+    refreshes: int = 0
+    failures: int = 0
+    background_refreshes: int = 0
+    latency: CogenticHistogram = Field(default_factory=CogenticHistogram)
+
+
+class CogenticTokenManager:
+    """Caches access tokens per scope, refreshing them ahead of expiry in the background.
+
+    Refreshes are single-flight: concurrent requests for the same scope share one call to the credential,
+    which for `AzureCliCredential` means one `az` subprocess. Once a token is cached, requests only wait on
+    the credential if the background refresh failed and the token is about to expire.
+    """
+
+    def __init__(
+        self,
+        credential: CogenticCredential | Callable[[], CogenticCredential],
+        refresh_before: float = 600.0,
+        expiry_margin: float = 60.0,
+    ):
+        """Initialize the token manager.
+
+        Args:
+            credential (CogenticCredential | Callable[[], CogenticCredential]): The credential to get tokens from, or a factory creating it on first use.
+            refresh_before (float): Seconds before expiry to refresh a token in the background. Defaults to 10 minutes.
+            expiry_margin (float): Seconds before expiry after which a token is no longer handed out, and requests wait for a refresh. Defaults to 1 minute.
+        """
+        assert refresh_before > expiry_margin, (
+            "Tokens must be refreshed before they stop being handed out."
+        )
+        self._credential = credential
+        self.refresh_before = refresh_before
+        self.expiry_margin = expiry_margin
+        self._tokens: dict[str, CogenticAccessToken] = {}
+        self._refreshes: dict[str, asyncio.Task[CogenticAccessToken]] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._metrics: dict[str, CogenticTokenRefreshMetrics] = {}
+
+    @property
+    def credential(self) -> CogenticCredential:
+        if not hasattr(self._credential, "get_token"):
+            self._credential = self._credential()  # type: ignore[operator]
+        return self._credential  # type: ignore[return-value]
+
+    async def get_token(self, scope: str) -> str:
+        """Get a valid token for a scope."""
+        token = self._tokens.get(scope)
+        now = time.time()
+        if token is not None and token.expires_on - now > self.expiry_margin:
+            if token.expires_on - now <= self.refresh_before:
+                # Missed the scheduled refresh (e.g. the loop was busy), refresh without waiting
+                self._refresh(scope, background=True)
+            return token.token
+        token = await asyncio.shield(self._refresh(scope, background=False))
+        return token.token
+
+    def token_provider(self, scope: str) -> Callable[[], Awaitable[str]]:
+        """Get a token provider for a scope, e.g. for `azure_ad_token_provider`."""
+
+        async def get_token() -> str:
+            return await self.get_token(scope)
+
+        return get_token
+
+    def _refresh(
+        self, scope: str, background: bool
+    ) -> asyncio.Task[CogenticAccessToken]:
+        """Start refreshing the token for a scope, unless a refresh is already in flight."""
+        task = self._refreshes.get(scope)
+        loop = asyncio.get_running_loop()
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(self._fetch(scope, background))
+            # Failures are raised to waiting requests, or logged for background refreshes
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._refreshes[scope] = task
+        return task
+
+    async def _fetch(self, scope: str, background: bool) -> CogenticAccessToken:
+        metrics = self._metrics.setdefault(
+            scope, CogenticTokenRefreshMetrics(scope=scope)
+        )
+        start = time.perf_counter()
+        try:
+            token = await self.credential.get_token(scope)
+        except Exception:
+            metrics.failures += 1
+            if background:
+                logger.warning(
+                    "Background refresh of token for %s failed", scope, exc_info=True
+                )
+            raise
+        finally:
+            metrics.latency.observe(time.perf_counter() - start)
+        metrics.refreshes += 1
+        if background:
+            metrics.background_refreshes += 1
+        self._tokens[scope] = token
+        self._schedule(scope, token)
+        return token
+
+    def _schedule(self, scope: str, token: CogenticAccessToken) -> None:
+        """Schedule the background refresh of a token, so idle periods don't leave it expired."""
+        timer = self._timers.pop(scope, None)
+        if timer is not None:
+            timer.cancel()
+        remaining = token.expires_on - time.time()
+        delay = remaining - self.refresh_before
+        if delay <= 0:
+            # Short lived token, refresh half way through its usable lifetime
+            delay = max(1.0, (remaining - self.expiry_margin) / 2)
+        loop = asyncio.get_running_loop()
+        self._timers[scope] = loop.call_later(
+            delay, lambda: self._refresh(scope, background=True)
+        )
+
+    def snapshot(self) -> list[CogenticTokenRefreshMetrics]:
+        """Get a copy of the refresh metrics."""
+        return [
+            metrics.model_copy(deep=True)
+            for _, metrics in sorted(self._metrics.items())
+        ]
+
+    async def close(self) -> None:
+        """Stop background refreshes and close the credential."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        tasks = [task for task in self._refreshes.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refreshes.clear()
+        close = getattr(self._credential, "close", None)
+        if close is not None and hasattr(self._credential, "get_token"):
+            await close()
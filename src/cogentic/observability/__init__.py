@@ -1,19 +1,57 @@
-import os
-import sys
+import importlib
+from typing import TYPE_CHECKING, Any
 
-from cogentic.observability.client import CogenticChatCompletionClient
-from dotenv import load_dotenv
+if TYPE_CHECKING:
+    from cogentic.observability.client import CogenticChatCompletionClient
+    from cogentic.observability.instrumentation import (
+        instrument_langfuse,
+        load_environment,
+    )
+    from cogentic.observability.metrics import (
+        DEFAULT_METRICS,
+        CogenticCallSiteMetrics,
+        CogenticMetrics,
+    )
+    from cogentic.observability.rate_limit import (
+        CogenticRateLimiter,
+        CogenticRateLimitSnapshot,
+        get_rate_limiter,
+        rate_limits_to_prometheus,
+    )
 
-load_dotenv()
+# Imported on first use, so importing cogentic.observability has no side effects and stays fast
+_LAZY_IMPORTS = {
+    "CogenticChatCompletionClient": "cogentic.observability.client",
+    "instrument_langfuse": "cogentic.observability.instrumentation",
+    "load_environment": "cogentic.observability.instrumentation",
+    "CogenticCallSiteMetrics": "cogentic.observability.metrics",
+    "CogenticMetrics": "cogentic.observability.metrics",
+    "DEFAULT_METRICS": "cogentic.observability.metrics",
+    "CogenticRateLimiter": "cogentic.observability.rate_limit",
+    "CogenticRateLimitSnapshot": "cogentic.observability.rate_limit",
+    "get_rate_limiter": "cogentic.observability.rate_limit",
+    "rate_limits_to_prometheus": "cogentic.observability.rate_limit",
+}
 
-# Replace openai with langfuse instrumented version if LANGFUSE_HOST is set
-if os.environ.get("LANGFUSE_HOST"):
-    from autogen_ext.models.openai._openai_client import create_kwargs
-    from langfuse import openai  # type: ignore
 
-    # This lets us use the added langfuse create_kwargs in their openai module
-    create_kwargs.update(set(("name", "session_id")))
-    sys.modules["openai"] = openai
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
 
 
-__all__ = ["CogenticChatCompletionClient"]
+__all__ = [
+    "CogenticChatCompletionClient",
+    "instrument_langfuse",
+    "load_environment",
+    "CogenticCallSiteMetrics",
+    "CogenticMetrics",
+    "DEFAULT_METRICS",
+    "CogenticRateLimiter",
+    "CogenticRateLimitSnapshot",
+    "get_rate_limiter",
+    "rate_limits_to_prometheus",
+]
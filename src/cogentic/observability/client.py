@@ -1,11 +1,21 @@
-import os
+import time
 from typing import Any, AsyncGenerator, Mapping, Optional, Sequence, Union
 from uuid import uuid4
 
 from autogen_core import CancellationToken
-from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    RequestUsage,
+)
 from autogen_core.tools import Tool, ToolSchema
 
+from cogentic.observability.instrumentation import instrument_langfuse
+from cogentic.observability.metrics import DEFAULT_METRICS, CogenticMetrics
+from cogentic.observability.rate_limit import CogenticRateLimiter
+from cogentic.orchestration.context import current_call_site, current_run
+
 
 class CogenticChatCompletionClient(ChatCompletionClient):
     def __init__(
@@ -13,10 +23,98 @@ class CogenticChatCompletionClient(ChatCompletionClient):
         model_client: ChatCompletionClient,
         name: str,
         session_id: str | None = None,
+        metrics: CogenticMetrics | None = None,
+        rate_limiter: CogenticRateLimiter | None = None,
+        max_rate_limit_retries: int = 3,
     ):
+        """Wrap a model client with tracing, metrics and rate limiting.
+
+        Args:
+            model_client (ChatCompletionClient): The model client to wrap.
+            name (str): The name of the client, used for tracing and metrics.
+            session_id (str | None): The session used for calls made outside of a run. Within a run (see `run_context`), calls are attributed to the run's session, so one client can serve many concurrent runs. Requests are queued fairly between sessions.
+            metrics (CogenticMetrics | None): Where to record call metrics. Defaults to DEFAULT_METRICS.
+            rate_limiter (CogenticRateLimiter | None): The limiter shared by all clients of the same deployment. Defaults to no limit.
+            max_rate_limit_retries (int): How often to retry a request the service throttled, when rate limited. Defaults to 3.
+        """
         self.model_client = model_client
         self.name = name
         self.session_id = session_id or uuid4().hex
+        self.metrics = metrics or DEFAULT_METRICS
+        self.rate_limiter = rate_limiter
+        self.max_rate_limit_retries = max_rate_limit_retries
+        # Checked once, rather than on every call
+        self._langfuse = instrument_langfuse()
+        # Tracked here, as the wrapped client may be shared with other sessions
+        self._actual_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        self._total_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+
+    def _add_usage(self, usage: RequestUsage) -> None:
+        for total in (self._actual_usage, self._total_usage):
+            total.prompt_tokens += usage.prompt_tokens
+            total.completion_tokens += usage.completion_tokens
+
+    @property
+    def current_session_id(self) -> str:
+        """The session of the current run, or the client's own session outside of a run."""
+        run = current_run()
+        return run.session_id if run is not None else self.session_id
+
+    def _context_aware_extra_create_args(
+        self, extra_create_args: Mapping[str, Any]
+    ) -> Mapping[str, Any]:
+        """Add the run metadata used by langfuse tracing, if enabled."""
+        if not self._langfuse:
+            return extra_create_args
+        run = current_run()
+        site, _ = current_call_site()
+        if run is None:
+            return {
+                **extra_create_args,
+                "name": self.name,
+                "session_id": self.session_id,
+                "metadata": {"call_site": site},
+            }
+        return {
+            **extra_create_args,
+            "name": self.name,
+            "session_id": run.session_id,
+            "metadata": {"call_site": site, "run_id": run.run_id},
+        }
+
+    async def _acquire(
+        self,
+        messages: Sequence[LLMMessage],
+        tools: Sequence[Tool | ToolSchema],
+        extra_create_args: Mapping[str, Any],
+    ) -> int:
+        """Wait for the rate limiter, returning the estimated tokens of the request."""
+        assert self.rate_limiter is not None
+        estimate = 0
+        if self.rate_limiter.limits_tokens:
+            # The service counts the requested completion tokens against the quota up front
+            estimate = self.count_tokens(messages, tools=tools) + int(
+                extra_create_args.get("max_tokens") or 0
+            )
+        start = time.perf_counter()
+        await self.rate_limiter.acquire(estimate, self.current_session_id)
+        site, _ = current_call_site()
+        self.metrics.record_queue_wait(self.name, site, time.perf_counter() - start)
+        return estimate
+
+    def _throttled(self, error: Exception, attempt: int) -> bool:
+        """Check whether the service throttled a request we should retry, pausing the rate limiter if so."""
+        if self.rate_limiter is None or getattr(error, "status_code", None) != 429:
+            return False
+        retry_after = 1.0
+        response = getattr(error, "response", None)
+        if response is not None:
+            try:
+                retry_after = float(response.headers.get("retry-after", retry_after))
+            except (TypeError, ValueError):
+                pass
+        self.rate_limiter.throttle(retry_after)
+        return attempt < self.max_rate_limit_retries
 
     async def create(
         self,
@@ -29,22 +127,46 @@ class CogenticChatCompletionClient(ChatCompletionClient):
         extra_create_args: Mapping[str, Any] = {},
         cancellation_token: Optional[CancellationToken] = None,
     ) -> CreateResult:
-        if os.environ.get("LANGFUSE_HOST"):
-            context_aware_extra_create_args = {
-                k: v for k, v in extra_create_args.items()
-            }
-            context_aware_extra_create_args["name"] = self.name
-            context_aware_extra_create_args["session_id"] = self.session_id
-        else:
-            context_aware_extra_create_args = extra_create_args
-
+        context_aware_extra_create_args = self._context_aware_extra_create_args(
+            extra_create_args
+        )
         # Call model client
-        result = await self.model_client.create(
-            messages=messages,
-            tools=tools,
-            json_output=json_output,
-            extra_create_args=context_aware_extra_create_args,
-            cancellation_token=cancellation_token,
+        site, attempt = current_call_site()
+        throttled_attempt = 0
+        while True:
+            estimate = 0
+            if self.rate_limiter is not None:
+                estimate = await self._acquire(messages, tools, extra_create_args)
+            start = time.perf_counter()
+            try:
+                result = await self.model_client.create(
+                    messages=messages,
+                    tools=tools,
+                    json_output=json_output,
+                    extra_create_args=context_aware_extra_create_args,
+                    cancellation_token=cancellation_token,
+                )
+            except Exception as e:
+                self.metrics.record_call(
+                    self.name, site, attempt, time.perf_counter() - start, error=True
+                )
+                if self._throttled(e, throttled_attempt):
+                    throttled_attempt += 1
+                    continue
+                raise
+            break
+        self._add_usage(result.usage)
+        if self.rate_limiter is not None:
+            self.rate_limiter.reconcile(
+                estimate, result.usage.prompt_tokens + result.usage.completion_tokens
+            )
+        self.metrics.record_call(
+            self.name,
+            site,
+            attempt,
+            time.perf_counter() - start,
+            prompt_tokens=result.usage.prompt_tokens,
+            completion_tokens=result.usage.completion_tokens,
         )
         return result
 
@@ -59,24 +181,64 @@ class CogenticChatCompletionClient(ChatCompletionClient):
         extra_create_args: Mapping[str, Any] = {},
         cancellation_token: Optional[CancellationToken] = None,
     ) -> AsyncGenerator[Union[str, CreateResult], None]:
-        if os.environ.get("LANGFUSE_HOST"):
-            context_aware_extra_create_args = {
-                k: v for k, v in extra_create_args.items()
-            }
-            context_aware_extra_create_args["name"] = self.name
-            context_aware_extra_create_args["session_id"] = self.session_id
-        else:
-            context_aware_extra_create_args = extra_create_args
-
+        context_aware_extra_create_args = self._context_aware_extra_create_args(
+            extra_create_args
+        )
         # Yield from model client
-        async for result in self.model_client.create_stream(
-            messages=messages,
-            tools=tools,
-            json_output=json_output,
-            extra_create_args=context_aware_extra_create_args,
-            cancellation_token=cancellation_token,
-        ):
-            yield result
+        site, attempt = current_call_site()
+        throttled_attempt = 0
+        while True:
+            estimate = 0
+            if self.rate_limiter is not None:
+                estimate = await self._acquire(messages, tools, extra_create_args)
+            start = time.perf_counter()
+            time_to_first_token: float | None = None
+            usage = None
+            try:
+                async for result in self.model_client.create_stream(
+                    messages=messages,
+                    tools=tools,
+                    json_output=json_output,
+                    extra_create_args=context_aware_extra_create_args,
+                    cancellation_token=cancellation_token,
+                ):
+                    if time_to_first_token is None:
+                        time_to_first_token = time.perf_counter() - start
+                    if isinstance(result, CreateResult):
+                        usage = result.usage
+                    yield result
+            except Exception as e:
+                self.metrics.record_call(
+                    self.name,
+                    site,
+                    attempt,
+                    time.perf_counter() - start,
+                    time_to_first_token=time_to_first_token,
+                    error=True,
+                )
+                # Only retry if nothing was streamed to the caller yet
+                if time_to_first_token is None and self._throttled(
+                    e, throttled_attempt
+                ):
+                    throttled_attempt += 1
+                    continue
+                raise
+            break
+        if usage is not None:
+            self._add_usage(usage)
+        if self.rate_limiter is not None and usage is not None:
+            self.rate_limiter.reconcile(
+                estimate, usage.prompt_tokens + usage.completion_tokens
+            )
+        self.metrics.record_call(
+            self.name,
+            site,
+            attempt,
+            time.perf_counter() - start,
+            time_to_first_token=time_to_first_token,
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+        )
 
     def remaining_tokens(
         self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
@@ -88,11 +250,11 @@ class CogenticChatCompletionClient(ChatCompletionClient):
     ) -> int:
         return self.model_client.count_tokens(messages=messages, tools=tools)
 
-    def actual_usage(self):
-        return self.model_client.actual_usage()
+    def actual_usage(self) -> RequestUsage:
+        return self._actual_usage
 
-    def total_usage(self):
-        return self.model_client.total_usage()
+    def total_usage(self) -> RequestUsage:
+        return self._total_usage
 
     @property
     def capabilities(self):
@@ -0,0 +1,28 @@
+import functools
+import os
+import sys
+
+
+@functools.cache
+def load_environment() -> None:
+    """Load environment variables from `.env`, once."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+@functools.cache
+def instrument_langfuse() -> bool:
+    """Trace openai calls with langfuse if LANGFUSE_HOST is set, once. Returns whether langfuse is enabled."""
+    load_environment()
+    if not os.environ.get("LANGFUSE_HOST"):
+        return False
+
+    from autogen_ext.models.openai._openai_client import create_kwargs
+    from langfuse import openai  # type: ignore
+
+    # This lets us use the added langfuse create_kwargs in their openai module
+    create_kwargs.update(set(("name", "session_id", "metadata")))
+    # Replace openai with the langfuse instrumented version
+    sys.modules["openai"] = openai
+    return True
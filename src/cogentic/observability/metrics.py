@@ -0,0 +1,165 @@
+import bisect
+import threading
+
+from pydantic import BaseModel, Field
+
+# Upper bounds (in seconds) of the latency histogram buckets. The last bucket is +Inf.
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+
+class CogenticHistogram(BaseModel):
+    """Histogram with per-bucket (non-cumulative) counts for LATENCY_BUCKETS, plus +Inf."""
+
+    counts: list[int] = Field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    sum: float = 0.0
+    count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class CogenticCallSiteMetrics(BaseModel):
+    """Metrics for the calls made by one client from one call site."""
+
+    client: str
+    call_site: str
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency: CogenticHistogram = Field(default_factory=CogenticHistogram)
+    time_to_first_token: CogenticHistogram = Field(default_factory=CogenticHistogram)
+    queue_wait: CogenticHistogram = Field(default_factory=CogenticHistogram)
+
+
+class CogenticMetrics:
+    """In-process metrics for model calls, keyed by client name and call site."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: dict[tuple[str, str], CogenticCallSiteMetrics] = {}
+
+    def _get(self, client: str, site: str) -> CogenticCallSiteMetrics:
+        metrics = self._metrics.get((client, site))
+        if metrics is None:
+            metrics = CogenticCallSiteMetrics(client=client, call_site=site)
+            self._metrics[(client, site)] = metrics
+        return metrics
+
+    def record_call(
+        self,
+        client: str,
+        site: str,
+        attempt: int,
+        latency: float,
+        time_to_first_token: float | None = None,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        error: bool = False,
+    ) -> None:
+        """Record a finished model call."""
+        with self._lock:
+            metrics = self._get(client, site)
+            metrics.requests += 1
+            if attempt > 0:
+                metrics.retries += 1
+            if error:
+                metrics.errors += 1
+            metrics.prompt_tokens += prompt_tokens
+            metrics.completion_tokens += completion_tokens
+            metrics.latency.observe(latency)
+            if time_to_first_token is not None:
+                metrics.time_to_first_token.observe(time_to_first_token)
+
+    def record_queue_wait(self, client: str, site: str, wait: float) -> None:
+        """Record the time a call waited for the rate limiter."""
+        with self._lock:
+            self._get(client, site).queue_wait.observe(wait)
+
+    def snapshot(self) -> list[CogenticCallSiteMetrics]:
+        """Get a copy of the current metrics."""
+        with self._lock:
+            return [
+                metrics.model_copy(deep=True)
+                for _, metrics in sorted(self._metrics.items())
+            ]
+
+    def reset(self) -> None:
+        """Clear all metrics."""
+        with self._lock:
+            self._metrics.clear()
+
+    def to_prometheus(self, prefix: str = "cogentic_llm") -> str:
+        """Export the metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines: list[str] = []
+
+        counters = {
+            "requests": "Model calls made",
+            "errors": "Model calls which raised an error",
+            "retries": "Model calls which retried an earlier attempt",
+            "prompt_tokens": "Prompt tokens used",
+            "completion_tokens": "Completion tokens used",
+        }
+        for field, help_text in counters.items():
+            name = f"{prefix}_{field}_total"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for metrics in snapshot:
+                lines.append(f"{name}{{{_labels(metrics)}}} {getattr(metrics, field)}")
+
+        histograms = {
+            "latency": ("request_duration_seconds", "Model call duration"),
+            "time_to_first_token": (
+                "time_to_first_token_seconds",
+                "Time until the first streamed chunk",
+            ),
+            "queue_wait": (
+                "queue_wait_seconds",
+                "Time spent waiting for the rate limiter",
+            ),
+        }
+        for field, (suffix, help_text) in histograms.items():
+            name = f"{prefix}_{suffix}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for metrics in snapshot:
+                histogram: CogenticHistogram = getattr(metrics, field)
+                labels = _labels(metrics)
+                cumulative = 0
+                for bound, count in zip(
+                    (*LATENCY_BUCKETS, "+Inf"), histogram.counts, strict=True
+                ):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(metrics: CogenticCallSiteMetrics) -> str:
+    return (
+        f'client="{_escape(metrics.client)}",call_site="{_escape(metrics.call_site)}"'
+    )
+
+
+DEFAULT_METRICS = CogenticMetrics()
@@ -0,0 +1,286 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+
+from pydantic import BaseModel
+
+from cogentic.observability.metrics import _escape
+
+
+class _TokenBucket:
+    """A bucket refilled continuously at `per_minute`, holding up to `burst_seconds` worth of units."""
+
+    def __init__(self, per_minute: int, burst_seconds: float):
+        self.per_minute = per_minute
+        self.rate = per_minute / 60.0
+        self.capacity = self.rate * burst_seconds
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` is available. Requests larger than the bucket only wait for a full bucket."""
+        needed = min(amount, self.capacity) - self.level
+        return max(0.0, needed / self.rate)
+
+
+@dataclass
+class _Waiter:
+    tokens: int
+    future: asyncio.Future[None]
+    enqueued: float = field(default_factory=time.monotonic)
+
+
+class CogenticRateLimitSnapshot(BaseModel):
+    """Point in time state of a rate limiter."""
+
+    key: str
+    queue_depth: int
+    waiting_sessions: int
+    granted: int
+    throttled: int
+    total_wait_seconds: float
+
+
+class CogenticRateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets shared by every client of one deployment.
+
+    Waiting requests are queued per session and granted round-robin, so one busy run can't starve the others.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        burst_seconds: float = 10.0,
+    ):
+        """Initialize the rate limiter.
+
+        Args:
+            key (str): The deployment the limiter belongs to, e.g. "<endpoint>/<deployment>".
+            requests_per_minute (int | None): The request quota. None means unlimited. Defaults to None.
+            tokens_per_minute (int | None): The token quota. None means unlimited. Defaults to None.
+            burst_seconds (float): How many seconds of quota can be spent at once. Azure OpenAI enforces quotas
+                over short windows, so bursting a whole minute of quota gets throttled. Defaults to 10 seconds.
+        """
+        self.key = key
+        self.burst_seconds = burst_seconds
+        self._requests = (
+            _TokenBucket(requests_per_minute, burst_seconds)
+            if requests_per_minute
+            else None
+        )
+        self._tokens = (
+            _TokenBucket(tokens_per_minute, burst_seconds)
+            if tokens_per_minute
+            else None
+        )
+        self._queues: OrderedDict[str, deque[_Waiter]] = OrderedDict()
+        self._blocked_until = 0.0
+        self._dispatcher: asyncio.Task[None] | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.granted = 0
+        self.throttled = 0
+        self.total_wait_seconds = 0.0
+
+    @property
+    def requests_per_minute(self) -> int | None:
+        return self._requests.per_minute if self._requests is not None else None
+
+    @property
+    def tokens_per_minute(self) -> int | None:
+        return self._tokens.per_minute if self._tokens is not None else None
+
+    def set_limits(
+        self, requests_per_minute: int | None, tokens_per_minute: int | None
+    ) -> None:
+        """Change the quotas, e.g. after the deployment's quota was raised. None means unlimited.
+
+        Units already spent stay spent, but the buckets can't hold more than their new capacity.
+        """
+        now = time.monotonic()
+        buckets = []
+        for bucket, per_minute in (
+            (self._requests, requests_per_minute),
+            (self._tokens, tokens_per_minute),
+        ):
+            if not per_minute:
+                bucket = None
+            elif bucket is None:
+                bucket = _TokenBucket(per_minute, self.burst_seconds)
+            elif bucket.per_minute != per_minute:
+                bucket.refill(now)
+                spent = bucket.capacity - bucket.level
+                bucket.per_minute = per_minute
+                bucket.rate = per_minute / 60.0
+                bucket.capacity = bucket.rate * self.burst_seconds
+                bucket.level = bucket.capacity - spent
+            buckets.append(bucket)
+        self._requests, self._tokens = buckets
+        if self._wakeup is not None:
+            # Waiting requests are granted against the new quotas
+            self._wakeup.set()
+
+    @property
+    def limits_tokens(self) -> bool:
+        """Whether requests need a token estimate, which is only the case with a token quota."""
+        return self._tokens is not None
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def acquire(self, tokens: int, session: str) -> None:
+        """Wait until a request using `tokens` tokens may be sent on behalf of `session`."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Futures and tasks belong to a single event loop
+            self._loop = loop
+            self._queues.clear()
+            self._dispatcher = None
+            self._wakeup = asyncio.Event()
+        assert self._wakeup is not None
+
+        waiter = _Waiter(tokens=tokens, future=loop.create_future())
+        self._queues.setdefault(session, deque()).append(waiter)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch())
+        self._wakeup.set()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            queue = self._queues.get(session)
+            if queue is not None and waiter in queue:
+                queue.remove(waiter)
+            raise
+        self.total_wait_seconds += time.monotonic() - waiter.enqueued
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the token bucket once the actual usage of a request is known."""
+        if self._tokens is not None:
+            self._tokens.refill(time.monotonic())
+            self._tokens.level = min(
+                self._tokens.capacity,
+                self._tokens.level + estimated_tokens - actual_tokens,
+            )
+
+    def throttle(self, retry_after: float) -> None:
+        """Pause all requests after the service reported throttling."""
+        self.throttled += 1
+        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        if self._tokens is not None:
+            self._tokens.level = min(self._tokens.level, 0.0)
+
+    def snapshot(self) -> CogenticRateLimitSnapshot:
+        return CogenticRateLimitSnapshot(
+            key=self.key,
+            queue_depth=self.queue_depth,
+            waiting_sessions=sum(1 for queue in self._queues.values() if queue),
+            granted=self.granted,
+            throttled=self.throttled,
+            total_wait_seconds=self.total_wait_seconds,
+        )
+
+    async def _dispatch(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            # Round-robin: take the session at the front, and move it to the back
+            session = next((s for s, queue in self._queues.items() if queue), None)
+            if session is None:
+                self._queues.clear()
+                self._wakeup.clear()
+                return
+            queue = self._queues[session]
+            waiter = queue[0]
+            if waiter.future.done():
+                queue.popleft()
+                continue
+
+            now = time.monotonic()
+            wait = self._blocked_until - now
+            for bucket, amount in ((self._requests, 1), (self._tokens, waiter.tokens)):
+                if bucket is not None:
+                    bucket.refill(now)
+                    wait = max(wait, bucket.wait_time(amount))
+            if wait > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            if self._requests is not None:
+                self._requests.level -= 1
+            if self._tokens is not None:
+                self._tokens.level -= waiter.tokens
+            queue.popleft()
+            self._queues.move_to_end(session)
+            self.granted += 1
+            waiter.future.set_result(None)
+
+
+RATE_LIMITERS: dict[str, CogenticRateLimiter] = {}
+
+
+def get_rate_limiter(
+    endpoint: str,
+    deployment: str,
+    requests_per_minute: int | None = None,
+    tokens_per_minute: int | None = None,
+) -> CogenticRateLimiter:
+    """Get the process-wide rate limiter for a deployment, creating it on first use.
+
+    If the limiter exists with other quotas, it's updated to the given ones, as they're the latest known.
+    """
+    key = f"{endpoint.rstrip('/')}/{deployment}"
+    limiter = RATE_LIMITERS.get(key)
+    if limiter is None:
+        limiter = CogenticRateLimiter(key, requests_per_minute, tokens_per_minute)
+        RATE_LIMITERS[key] = limiter
+    elif (limiter.requests_per_minute, limiter.tokens_per_minute) != (
+        requests_per_minute or None,
+        tokens_per_minute or None,
+    ):
+        limiter.set_limits(requests_per_minute, tokens_per_minute)
+    return limiter
+
+
+def rate_limits_to_prometheus(prefix: str = "cogentic_rate_limit") -> str:
+    """Export the state of all rate limiters in the Prometheus text exposition format."""
+    snapshots = [limiter.snapshot() for _, limiter in sorted(RATE_LIMITERS.items())]
+    metrics = {
+        "queue_depth": (
+            "queue_depth",
+            "gauge",
+            "Requests waiting for the rate limiter",
+        ),
+        "waiting_sessions": (
+            "waiting_sessions",
+            "gauge",
+            "Sessions with requests waiting",
+        ),
+        "granted": ("granted_total", "counter", "Requests let through"),
+        "throttled": ("throttled_total", "counter", "Requests the service throttled"),
+        "total_wait_seconds": (
+            "wait_seconds_total",
+            "counter",
+            "Time spent waiting by all requests",
+        ),
+    }
+    lines: list[str] = []
+    for field_name, (suffix, kind, help_text) in metrics.items():
+        name = f"{prefix}_{suffix}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for snapshot in snapshots:
+            lines.append(
+                f'{name}{{deployment="{_escape(snapshot.key)}"}} {getattr(snapshot, field_name)}'
+            )
+    return "\n".join(lines) + "\n"
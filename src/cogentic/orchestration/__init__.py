@@ -1,3 +1,64 @@
-from cogentic.orchestration.chat import CogenticGroupChat
+import importlib
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["CogenticGroupChat"]
+if TYPE_CHECKING:
+    from cogentic.orchestration.batch import (
+        CogenticBatchMetrics,
+        CogenticBatchResult,
+        CogenticBatchRunner,
+    )
+    from cogentic.orchestration.chat import CogenticGroupChat
+    from cogentic.orchestration.images import CogenticImageStore
+    from cogentic.orchestration.models.image import CogenticImageOptions
+    from cogentic.orchestration.models.summary import CogenticSummaryOptions
+    from cogentic.orchestration.plan_cache import (
+        CogenticPlanCache,
+        CogenticPlanCacheStats,
+    )
+    from cogentic.orchestration.process_pool import CogenticProcessPoolRunner
+    from cogentic.orchestration.routing import (
+        CogenticModelRoute,
+        CogenticModelRouter,
+        CogenticRouteStats,
+    )
+
+# Imported on first use, so that importing e.g. cogentic.orchestration.context stays fast
+_LAZY_IMPORTS = {
+    "CogenticGroupChat": "cogentic.orchestration.chat",
+    "CogenticBatchRunner": "cogentic.orchestration.batch",
+    "CogenticBatchResult": "cogentic.orchestration.batch",
+    "CogenticBatchMetrics": "cogentic.orchestration.batch",
+    "CogenticProcessPoolRunner": "cogentic.orchestration.process_pool",
+    "CogenticPlanCache": "cogentic.orchestration.plan_cache",
+    "CogenticPlanCacheStats": "cogentic.orchestration.plan_cache",
+    "CogenticModelRouter": "cogentic.orchestration.routing",
+    "CogenticModelRoute": "cogentic.orchestration.routing",
+    "CogenticRouteStats": "cogentic.orchestration.routing",
+    "CogenticImageOptions": "cogentic.orchestration.models.image",
+    "CogenticImageStore": "cogentic.orchestration.images",
+    "CogenticSummaryOptions": "cogentic.orchestration.models.summary",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
+
+
+__all__ = [
+    "CogenticGroupChat",
+    "CogenticBatchRunner",
+    "CogenticBatchResult",
+    "CogenticBatchMetrics",
+    "CogenticProcessPoolRunner",
+    "CogenticPlanCache",
+    "CogenticPlanCacheStats",
+    "CogenticModelRouter",
+    "CogenticModelRoute",
+    "CogenticRouteStats",
+    "CogenticImageOptions",
+    "CogenticImageStore",
+    "CogenticSummaryOptions",
+]
@@ -0,0 +1,306 @@
+import asyncio
+import logging
+import time
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+)
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+from autogen_agentchat.base import TaskResult
+from autogen_core import CancellationToken
+from autogen_core.models import RequestUsage
+from pydantic import BaseModel, ConfigDict, Field
+
+from cogentic.orchestration.context import usage_listener
+
+if TYPE_CHECKING:
+    from cogentic.orchestration.chat import CogenticGroupChat
+
+logger = logging.getLogger(__name__)
+
+
+class CogenticBatchTimeoutError(TimeoutError):
+    """Raised when a batch item takes longer than the per-item timeout."""
+
+
+class CogenticBatchResult(BaseModel):
+    """The outcome of one task of a batch."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    index: int = Field(description="Position of the task in the batch")
+    task: str
+    session_id: str
+    result: TaskResult | None = Field(
+        default=None, description="The result of the successful attempt"
+    )
+    error: str | None = Field(default=None, description="Why the last attempt failed")
+    attempts: int = 0
+    duration: float = Field(default=0.0, description="Seconds spent on all attempts")
+    usage: RequestUsage = Field(
+        default_factory=lambda: RequestUsage(prompt_tokens=0, completion_tokens=0)
+    )
+
+    @property
+    def succeeded(self) -> bool:
+        return self.result is not None
+
+
+class CogenticBatchMetrics(BaseModel):
+    """Aggregate metrics of a batch run."""
+
+    submitted: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    timeouts: int = 0
+    retries: int = 0
+    in_flight: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    elapsed: float = 0.0
+    durations: list[float] = Field(default_factory=list, exclude=True)
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def throughput(self) -> float:
+        """Completed tasks per second."""
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    def latency(self, percentile: float) -> float:
+        """Duration of the tasks at a percentile (0-100), in seconds."""
+        if not self.durations:
+            return 0.0
+        ordered = sorted(self.durations)
+        rank = round(percentile / 100 * len(ordered)) - 1
+        return ordered[min(len(ordered) - 1, max(0, rank))]
+
+    def summary(self) -> dict[str, Any]:
+        """The metrics, including latency percentiles, as a flat dict."""
+        return {
+            **self.model_dump(),
+            "completed": self.completed,
+            "throughput": self.throughput,
+            "p50": self.latency(50),
+            "p95": self.latency(95),
+            "p99": self.latency(99),
+        }
+
+
+class CogenticBatchRunner:
+    """Runs many independent tasks through a bounded pool of teams, yielding results as they complete.
+
+    Each concurrent slot reuses its team (and its runtime) between tasks, resetting it in between, so a
+    batch of thousands of tasks only builds `concurrency` teams. Create the teams' model clients with
+    `get_model_client`, so all teams share the pooled clients and connections. A team whose task failed
+    or timed out is discarded, and replaced on demand.
+    """
+
+    def __init__(
+        self,
+        team_factory: Callable[[], "CogenticGroupChat"],
+        concurrency: int = 8,
+        timeout: float | None = None,
+        retries: int = 0,
+        retry_backoff: float = 1.0,
+        batch_id: str | None = None,
+    ):
+        """Initialize the batch runner.
+
+        Args:
+            team_factory (Callable[[], CogenticGroupChat]): Creates a team. Called up to `concurrency` times, and again for every discarded team.
+            concurrency (int): The maximum number of tasks running at once. Defaults to 8.
+            timeout (float | None): Seconds a single attempt may take. None means no limit. Defaults to None.
+            retries (int): How often a failed or timed out task is retried. Defaults to 0.
+            retry_backoff (float): Seconds to wait before the first retry, doubled for every further retry. Defaults to 1 second.
+            batch_id (str | None): Prefix of the session ids of the tasks. Defaults to a random id.
+        """
+        assert concurrency > 0, "Concurrency must be at least 1."
+        self.team_factory = team_factory
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.batch_id = batch_id or uuid4().hex[:12]
+        self.metrics = CogenticBatchMetrics()
+        self._idle_teams: list["CogenticGroupChat"] = []
+        # The cancellation token of the running attempt of each task, by index
+        self._cancellation_tokens: dict[int, CancellationToken] = {}
+
+    async def _attempt(
+        self, team: "CogenticGroupChat", item: CogenticBatchResult
+    ) -> TaskResult:
+        cancellation_token = CancellationToken()
+        self._cancellation_tokens[item.index] = cancellation_token
+
+        def record(usage: RequestUsage) -> None:
+            item.usage = RequestUsage(
+                prompt_tokens=item.usage.prompt_tokens + usage.prompt_tokens,
+                completion_tokens=item.usage.completion_tokens
+                + usage.completion_tokens,
+            )
+            self.metrics.prompt_tokens += usage.prompt_tokens
+            self.metrics.completion_tokens += usage.completion_tokens
+
+        # Cancel the model calls and agents in flight at the deadline. The team only finishes
+        # cancelling once its runtime is idle, so cancelling the run alone would wait for them.
+        deadline = (
+            asyncio.get_running_loop().call_later(
+                self.timeout, cancellation_token.cancel
+            )
+            if self.timeout is not None
+            else None
+        )
+        try:
+            with usage_listener(record):
+                async with asyncio.timeout(self.timeout):
+                    result = await team.run(
+                        task=item.task,
+                        cancellation_token=cancellation_token,
+                        session_id=item.session_id,
+                    )
+        except TimeoutError as e:
+            raise CogenticBatchTimeoutError(
+                f"The task took longer than {self.timeout} seconds."
+            ) from e
+        finally:
+            del self._cancellation_tokens[item.index]
+            if deadline is not None:
+                deadline.cancel()
+        if result.stop_reason is None:
+            # Errors in the orchestrator are logged by the runtime, and the run ends without a stop reason
+            raise RuntimeError("The run ended without a stop reason.")
+        return result
+
+    async def _run_item(self, item: CogenticBatchResult) -> None:
+        metrics = self.metrics
+        start = time.perf_counter()
+        while True:
+            item.attempts += 1
+            reused = bool(self._idle_teams)
+            team = self._idle_teams.pop() if reused else self.team_factory()
+            try:
+                if reused:
+                    # Teams continue their previous conversation unless reset
+                    await team.reset()
+                item.result = await self._attempt(team, item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if isinstance(e, CogenticBatchTimeoutError):
+                    metrics.timeouts += 1
+                item.error = str(e) or type(e).__name__
+                logger.warning(
+                    "Task %d failed on attempt %d: %s", item.index, item.attempts, e
+                )
+                # The team may be stuck mid run, don't reuse it
+                if item.attempts > self.retries:
+                    break
+                metrics.retries += 1
+                await asyncio.sleep(self.retry_backoff * 2 ** (item.attempts - 1))
+                continue
+            item.error = None
+            self._idle_teams.append(team)
+            break
+        item.duration = time.perf_counter() - start
+        metrics.durations.append(item.duration)
+        if item.succeeded:
+            metrics.succeeded += 1
+        else:
+            metrics.failed += 1
+
+    async def run(
+        self, tasks: Iterable[str] | AsyncIterable[str]
+    ) -> AsyncGenerator[CogenticBatchResult, None]:
+        """Run the tasks, yielding their results in the order they complete.
+
+        Tasks are taken from `tasks` as slots free up, so it may be a lazy (or endless) iterable, and results
+        are yielded while waiting for the next task. Closing the generator (`aclose()`) cancels the tasks still running.
+
+        Args:
+            tasks (Iterable[str] | AsyncIterable[str]): The tasks to run.
+        """
+        if isinstance(tasks, AsyncIterable):
+            source: AsyncIterator[str] = aiter(tasks)
+        else:
+
+            async def from_iterable() -> AsyncIterator[str]:
+                for task in tasks:
+                    yield task
+
+            source = from_iterable()
+
+        metrics = self.metrics
+        started = time.perf_counter()
+        elapsed = metrics.elapsed
+        running: set[asyncio.Future[Any]] = set()
+        items: dict[asyncio.Future[Any], CogenticBatchResult] = {}
+        # The next task is awaited alongside the running ones, so a slow source doesn't hold back results
+        next_task: asyncio.Future[str] | None = None
+        exhausted = False
+        try:
+            while True:
+                if (
+                    next_task is None
+                    and not exhausted
+                    and len(items) < self.concurrency
+                ):
+                    next_task = asyncio.ensure_future(anext(source))
+                    running.add(next_task)
+                metrics.in_flight = len(items)
+                if not running:
+                    break
+                done, running = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                if next_task in done:
+                    done.discard(next_task)
+                    try:
+                        task = next_task.result()
+                    except StopAsyncIteration:
+                        exhausted = True
+                    else:
+                        item = CogenticBatchResult(
+                            index=metrics.submitted,
+                            task=task,
+                            session_id=f"{self.batch_id}-{metrics.submitted}",
+                        )
+                        metrics.submitted += 1
+                        worker = asyncio.create_task(self._run_item(item))
+                        running.add(worker)
+                        items[worker] = item
+                    next_task = None
+                metrics.in_flight = len(items) - len(done)
+                metrics.elapsed = elapsed + time.perf_counter() - started
+                for worker in done:
+                    item = items.pop(worker)
+                    # Surface bugs in the runner itself, failed tasks are reported in their result
+                    worker.result()
+                    yield item
+        finally:
+            if next_task is not None:
+                next_task.cancel()
+            for worker, item in items.items():
+                # Cancel the token first, so the team doesn't wait for its agents to finish
+                cancellation_token = self._cancellation_tokens.get(item.index)
+                if cancellation_token is not None:
+                    cancellation_token.cancel()
+                worker.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            metrics.in_flight = 0
+            metrics.elapsed = elapsed + time.perf_counter() - started
+
+    async def run_all(
+        self, tasks: Iterable[str] | AsyncIterable[str]
+    ) -> list[CogenticBatchResult]:
+        """Run the tasks, returning the results in the order of the tasks."""
+        results = [result async for result in self.run(tasks)]
+        return sorted(results, key=lambda result: result.index)
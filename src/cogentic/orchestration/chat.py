@@ -1,16 +1,28 @@
 import logging
-from typing import Callable, List
+from typing import AsyncGenerator, Callable, List, Mapping, Sequence
 
 from autogen_agentchat import EVENT_LOGGER_NAME, TRACE_LOGGER_NAME
-from autogen_agentchat.base import ChatAgent, TerminationCondition
+from autogen_agentchat.base import ChatAgent, TaskResult, TerminationCondition
+from autogen_agentchat.messages import AgentEvent, ChatMessage
 from autogen_agentchat.teams._group_chat._base_group_chat import BaseGroupChat
-from autogen_core import Component, ComponentModel
+from autogen_core import CancellationToken, Component, ComponentModel
 from autogen_core.models import ChatCompletionClient
 from pydantic import BaseModel
 from typing_extensions import Self
 
+from cogentic.orchestration.context import new_run, run_context
+from cogentic.orchestration.models.budget import CogenticBudget
+from cogentic.orchestration.models.image import CogenticImageOptions
+from cogentic.orchestration.models.render import CogenticRenderFormat
+from cogentic.orchestration.models.summary import CogenticSummaryOptions
 from cogentic.orchestration.orchestrator import CogenticOrchestrator
-from cogentic.orchestration.prompts.prompts import FINAL_ANSWER_PROMPT
+from cogentic.orchestration.plan_cache import CogenticPlanCache
+from cogentic.orchestration.prompts.prompts import (
+    FINAL_ANSWER_PROMPT,
+    CogenticPromptName,
+)
+from cogentic.orchestration.routing import CogenticModelRouter
+from cogentic.orchestration.tracing import CogenticTracer
 
 trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
 event_logger = logging.getLogger(EVENT_LOGGER_NAME)
@@ -21,19 +33,31 @@ class CogenticGroupChatConfig(BaseModel):
 
     participants: List[ComponentModel]
     model_client: ComponentModel
+    json_model_client: ComponentModel | None = None
     termination_condition: ComponentModel | None = None
     max_turns_total: int | None = None
     max_turns_per_hypothesis: int | None = None
     max_turns_per_test: int | None = None
     max_stalls: int
     final_answer_prompt: str
+    use_summarized_context: bool = False
+    use_plan_patches: bool = False
+    use_two_stage_planning: bool = False
+    use_tiered_ledger: bool = False
+    progress_check_model_client: ComponentModel | None = None
+    model_router: ComponentModel | None = None
+    prompt_formats: dict[CogenticPromptName, CogenticRenderFormat] | None = None
+    image_options: CogenticImageOptions | None = None
+    summary_options: CogenticSummaryOptions | None = None
+    budget: CogenticBudget | None = None
+    stream_output: bool = False
 
 
 class CogenticGroupChat(BaseGroupChat, Component[CogenticGroupChatConfig]):
     """A team that runs a group chat with participants managed by the CogenticOrchestrator."""
 
     component_config_schema = CogenticGroupChatConfig
-    component_provider_override = "autogen_agentchat.teams.CogenticGroupChat"
+    component_provider_override = "cogentic.CogenticGroupChat"
 
     def __init__(
         self,
@@ -47,6 +71,18 @@ class CogenticGroupChat(BaseGroupChat, Component[CogenticGroupChatConfig]):
         max_stalls: int = 3,
         final_answer_prompt: str = FINAL_ANSWER_PROMPT,
         use_summarized_context: bool = False,
+        use_plan_patches: bool = False,
+        use_two_stage_planning: bool = False,
+        use_tiered_ledger: bool = False,
+        progress_check_model_client: ChatCompletionClient | None = None,
+        tracer: CogenticTracer | None = None,
+        budget: CogenticBudget | None = None,
+        stream_output: bool = False,
+        plan_cache: CogenticPlanCache | None = None,
+        model_router: CogenticModelRouter | None = None,
+        prompt_formats: Mapping[CogenticPromptName, CogenticRenderFormat] | None = None,
+        image_options: CogenticImageOptions | None = None,
+        summary_options: CogenticSummaryOptions | None = None,
     ):
         """Initialize the CogenticGroupChat.
 
@@ -61,6 +97,18 @@ class CogenticGroupChat(BaseGroupChat, Component[CogenticGroupChatConfig]):
             max_stalls (int): The maximum number of stalls before the group chat is terminated. Defaults to 3.
             final_answer_prompt (str): The prompt to use for the final answer. Defaults to FINAL_ANSWER_PROMPT.
             use_summarized_context (bool): Whether to summarize agent actions using another LLM prompt. Defaults to False.
+            use_plan_patches (bool): Whether replans describe changes as patch operations against the existing plan, rather than full hypotheses and tests. Defaults to False.
+            use_two_stage_planning (bool): Whether to collect the initial evidence and create the initial hypotheses in two consecutive model calls, rather than in one. Defaults to False.
+            use_tiered_ledger (bool): Whether each turn starts with a quick progress check, and only updates the full progress ledger when the check finds the state of the work changed. Routine turns just continue with the same team member. Defaults to False.
+            progress_check_model_client (ChatCompletionClient | None): The model client for the quick progress checks, e.g. a smaller model. Defaults to None, in which case model_client and json_model_client are used.
+            tracer (CogenticTracer | None): Tracer recording spans for each orchestrator phase and agent turn. Defaults to None, in which case tracing is disabled.
+            budget (CogenticBudget | None): Token and cost limits for each run, hypothesis and test. Exceeding a hypothesis or test budget triggers a replan, and exceeding the run budget prepares the final answer. Defaults to None.
+            stream_output (bool): Whether to stream the orchestrator's reasoning, including for the final answer, to `run_stream` as ModelClientStreamingChunkEvents while it is generated. Defaults to False.
+            plan_cache (CogenticPlanCache | None): Cache of the initial plans of questions, to skip planning for repeated and similar questions. Share it between teams. Defaults to None.
+            model_router (CogenticModelRouter | None): Routes the orchestrator's call sites to other model clients, e.g. cheaper models for utility work, and reports the latency of each route. Defaults to None, in which case all calls use the clients above.
+            prompt_formats (Mapping[CogenticPromptName, CogenticRenderFormat] | None): The format the plan is rendered in, for the "current_state", "replan" and "final_answer" prompts. The compact formats ("compact_json", "table" and "yaml") save prompt tokens. Defaults to None, in which case all prompts use indented "json".
+            image_options (CogenticImageOptions | None): Enables the image pipeline: images in team members' messages are downscaled and re-encoded once, stored outside the work thread, and only the most recent ones are sent to the model, older ones as captions. Defaults to None, in which case images stay in the thread as they are.
+            summary_options (CogenticSummaryOptions | None): How team members' responses are summarized: small and JSON responses without a model call, and long responses in concurrently summarized chunks, which are then combined. Defaults to None, in which case every response is summarized in a single call.
         """
         super().__init__(
             participants,
@@ -84,6 +132,18 @@ class CogenticGroupChat(BaseGroupChat, Component[CogenticGroupChatConfig]):
         self._max_turns_per_test = max_turns_per_test
         self._final_answer_prompt = final_answer_prompt
         self._use_summarized_context = use_summarized_context
+        self._use_plan_patches = use_plan_patches
+        self._use_two_stage_planning = use_two_stage_planning
+        self._use_tiered_ledger = use_tiered_ledger
+        self._progress_check_model_client = progress_check_model_client
+        self._tracer = tracer
+        self._budget = budget
+        self._stream_output = stream_output
+        self._plan_cache = plan_cache
+        self._model_router = model_router
+        self._prompt_formats = dict(prompt_formats) if prompt_formats else None
+        self._image_options = image_options
+        self._summary_options = summary_options
 
     def _create_group_chat_manager_factory(
         self,
@@ -107,8 +167,76 @@ class CogenticGroupChat(BaseGroupChat, Component[CogenticGroupChatConfig]):
             max_stalls=self._max_stalls,
             final_answer_prompt=self._final_answer_prompt,
             use_summarized_context=self._use_summarized_context,
+            use_plan_patches=self._use_plan_patches,
+            use_two_stage_planning=self._use_two_stage_planning,
+            use_tiered_ledger=self._use_tiered_ledger,
+            progress_check_model_client=self._progress_check_model_client,
+            tracer=self._tracer,
+            budget=self._budget,
+            stream_output=self._stream_output,
+            plan_cache=self._plan_cache,
+            model_router=self._model_router,
+            prompt_formats=self._prompt_formats,
+            image_options=self._image_options,
+            summary_options=self._summary_options,
         )
 
+    async def run(
+        self,
+        *,
+        task: str | ChatMessage | Sequence[ChatMessage] | None = None,
+        cancellation_token: CancellationToken | None = None,
+        session_id: str | None = None,
+    ) -> TaskResult:
+        """Run the team and return the result.
+
+        Args:
+            task (str | ChatMessage | Sequence[ChatMessage] | None): The task to run the team with.
+            cancellation_token (CancellationToken | None): The cancellation token to kill the task immediately.
+            session_id (str | None): The session the run belongs to, used to attribute model calls. Defaults to the enclosing run's session, or a new session.
+        """
+        result: TaskResult | None = None
+        async for message in self.run_stream(
+            task=task, cancellation_token=cancellation_token, session_id=session_id
+        ):
+            if isinstance(message, TaskResult):
+                result = message
+        if result is not None:
+            return result
+        raise AssertionError("The stream should have returned the final result.")
+
+    async def run_stream(
+        self,
+        *,
+        task: str | ChatMessage | Sequence[ChatMessage] | None = None,
+        cancellation_token: CancellationToken | None = None,
+        session_id: str | None = None,
+    ) -> AsyncGenerator[AgentEvent | ChatMessage | TaskResult, None]:
+        """Run the team and produce a stream of messages, with the final result as the last item.
+
+        Model calls made by the orchestrator and participants during the run are attributed to the run and
+        session through `run_context`, so model clients can be shared between concurrent runs.
+
+        Args:
+            task (str | ChatMessage | Sequence[ChatMessage] | None): The task to run the team with.
+            cancellation_token (CancellationToken | None): The cancellation token to kill the task immediately.
+            session_id (str | None): The session the run belongs to, used to attribute model calls. Defaults to the enclosing run's session, or a new session.
+        """
+        run = new_run(session_id)
+        stream = super().run_stream(task=task, cancellation_token=cancellation_token)
+        try:
+            while True:
+                # The run context is only entered while the stream runs, rather than across yields, so it doesn't
+                # leak into the consumer's code. The runtime is started within the stream, so its tasks inherit it.
+                with run_context(session_id=run.session_id, run_id=run.run_id):
+                    try:
+                        message = await anext(stream)
+                    except StopAsyncIteration:
+                        break
+                yield message
+        finally:
+            await stream.aclose()
+
     def _to_config(self) -> CogenticGroupChatConfig:
         participants = [
             participant.dump_component() for participant in self._participants
@@ -118,14 +246,40 @@ class CogenticGroupChat(BaseGroupChat, Component[CogenticGroupChatConfig]):
             if self._termination_condition
             else None
         )
+        # The JSON model client defaults to the model client, so only store it if it's a different client
+        json_model_client = (
+            self._json_model_client.dump_component()
+            if self._json_model_client is not self._model_client
+            else None
+        )
+        progress_check_model_client = (
+            self._progress_check_model_client.dump_component()
+            if self._progress_check_model_client
+            else None
+        )
         return CogenticGroupChatConfig(
             participants=participants,
             model_client=self._model_client.dump_component(),
+            json_model_client=json_model_client,
             termination_condition=termination_condition,
             max_turns_total=self._max_turns,
             max_turns_per_hypothesis=self._max_turns_per_hypothesis,
+            max_turns_per_test=self._max_turns_per_test,
             max_stalls=self._max_stalls,
             final_answer_prompt=self._final_answer_prompt,
+            use_summarized_context=self._use_summarized_context,
+            use_plan_patches=self._use_plan_patches,
+            use_two_stage_planning=self._use_two_stage_planning,
+            use_tiered_ledger=self._use_tiered_ledger,
+            progress_check_model_client=progress_check_model_client,
+            model_router=self._model_router.dump_component()
+            if self._model_router
+            else None,
+            prompt_formats=self._prompt_formats,
+            image_options=self._image_options,
+            summary_options=self._summary_options,
+            budget=self._budget,
+            stream_output=self._stream_output,
         )
 
     @classmethod
@@ -134,12 +288,36 @@ class CogenticGroupChat(BaseGroupChat, Component[CogenticGroupChatConfig]):
             ChatAgent.load_component(participant) for participant in config.participants
         ]
         model_client = ChatCompletionClient.load_component(config.model_client)
+        json_model_client = (
+            ChatCompletionClient.load_component(config.json_model_client)
+            if config.json_model_client
+            else None
+        )
+        progress_check_model_client = (
+            ChatCompletionClient.load_component(config.progress_check_model_client)
+            if config.progress_check_model_client
+            else None
+        )
         return cls(
             participants,
             model_client,
+            json_model_client,
             max_turns_total=config.max_turns_total,
             max_turns_per_hypothesis=config.max_turns_per_hypothesis,
             max_turns_per_test=config.max_turns_per_test,
             max_stalls=config.max_stalls,
             final_answer_prompt=config.final_answer_prompt,
+            use_summarized_context=config.use_summarized_context,
+            use_plan_patches=config.use_plan_patches,
+            use_two_stage_planning=config.use_two_stage_planning,
+            use_tiered_ledger=config.use_tiered_ledger,
+            progress_check_model_client=progress_check_model_client,
+            model_router=CogenticModelRouter.load_component(config.model_router)
+            if config.model_router
+            else None,
+            prompt_formats=config.prompt_formats,
+            image_options=config.image_options,
+            summary_options=config.summary_options,
+            budget=config.budget,
+            stream_output=config.stream_output,
         )
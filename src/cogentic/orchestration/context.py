@@ -0,0 +1,133 @@
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, NamedTuple, TypeVar, cast
+from uuid import uuid4
+
+from autogen_core.models import RequestUsage
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class CogenticRunContext(NamedTuple):
+    """The session and run that model calls are made for."""
+
+    session_id: str
+    run_id: str
+
+
+_RUN: ContextVar[CogenticRunContext | None] = ContextVar("cogentic_run", default=None)
+
+
+def new_run(
+    session_id: str | None = None, run_id: str | None = None
+) -> CogenticRunContext:
+    """Create a run, without entering it.
+
+    Args:
+        session_id (str | None, optional): The session the run belongs to. Defaults to the enclosing run's session, or the run id if there is none.
+        run_id (str | None, optional): The id of the run. Defaults to a new random id.
+    """
+    run_id = run_id or uuid4().hex
+    if session_id is None:
+        current = _RUN.get()
+        session_id = current.session_id if current else run_id
+    return CogenticRunContext(session_id=session_id, run_id=run_id)
+
+
+@contextmanager
+def run_context(
+    session_id: str | None = None, run_id: str | None = None
+) -> Iterator[CogenticRunContext]:
+    """Attribute model calls made within this context to a run, so clients can be shared between runs.
+
+    Args:
+        session_id (str | None, optional): The session the run belongs to. Defaults to the enclosing run's session, or the run id if there is none.
+        run_id (str | None, optional): The id of the run. Defaults to a new random id.
+    """
+    run = new_run(session_id, run_id)
+    token = _RUN.set(run)
+    try:
+        yield run
+    finally:
+        try:
+            _RUN.reset(token)
+        except ValueError:
+            # An async generator holding the context was closed from another context
+            pass
+
+
+def current_run() -> CogenticRunContext | None:
+    """Get the current run, if there is one."""
+    return _RUN.get()
+
+
+_CALL_SITE: ContextVar[str] = ContextVar("cogentic_call_site", default="unknown")
+_CALL_ATTEMPT: ContextVar[int] = ContextVar("cogentic_call_attempt", default=0)
+
+
+@contextmanager
+def call_site(name: str, attempt: int = 0, nested: bool = False) -> Iterator[None]:
+    """Tag model calls made within this context with a call site.
+
+    Args:
+        name (str): The call site, e.g. the orchestrator phase making the call.
+        attempt (int, optional): The attempt number. Calls with an attempt above 0 count as retries. Defaults to 0.
+        nested (bool, optional): Whether to append the name to the current call site (e.g. `progress_ledger/json`), rather than replacing it. Defaults to False.
+    """
+    if nested:
+        name = f"{_CALL_SITE.get()}/{name}"
+    site_token = _CALL_SITE.set(name)
+    attempt_token = _CALL_ATTEMPT.set(attempt)
+    try:
+        yield
+    finally:
+        _CALL_ATTEMPT.reset(attempt_token)
+        _CALL_SITE.reset(site_token)
+
+
+def current_call_site() -> tuple[str, int]:
+    """Get the current call site and attempt number."""
+    return _CALL_SITE.get(), _CALL_ATTEMPT.get()
+
+
+_USAGE_LISTENERS: ContextVar[tuple[Callable[[RequestUsage], None], ...]] = ContextVar(
+    "cogentic_usage_listeners", default=()
+)
+
+
+@contextmanager
+def usage_listener(listener: Callable[[RequestUsage], None]) -> Iterator[None]:
+    """Report the usage of model calls made within this context to a listener.
+
+    Listeners nest: calls are reported to the listeners of all enclosing contexts, e.g. both a run's budget
+    and a batch's metrics.
+    """
+    listeners = _USAGE_LISTENERS.get()
+    # A listener entered twice would count every call twice
+    if listener not in listeners:
+        listeners = (*listeners, listener)
+    token = _USAGE_LISTENERS.set(listeners)
+    try:
+        yield
+    finally:
+        _USAGE_LISTENERS.reset(token)
+
+
+def record_usage(usage: RequestUsage | None) -> None:
+    """Report the usage of a model call to the current listeners, if there are any."""
+    if usage is None:
+        return
+    for listener in _USAGE_LISTENERS.get():
+        listener(usage)
+
+
+def reports_usage(func: F) -> F:
+    """Report the usage of model calls made within an async method to the object's `_record_usage`."""
+
+    @functools.wraps(func)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        with usage_listener(self._record_usage):
+            return await func(self, *args, **kwargs)
+
+    return cast(F, wrapper)
@@ -0,0 +1,188 @@
+import base64
+import hashlib
+import io
+import re
+from typing import List, Mapping, Sequence
+
+from autogen_agentchat.messages import AgentEvent, ChatMessage, MultiModalMessage
+from autogen_agentchat.utils import content_to_str
+from autogen_core import Image
+from autogen_core.models import LLMMessage, UserMessage
+
+from cogentic.orchestration.models.image import (
+    CogenticImageOptions,
+    CogenticStoredImage,
+)
+
+# Images in the work thread are replaced by a reference to the store
+IMAGE_REFERENCE = "<image:{key}>"
+_IMAGE_REFERENCE_PATTERN = re.compile(r"^<image:([0-9a-f]{16})>$")
+
+
+def image_key(item: object) -> str | None:
+    """The key of the stored image an item of message content refers to, if any."""
+    if isinstance(item, str):
+        match = _IMAGE_REFERENCE_PATTERN.match(item)
+        if match:
+            return match.group(1)
+    return None
+
+
+class CogenticImageStore:
+    """Stores the images of the work thread by content hash, and decides which of them are sent to the model.
+
+    Images are downscaled and re-encoded once, on ingest, and the thread only keeps a reference to them. When
+    the thread is turned into a context, the most recent images are sent as images, and older ones as their
+    captions.
+    """
+
+    def __init__(self, options: CogenticImageOptions):
+        """Initialize the image store.
+
+        Args:
+            options (CogenticImageOptions): How images are processed and sent.
+        """
+        self.options = options
+        self._images: dict[str, CogenticStoredImage] = {}
+        # Decoded images, created once, and the keys of their instances
+        self._decoded: dict[str, Image] = {}
+        self._keys: dict[int, str] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._images
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+    @staticmethod
+    def key(image: Image) -> str:
+        """The content hash of an image, which it's stored by."""
+        digest = hashlib.sha256(f"{image.image.mode}{image.image.size}".encode())
+        digest.update(image.image.tobytes())
+        return digest.hexdigest()[:16]
+
+    def ingest(self, image: Image, source: str) -> str:
+        """Downscale, re-encode and store an image, unless stored before.
+
+        Args:
+            image (Image): The image.
+            source (str): Name of the team member who produced the image.
+
+        Returns:
+            str: The key of the stored image.
+        """
+        key = self.key(image)
+        if key not in self._images:
+            self._store(key, image, source)
+        return key
+
+    def _store(self, key: str, image: Image, source: str) -> None:
+        processed = image.image.copy()
+        processed.thumbnail((self.options.max_size, self.options.max_size))
+        if self.options.format == "JPEG" and processed.mode != "RGB":
+            processed = processed.convert("RGB")
+        buffer = io.BytesIO()
+        processed.save(buffer, format=self.options.format, quality=self.options.quality)
+        self._images[key] = CogenticStoredImage(
+            data=base64.b64encode(buffer.getvalue()).decode(),
+            width=processed.width,
+            height=processed.height,
+            source=source,
+        )
+
+    def ingest_message(
+        self, message: MultiModalMessage
+    ) -> tuple[MultiModalMessage, list[str]]:
+        """Store the images of a message.
+
+        Returns:
+            tuple[MultiModalMessage, list[str]]: The message, with references in place of its images, and the keys of the images stored for the first time.
+        """
+        content: list[str | Image] = []
+        new_keys: list[str] = []
+        for item in message.content:
+            if isinstance(item, Image):
+                key = self.key(item)
+                if key not in self._images:
+                    self._store(key, item, message.source)
+                    new_keys.append(key)
+                item = IMAGE_REFERENCE.format(key=key)
+            content.append(item)
+        return message.model_copy(update={"content": content}), new_keys
+
+    def image(self, key: str) -> Image:
+        """Get a stored image."""
+        image = self._decoded.get(key)
+        if image is None:
+            image = Image.from_base64(self._images[key].data)
+            self._decoded[key] = image
+            self._keys[id(image)] = key
+        return image
+
+    def caption(self, key: str) -> str:
+        """Get the caption of a stored image, or describe it by size and source if it has none."""
+        stored = self._images[key]
+        if stored.caption:
+            return f"[Image from {stored.source}: {stored.caption}]"
+        return f"[Image from {stored.source}, {stored.width}x{stored.height}]"
+
+    def set_caption(self, key: str, caption: str) -> None:
+        self._images[key].caption = caption
+
+    def recent_keys(self, thread: Sequence[AgentEvent | ChatMessage]) -> set[str]:
+        """The keys of the most recent images referenced in a thread, which are sent as images."""
+        keys: list[str] = []
+        for message in reversed(thread):
+            if isinstance(message, MultiModalMessage):
+                for item in reversed(message.content):
+                    key = image_key(item)
+                    if key is not None and key not in keys:
+                        keys.append(key)
+        return set(keys[: self.options.recent_images])
+
+    def resolve(
+        self, content: Sequence[str | Image], recent_keys: set[str]
+    ) -> list[str | Image]:
+        """Replace the references in message content by recent images, or by captions otherwise."""
+        resolved: list[str | Image] = []
+        for item in content:
+            key = image_key(item)
+            if key is None or key not in self._images:
+                resolved.append(item)
+            elif key in recent_keys:
+                resolved.append(self.image(key))
+            else:
+                resolved.append(self.caption(key))
+        return resolved
+
+    def replace_images(self, messages: List[LLMMessage]) -> List[LLMMessage]:
+        """Replace images by their captions, for models without vision."""
+        replaced: List[LLMMessage] = []
+        for message in messages:
+            if isinstance(message, UserMessage) and isinstance(message.content, list):
+                content = [
+                    self.caption(self._keys[id(item)])
+                    if isinstance(item, Image) and id(item) in self._keys
+                    else item
+                    for item in message.content
+                ]
+                replaced.append(
+                    UserMessage(content=content_to_str(content), source=message.source)
+                )
+            else:
+                replaced.append(message)
+        return replaced
+
+    def clear(self) -> None:
+        self._images.clear()
+        self._decoded.clear()
+        self._keys.clear()
+
+    def dump(self) -> dict[str, CogenticStoredImage]:
+        """Get a copy of the stored images, e.g. to save them with the state."""
+        return {key: image.model_copy() for key, image in self._images.items()}
+
+    def load(self, images: Mapping[str, CogenticStoredImage]) -> None:
+        """Replace the stored images."""
+        self.clear()
+        self._images.update({key: image.model_copy() for key, image in images.items()})
@@ -1,16 +1,21 @@
 import json
 import re
-from typing import Type, TypeVar
+from typing import Any, Awaitable, Callable, Type, TypeVar
 
 from autogen_core import CancellationToken
 from autogen_core.models import (
     AssistantMessage,
     ChatCompletionClient,
+    CreateResult,
     LLMMessage,
     UserMessage,
 )
 from pydantic import BaseModel, ValidationError
 
+from cogentic.orchestration.context import call_site, record_usage
+from cogentic.orchestration.schema import response_schema
+from cogentic.orchestration.tracing import trace_span
+
 T = TypeVar("T", bound=BaseModel)
 
 FORMAT_PROMPT = """\
@@ -26,6 +31,7 @@ Here is the SCHEMA of the response format:
 ```
 
 - Note that you need to create an instance of the model that ADHERES to this schema; not the schema itself.
+- All properties without a default are required.
 
 
 ### Note
@@ -75,6 +81,34 @@ class CogenticOutputParsingError(Exception):
         return self.message
 
 
+async def _reason(
+    model_client: ChatCompletionClient,
+    messages: list[LLMMessage],
+    cancellation_token: CancellationToken,
+    on_reasoning_chunk: Callable[[str], Awaitable[None]] | None,
+) -> CreateResult:
+    """Get the model's reasoning, streaming it to `on_reasoning_chunk` if given."""
+    with trace_span("reason"):
+        if on_reasoning_chunk is None:
+            response = await model_client.create(
+                messages=messages,
+                cancellation_token=cancellation_token,
+            )
+        else:
+            response = None
+            async for chunk in model_client.create_stream(
+                messages=messages,
+                cancellation_token=cancellation_token,
+            ):
+                if isinstance(chunk, CreateResult):
+                    response = chunk
+                else:
+                    await on_reasoning_chunk(chunk)
+            assert response is not None, "The stream should end with the result."
+    record_usage(response.usage)
+    return response
+
+
 def _extract_json_from_response(response: str) -> str | None:
     json_match = re.search(r"```json\n(.*?)\n```", response, re.DOTALL)
     if json_match:
@@ -92,30 +126,42 @@ async def _reason_and_request_model_via_markdown(
     cancellation_token: CancellationToken,
     response_model: Type[T],
     retries: int = 3,
+    validation_context: dict[str, Any] | None = None,
+    on_reasoning_chunk: Callable[[str], Awaitable[None]] | None = None,
+    json_model_client_for_attempt: Callable[[int], ChatCompletionClient] | None = None,
 ):
     errors = []
     # First, get the model to respond using the original prompt
-    first_response = await model_client.create(
-        messages=messages,
-        cancellation_token=cancellation_token,
+    first_response = await _reason(
+        model_client, messages, cancellation_token, on_reasoning_chunk
     )
     assert isinstance(first_response.content, str)
     create_messages = messages[:] + [
         AssistantMessage(content=first_response.content, source="assistant"),
         UserMessage(
             content=FORMAT_PROMPT.format(
-                response_schema=json.dumps(response_model.model_json_schema(), indent=2)
+                response_schema=response_schema(response_model)
             ),
             source="assistant",
         ),
     ]
     retry_messages = create_messages[:]
-    for _ in range(retries):
+    for attempt in range(retries):
         try:
-            response = await json_model_client.create(
-                messages=retry_messages,
-                cancellation_token=cancellation_token,
-            )
+            with (
+                call_site("json", attempt=attempt, nested=True),
+                trace_span("json", attempt=attempt),
+            ):
+                client = (
+                    json_model_client_for_attempt(attempt)
+                    if json_model_client_for_attempt
+                    else json_model_client
+                )
+                response = await client.create(
+                    messages=retry_messages,
+                    cancellation_token=cancellation_token,
+                )
+            record_usage(response.usage)
             assert isinstance(response.content, str)
             json_object = None
             try:
@@ -124,8 +170,11 @@ async def _reason_and_request_model_via_markdown(
                     raise CogenticOutputParsingError(
                         "No JSON markdown block found in the response. Please ensure your response is formatted correctly."
                     )
-                json_object = json.loads(json_content)
-                return response_model.model_validate(json_object)
+                with trace_span("validate"):
+                    json_object = json.loads(json_content)
+                    return response_model.model_validate(
+                        json_object, context=validation_context
+                    )
             except (CogenticOutputParsingError, ValidationError) as e:
                 # We don't want to include multiple error messages in the retry
                 input_str = (
@@ -160,11 +209,13 @@ async def _reason_and_request_model_directly(
     cancellation_token: CancellationToken,
     response_model: Type[T],
     retries: int = 3,
+    validation_context: dict[str, Any] | None = None,
+    on_reasoning_chunk: Callable[[str], Awaitable[None]] | None = None,
+    json_model_client_for_attempt: Callable[[int], ChatCompletionClient] | None = None,
 ) -> T:
     # First, get the model to respond using the original prompt
-    first_response = await model_client.create(
-        messages=messages,
-        cancellation_token=cancellation_token,
+    first_response = await _reason(
+        model_client, messages, cancellation_token, on_reasoning_chunk
     )
     assert isinstance(first_response.content, str)
     create_messages = messages + [
@@ -176,16 +227,29 @@ async def _reason_and_request_model_directly(
     ]
     errors = []
     retry_messages = create_messages[:]
-    for _ in range(retries):
+    for attempt in range(retries):
         try:
             # Now use the json model client to get the JSON output
-            model_response = await json_model_client.create(
-                messages=retry_messages,
-                cancellation_token=cancellation_token,
-                extra_create_args={"response_format": response_model},
-            )
+            with (
+                call_site("json", attempt=attempt, nested=True),
+                trace_span("json", attempt=attempt),
+            ):
+                client = (
+                    json_model_client_for_attempt(attempt)
+                    if json_model_client_for_attempt
+                    else json_model_client
+                )
+                model_response = await client.create(
+                    messages=retry_messages,
+                    cancellation_token=cancellation_token,
+                    extra_create_args={"response_format": response_model},
+                )
+            record_usage(model_response.usage)
             assert isinstance(model_response.content, str)
-            return response_model.model_validate_json(model_response.content)
+            with trace_span("validate"):
+                return response_model.model_validate_json(
+                    model_response.content, context=validation_context
+                )
         except Exception as e:
             # We don't want to include multiple error messages in the retry
             retry_messages = create_messages[:]
@@ -207,6 +271,9 @@ async def reason_and_output_model(
     cancellation_token: CancellationToken,
     response_model: Type[T],
     retries: int = 3,
+    validation_context: dict[str, Any] | None = None,
+    on_reasoning_chunk: Callable[[str], Awaitable[None]] | None = None,
+    json_model_client_for_attempt: Callable[[int], ChatCompletionClient] | None = None,
 ) -> T:
     """
     Reason and output the model.
@@ -218,6 +285,9 @@ async def reason_and_output_model(
         cancellation_token (CancellationToken): The cancellation token to use for the request
         response_model (Type[T]): The model to use for the response
         retries (int, optional): The number of retries to attempt. Defaults to 3.
+        validation_context (dict[str, Any] | None, optional): Context passed to the response model's validators. Defaults to None.
+        on_reasoning_chunk (Callable[[str], Awaitable[None]] | None, optional): If given, the reasoning is streamed, and each chunk is passed to this callback. Defaults to None.
+        json_model_client_for_attempt (Callable[[int], ChatCompletionClient] | None, optional): If given, picks the client for each JSON attempt (from 0), e.g. to escalate to a stronger model after parse failures. Defaults to None, in which case json_model_client makes all attempts.
 
     Returns:
         T: The model output type
@@ -229,4 +299,7 @@ async def reason_and_output_model(
         cancellation_token=cancellation_token,
         response_model=response_model,
         retries=retries,
+        validation_context=validation_context,
+        on_reasoning_chunk=on_reasoning_chunk,
+        json_model_client_for_attempt=json_model_client_for_attempt,
     )
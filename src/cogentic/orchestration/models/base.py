@@ -1,18 +1,264 @@
-import json
+import weakref
+from typing import Any, Iterable, SupportsIndex
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
+from pydantic_core import to_json
+
+from cogentic.orchestration.models.render import CogenticRenderFormat, render
+
+# Cache keys are (indent, depth, field). A field of None is the fragment for the whole object.
+_FragmentKey = tuple[int, int, str | None]
+
+
+def _pad(indent: int, depth: int) -> str:
+    return " " * (indent * depth)
+
+
+def _is_tracked(value: Any) -> bool:
+    """Whether every change to this value is reported to its owner, so its fragment can be cached."""
+    if isinstance(value, CogenticBaseModel):
+        return True
+    if isinstance(value, _TrackedList):
+        return all(_is_tracked(item) for item in value)
+    return not isinstance(value, (BaseModel, list, tuple, dict, set))
+
+
+def _value_to_json(value: Any, indent: int, depth: int) -> str:
+    """Render a value as indented json, reusing cached fragments for cogentic models."""
+    if isinstance(value, CogenticBaseModel):
+        return value._json_fragment(indent, depth)
+    if isinstance(value, (list, tuple)):
+        if not value:
+            return "[]"
+        inner = _pad(indent, depth + 1)
+        items = ",\n".join(
+            f"{inner}{_value_to_json(item, indent, depth + 1)}" for item in value
+        )
+        return f"[\n{items}\n{_pad(indent, depth)}]"
+    rendered = to_json(value, indent=indent).decode()
+    if depth and "\n" in rendered:
+        rendered = rendered.replace("\n", "\n" + _pad(indent, depth))
+    return rendered
+
+
+class _TrackedList(list):
+    """A list field which invalidates its owner's rendered fragments whenever it is mutated."""
+
+    def __init__(self, items: Iterable[Any], owner: "CogenticBaseModel", field: str):
+        super().__init__(items)
+        self._owner = weakref.ref(owner)
+        self._field = field
+        for item in self:
+            self._adopt(item)
+
+    def _adopt(self, item: Any) -> None:
+        owner = self._owner()
+        if owner is not None and isinstance(item, CogenticBaseModel):
+            item._add_parent(owner, self._field)
+
+    def _changed(self, new_items: Iterable[Any] = ()) -> None:
+        for item in new_items:
+            self._adopt(item)
+        owner = self._owner()
+        if owner is not None:
+            owner._invalidate(self._field)
+
+    def __reduce_ex__(self, protocol: SupportsIndex):
+        # Copies and pickles are plain lists; the owning model re-tracks them.
+        return (list, (list(self),))
+
+    def append(self, item: Any) -> None:
+        super().append(item)
+        self._changed((item,))
+
+    def extend(self, items: Iterable[Any]) -> None:
+        items = list(items)
+        super().extend(items)
+        self._changed(items)
+
+    def insert(self, index: SupportsIndex, item: Any) -> None:
+        super().insert(index, item)
+        self._changed((item,))
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        if isinstance(index, slice):
+            value = list(value)
+            super().__setitem__(index, value)
+            self._changed(value)
+        else:
+            super().__setitem__(index, value)
+            self._changed((value,))
+
+    def __iadd__(self, items: Iterable[Any]):  # type: ignore[override]
+        self.extend(items)
+        return self
+
+    def __imul__(self, count: SupportsIndex):  # type: ignore[override]
+        super().__imul__(count)
+        self._changed()
+        return self
+
+    def __delitem__(self, index: Any) -> None:
+        super().__delitem__(index)
+        self._changed()
+
+    def pop(self, index: SupportsIndex = -1) -> Any:
+        item = super().pop(index)
+        self._changed()
+        return item
+
+    def remove(self, item: Any) -> None:
+        super().remove(item)
+        self._changed()
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._changed()
 
 
 class CogenticBaseModel(BaseModel):
+    # Rendered json fragments, invalidated when a field is assigned, a list field is mutated or a
+    # nested model changes.
+    _fragment_cache: dict[_FragmentKey, str] = PrivateAttr(default_factory=dict)
+    # Models which hold this one, along with the field they hold it in.
+    _parents: list[tuple[weakref.ref, str]] = PrivateAttr(default_factory=list)
+
+    def model_post_init(self, __context: Any) -> None:
+        for name in type(self).model_fields:
+            self._track(name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._track(name)
+            self._invalidate(name)
+
+    def __copy__(self):
+        copied = super().__copy__()
+        copied._retrack()
+        return copied
+
+    def __deepcopy__(self, memo: dict[int, Any] | None = None):
+        copied = super().__deepcopy__(memo)
+        copied._retrack()
+        return copied
+
+    def model_copy(self, *, update=None, deep: bool = False):
+        copied = super().model_copy(update=update, deep=deep)
+        copied._retrack()
+        return copied
+
+    def __getstate__(self) -> dict[Any, Any]:
+        state = super().__getstate__()
+        # Weak references can't be pickled, and the cache is cheap to rebuild
+        private = state.get("__pydantic_private__") or {}
+        state["__pydantic_private__"] = {
+            **private,
+            "_fragment_cache": {},
+            "_parents": [],
+        }
+        return state
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        super().__setstate__(state)
+        self._retrack()
+
+    def _retrack(self) -> None:
+        """Reset tracking on a copy, which shares or duplicates our private state."""
+        self._fragment_cache = {}
+        self._parents = []
+        for name in type(self).model_fields:
+            self._track(name)
+
+    def _track(self, name: str) -> None:
+        """Make sure changes to the value held in field `name` are reported back to us."""
+        value = self.__dict__.get(name)
+        if isinstance(value, list):
+            if not (isinstance(value, _TrackedList) and value._owner() is self):
+                # Bypasses our (and pydantic's) __setattr__, which would validate and invalidate
+                object.__setattr__(self, name, _TrackedList(value, self, name))
+        elif isinstance(value, CogenticBaseModel):
+            value._add_parent(self, name)
+
+    def _add_parent(self, parent: "CogenticBaseModel", field: str) -> None:
+        for ref, parent_field in self._parents:
+            if ref() is parent and parent_field == field:
+                return
+        self._parents = [(ref, f) for ref, f in self._parents if ref() is not None]
+        self._parents.append((weakref.ref(parent), field))
+
+    def _invalidate(self, field: str | None = None) -> None:
+        """Drop the cached fragments affected by a change to `field` (or every field), and our parents'."""
+        cache = self._fragment_cache
+        if cache:
+            if field is None:
+                cache.clear()
+            else:
+                for key in [key for key in cache if key[2] is None or key[2] == field]:
+                    del cache[key]
+        for ref, parent_field in self._parents:
+            parent = ref()
+            if parent is not None:
+                parent._invalidate(parent_field)
+
+    def _json_fragment(self, indent: int, depth: int = 0) -> str:
+        """Render the model as json, formatted as if nested `depth` levels deep.
+
+        Matches `model_dump_json(indent=indent)`, but reuses the fragments of unchanged fields and
+        nested models from previous renders.
+        """
+        cache = self._fragment_cache
+        key = (indent, depth, None)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        fields = type(self).model_fields
+        if not fields:
+            return "{}"
+        inner = _pad(indent, depth + 1)
+        parts = []
+        cacheable = True
+        for name in fields:
+            value = self.__dict__[name]
+            if _is_tracked(value):
+                field_key = (indent, depth, name)
+                rendered = cache.get(field_key)
+                if rendered is None:
+                    rendered = _value_to_json(value, indent, depth + 1)
+                    cache[field_key] = rendered
+            else:
+                cacheable = False
+                rendered = _value_to_json(value, indent, depth + 1)
+            parts.append(f'{inner}"{name}": {rendered}')
+        fragment = "{\n" + ",\n".join(parts) + "\n" + _pad(indent, depth) + "}"
+        if cacheable:
+            cache[key] = fragment
+        return fragment
+
     def model_dump_markdown(
-        self, title: str | None = None, title_level: int = 2, indent: int = 2
+        self,
+        title: str | None = None,
+        title_level: int = 2,
+        indent: int = 2,
+        format: CogenticRenderFormat = "json",
     ) -> str:
-        """Dump the model as a markdown string."""
+        """Dump the model as a markdown string, in one of the prompt formats (see `CogenticRenderFormat`)."""
         if title:
             title = f"{'#' * title_level} {title}\n\n"
         else:
             title = ""
-        return f"{title}```json\n{self.model_dump_json(indent=indent)}\n```"
+        if format != "json":
+            return f"{title}{render(self, format)}"
+        return f"{title}```json\n{self._json_fragment(indent)}\n```"
 
     def model_dump_field_as_markdown(
         self,
@@ -21,21 +267,24 @@ class CogenticBaseModel(BaseModel):
         title_level: int = 2,
         indent: int = 2,
         collapse_field: bool = True,
+        format: CogenticRenderFormat = "json",
     ) -> str:
-        """Dump a field as a markdown string."""
+        """Dump a field as a markdown string, in one of the prompt formats (see `CogenticRenderFormat`)."""
         if title:
             title = f"{'#' * title_level} {title}\n\n"
         else:
             title = ""
-        # If we want to collapse the field, we should pull it out from the object dump before dumping to a json string
+        value = getattr(self, field_name)
+        if format != "json":
+            rendered = render(value if collapse_field else {field_name: value}, format)
+            return f"{title}{rendered}"
+        # If we want to collapse the field, we only render the field value itself
         if collapse_field:
-            dumped_field = self.model_dump(include={field_name})[field_name]
-            # If the field is a pydantic model we should model_dump_json. Otherwise, we should just use json.dumps
-            if isinstance(dumped_field, BaseModel):
-                dumped_field = dumped_field.model_dump_json(indent=indent)
-            else:
-                dumped_field = json.dumps(dumped_field, indent=indent)
-            return f"{title}```json\n{dumped_field}\n```"
-        # Otherwise, just dump the whole object
+            dumped_field = _value_to_json(value, indent, 0)
+        # Otherwise, render an object containing just this field
         else:
-            return f"{title}```json\n{self.model_dump_json(indent=indent, include={field_name})}\n```"
+            dumped_field = (
+                f'{{\n{_pad(indent, 1)}"{field_name}": '
+                f"{_value_to_json(value, indent, 1)}\n}}"
+            )
+        return f"{title}```json\n{dumped_field}\n```"
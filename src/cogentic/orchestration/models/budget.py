@@ -0,0 +1,78 @@
+from autogen_core.models import RequestUsage
+from pydantic import Field
+
+from cogentic.orchestration.models.base import CogenticBaseModel
+
+
+class CogenticUsage(CogenticBaseModel):
+    """Token usage accumulated over part of a run."""
+
+    prompt_tokens: int = Field(default=0)
+    completion_tokens: int = Field(default=0)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, usage: RequestUsage) -> None:
+        """Add the usage of a model call."""
+        self.prompt_tokens += usage.prompt_tokens
+        self.completion_tokens += usage.completion_tokens
+
+    def reset(self) -> None:
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+
+class CogenticBudget(CogenticBaseModel):
+    """Token and cost limits for a run, checked against usage from the orchestrator and participants."""
+
+    max_tokens_total: int | None = Field(
+        default=None, description="Maximum tokens for the whole run"
+    )
+    max_tokens_per_hypothesis: int | None = Field(
+        default=None, description="Maximum tokens spent on a single hypothesis"
+    )
+    max_tokens_per_test: int | None = Field(
+        default=None, description="Maximum tokens spent on a single test"
+    )
+    max_cost_total: float | None = Field(
+        default=None, description="Maximum cost for the whole run"
+    )
+    max_cost_per_hypothesis: float | None = Field(
+        default=None, description="Maximum cost of a single hypothesis"
+    )
+    max_cost_per_test: float | None = Field(
+        default=None, description="Maximum cost of a single test"
+    )
+    prompt_cost_per_1k_tokens: float = Field(
+        default=0.0, description="Cost of 1000 prompt tokens"
+    )
+    completion_cost_per_1k_tokens: float = Field(
+        default=0.0, description="Cost of 1000 completion tokens"
+    )
+
+    def cost(self, usage: CogenticUsage) -> float:
+        """Get the cost of some usage."""
+        return (
+            usage.prompt_tokens * self.prompt_cost_per_1k_tokens
+            + usage.completion_tokens * self.completion_cost_per_1k_tokens
+        ) / 1000
+
+    def _exceeded(
+        self, usage: CogenticUsage, max_tokens: int | None, max_cost: float | None
+    ) -> bool:
+        if max_tokens is not None and usage.total_tokens >= max_tokens:
+            return True
+        return max_cost is not None and self.cost(usage) >= max_cost
+
+    def total_exceeded(self, usage: CogenticUsage) -> bool:
+        return self._exceeded(usage, self.max_tokens_total, self.max_cost_total)
+
+    def hypothesis_exceeded(self, usage: CogenticUsage) -> bool:
+        return self._exceeded(
+            usage, self.max_tokens_per_hypothesis, self.max_cost_per_hypothesis
+        )
+
+    def test_exceeded(self, usage: CogenticUsage) -> bool:
+        return self._exceeded(usage, self.max_tokens_per_test, self.max_cost_per_test)
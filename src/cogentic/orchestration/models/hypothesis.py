@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import Any, Literal
 
-from pydantic import Field
+from pydantic import Field, model_validator
 
 from cogentic.orchestration.models.base import CogenticBaseModel
 from cogentic.orchestration.models.test import CogenticTest
@@ -17,6 +17,7 @@ CogenticHypothesisState = Literal[
 class CogenticHypothesis(CogenticBaseModel):
     """Hypothesis for the cogentic system."""
 
+    name: str = Field(description="Short, unique name for the hypothesis")
     hypothesis: str = Field(description="Hypothesis to be tested")
     state: CogenticHypothesisState = Field(description="State of the hypothesis")
     completion_summary: str | None = Field(
@@ -27,6 +28,18 @@ class CogenticHypothesis(CogenticBaseModel):
         min_length=1,
     )
 
+    @model_validator(mode="before")
+    @classmethod
+    def default_name(cls, data: Any) -> Any:
+        """Name hypotheses saved before they had names (e.g. in older states) after the start of their text."""
+        if (
+            isinstance(data, dict)
+            and not data.get("name")
+            and isinstance(data.get("hypothesis"), str)
+        ):
+            data = {**data, "name": " ".join(data["hypothesis"].split()[:8])}
+        return data
+
     @property
     def all_tests_finished(self) -> bool:
         """Check if all tests are completed or we're in a completed state."""
@@ -45,6 +58,15 @@ class CogenticHypothesis(CogenticBaseModel):
                 return test
         return None
 
+    def get_test(self, name: str) -> CogenticTest:
+        """Get a test by name."""
+        for test in self.tests:
+            if test.name == name:
+                return test
+        raise ValueError(
+            f"No test named '{name}' in hypothesis '{self.name}'. Available tests: {[test.name for test in self.tests]}"
+        )
+
     def insert_tests(self, to_insert: CogenticTest | list[CogenticTest]) -> None:
         """Insert test(s) into the hypothesis in front of our current test."""
         new_tests = to_insert if isinstance(to_insert, list) else [to_insert]
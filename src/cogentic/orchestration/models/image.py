@@ -0,0 +1,40 @@
+from typing import Literal
+
+from pydantic import Field
+
+from cogentic.orchestration.models.base import CogenticBaseModel
+
+
+class CogenticImageOptions(CogenticBaseModel):
+    """How images in team members' messages are processed, stored and sent to the model."""
+
+    max_size: int = Field(
+        default=1024,
+        description="Longest side of stored images in pixels. Larger images are downscaled on ingest",
+        gt=0,
+    )
+    format: Literal["JPEG", "PNG", "WEBP"] = Field(
+        default="JPEG", description="Format stored images are re-encoded in"
+    )
+    quality: int = Field(
+        default=85, description="Quality of lossy formats, from 1 to 95", ge=1, le=95
+    )
+    recent_images: int = Field(
+        default=2,
+        description="Most recent images of the work thread sent to vision models. Older images are replaced by their captions",
+        ge=0,
+    )
+    caption_images: bool = Field(
+        default=True,
+        description="Caption images with a vision model when ingested. Otherwise images are described by their size and source",
+    )
+
+
+class CogenticStoredImage(CogenticBaseModel):
+    """An image, processed on ingest, and stored outside the work thread."""
+
+    data: str = Field(description="The base64 encoded image")
+    width: int
+    height: int
+    source: str = Field(description="Name of the team member who produced the image")
+    caption: str | None = Field(default=None)
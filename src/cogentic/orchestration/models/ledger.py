@@ -1,3 +1,4 @@
+import functools
 from typing import Self, Type
 
 from pydantic import Field, model_validator
@@ -13,6 +14,37 @@ from cogentic.orchestration.models.reasoning import (
 from cogentic.orchestration.models.test import CogenticTestState
 
 
+class CogenticProgressCheck(CogenticBaseModel):
+    """Quick check of our progress, to decide whether the full progress ledger is needed."""
+
+    original_question_answered: bool = Field(
+        description="Is the original question fully answered?",
+    )
+    test_state: CogenticTestState = Field(
+        description="What is the state of the current test?",
+    )
+    forward_progress: bool = Field(
+        description="Are we making forward progress, without repeating the same request?",
+    )
+    continue_with_same_speaker: bool = Field(
+        description="Should the same team member keep working on the current test, without changing our plan?",
+    )
+    next_instruction: str | None = Field(
+        description="If continuing with the same team member, the instruction or question for them, phrased as if you're speaking to them directly. Otherwise null.",
+    )
+
+    @property
+    def routine(self) -> bool:
+        """Whether the work simply continues, so the full progress ledger can be skipped."""
+        return (
+            not self.original_question_answered
+            and self.test_state == "incomplete"
+            and self.forward_progress
+            and self.continue_with_same_speaker
+            and bool(self.next_instruction)
+        )
+
+
 class CogenticProgressLedger(CogenticBaseModel):
     """Progress ledger for the cogentic system."""
 
@@ -43,17 +75,11 @@ class CogenticProgressLedger(CogenticBaseModel):
 
     @classmethod
     def with_speakers(cls, choices: list[str]) -> Type["CogenticProgressLedger"]:
-        """Create a new type from our class, where the next speaker is limited to a set of choices."""
-        # Create the choice type with proper annotation
-        next_step_type = CogenticNextStep.with_speaker_choices(choices)
+        """Create a new type from our class, where the next speaker is limited to a set of choices.
 
-        return type(
-            "CogenticProgressLedgerWithSpeakers",
-            (cls,),
-            {
-                "__annotations__": {"next_step": next_step_type | None},
-            },
-        )
+        The type is created once per set of choices, so its schema is only compiled once.
+        """
+        return _with_speakers(cls, tuple(choices))
 
     @model_validator(mode="after")
     def validate_next_step(self) -> Self:
@@ -63,3 +89,19 @@ class CogenticProgressLedger(CogenticBaseModel):
                 "If we're not marking the original question as answered, we must have a next step!",
             )
         return self
+
+
+@functools.cache
+def _with_speakers(
+    cls: Type[CogenticProgressLedger], choices: tuple[str, ...]
+) -> Type[CogenticProgressLedger]:
+    # Create the choice type with proper annotation
+    next_step_type = CogenticNextStep.with_speaker_choices(list(choices))
+
+    return type(
+        "CogenticProgressLedgerWithSpeakers",
+        (cls,),
+        {
+            "__annotations__": {"next_step": next_step_type | None},
+        },
+    )
@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+import functools
 from typing import Literal, Self, Type
 
-from pydantic import Field, model_validator
+from pydantic import Field, ValidationInfo, model_validator
 
 from cogentic.orchestration.models.base import CogenticBaseModel
+from cogentic.orchestration.models.evidence import CogenticQuestionEvidence
 from cogentic.orchestration.models.hypothesis import (
     CogenticHypothesis,
     CogenticHypothesisState,
 )
-from cogentic.orchestration.models.plan import CogenticPlanState
+from cogentic.orchestration.models.patch import (
+    CogenticPatchOperation,
+    CogenticTestPatchOperation,
+)
+from cogentic.orchestration.models.plan import CogenticPlan, CogenticPlanState
 from cogentic.orchestration.models.reasoning import (
     CogenticReasonedChoiceAnswer,
     CogenticReasonedStringAnswer,
@@ -17,6 +23,17 @@ from cogentic.orchestration.models.reasoning import (
 from cogentic.orchestration.models.test import CogenticTest
 
 
+class CogenticInitialPlan(CogenticBaseModel):
+    """Initial evidence and hypotheses for the cogentic system, created together."""
+
+    evidence: list[CogenticQuestionEvidence] = Field(
+        description="List of evidence collected from the question",
+    )
+    hypotheses: list[CogenticHypothesis] = Field(
+        description="Hypotheses to be tested, based on the evidence", min_length=1
+    )
+
+
 class CogenticNextStep(CogenticBaseModel):
     """Next step for the cogentic system."""
 
@@ -32,19 +49,29 @@ class CogenticNextStep(CogenticBaseModel):
 
     @classmethod
     def with_speaker_choices(cls, choices: list[str]) -> Type["CogenticNextStep"]:
-        """Create a new type from our class, where the next speaker is limited to a set of choices."""
-        # Create the choice type with proper annotation
-        next_speaker_type = CogenticReasonedChoiceAnswer[Literal[tuple(choices)]]
-
-        return type(
-            "CogenticNextStepWithSpeakerChoices",
-            (cls,),
-            {
-                "__annotations__": {
-                    "next_speaker": next_speaker_type,
-                },
+        """Create a new type from our class, where the next speaker is limited to a set of choices.
+
+        The type is created once per set of choices, so its schema is only compiled once.
+        """
+        return _with_speaker_choices(cls, tuple(choices))
+
+
+@functools.cache
+def _with_speaker_choices(
+    cls: Type[CogenticNextStep], choices: tuple[str, ...]
+) -> Type[CogenticNextStep]:
+    # Create the choice type with proper annotation
+    next_speaker_type = CogenticReasonedChoiceAnswer[Literal[choices]]
+
+    return type(
+        "CogenticNextStepWithSpeakerChoices",
+        (cls,),
+        {
+            "__annotations__": {
+                "next_speaker": next_speaker_type,
             },
-        )
+        },
+    )
 
 
 class CogenticFinalAnswer(CogenticBaseModel):
@@ -98,3 +125,78 @@ class CogenticPlanUpdate(CogenticBaseModel):
                 "If you're marking the plan as `in_progress`, you must provide new hypotheses."
             )
         return self
+
+
+def _dry_run_patch(
+    operations: list[CogenticPatchOperation], info: ValidationInfo
+) -> CogenticPlan | None:
+    """Apply operations to a copy of the plan passed in the validation context, if there is one."""
+    plan = (info.context or {}).get("plan")
+    if not isinstance(plan, CogenticPlan):
+        return None
+    trial_plan = CogenticPlan(
+        hypotheses=[hypothesis.model_copy(deep=True) for hypothesis in plan.hypotheses]
+    )
+    trial_plan.apply_patch(operations)
+    return trial_plan
+
+
+class CogenticHypothesisPatch(CogenticBaseModel):
+    """Hypothesis update expressed as patch operations against the existing plan."""
+
+    hypothesis_state: CogenticReasonedChoiceAnswer[CogenticHypothesisState] = Field(
+        description="The state of the hypothesis.",
+    )
+    operations: list[CogenticPatchOperation] = Field(
+        description="Changes to make to the tests of the current hypothesis, applied in order. Refer to existing tests by name",
+    )
+
+    @model_validator(mode="after")
+    def validate_operations(self, info: ValidationInfo) -> Self:
+        """Validate that only the tests of the current hypothesis are changed, and the operations against the plan, if one was provided for validation."""
+        plan = (info.context or {}).get("plan")
+        current = plan.current_hypothesis if isinstance(plan, CogenticPlan) else None
+        for operation in self.operations:
+            if not isinstance(operation, CogenticTestPatchOperation):
+                raise ValueError(
+                    f"Only the tests of the current hypothesis can be changed here, so `{operation.op}` isn't allowed."
+                )
+            if current is not None and operation.hypothesis_name not in (
+                None,
+                current.name,
+            ):
+                raise ValueError(
+                    f"Only the tests of the current hypothesis can be changed here, not those of '{operation.hypothesis_name}'."
+                )
+        trial_plan = _dry_run_patch(self.operations, info)
+        if trial_plan is None or self.hypothesis_state.answer != "unverified":
+            return self
+        hypothesis = trial_plan.current_hypothesis
+        if hypothesis is None or hypothesis.current_test is None:
+            raise ValueError(
+                "If you're marking the hypothesis as `unverified`, it must have an incomplete test to work on. Please add a test."
+            )
+        return self
+
+
+class CogenticPlanPatch(CogenticBaseModel):
+    """Plan update expressed as patch operations against the existing plan."""
+
+    plan_state: CogenticReasonedChoiceAnswer[CogenticPlanState] = Field(
+        description="The state of the plan.",
+    )
+    operations: list[CogenticPatchOperation] = Field(
+        description="Changes to make to the plan if you're marking the state as `in_progress`, applied in order. Refer to existing hypotheses and tests by name",
+    )
+
+    @model_validator(mode="after")
+    def validate_operations(self, info: ValidationInfo) -> Self:
+        """Validate the operations against the plan, if one was provided for validation."""
+        trial_plan = _dry_run_patch(self.operations, info)
+        if trial_plan is None or self.plan_state.answer != "in_progress":
+            return self
+        if trial_plan.current_hypothesis is None:
+            raise ValueError(
+                "If you're marking the plan as `in_progress`, it must have an `unverified` hypothesis to work on. Please add a hypothesis."
+            )
+        return self
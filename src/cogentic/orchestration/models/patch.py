@@ -0,0 +1,120 @@
+from typing import Annotated, Literal, Union
+
+from pydantic import Field
+
+from cogentic.orchestration.models.base import CogenticBaseModel
+from cogentic.orchestration.models.hypothesis import (
+    CogenticHypothesis,
+    CogenticHypothesisState,
+)
+from cogentic.orchestration.models.test import CogenticTest, CogenticTestState
+
+
+class CogenticAddHypothesis(CogenticBaseModel):
+    """Add a new hypothesis to the plan."""
+
+    op: Literal["add_hypothesis"]
+    hypothesis: CogenticHypothesis = Field(description="The hypothesis to add")
+    before: str | None = Field(
+        description="Name of the hypothesis to insert the new hypothesis in front of. If null, it is inserted in front of the current hypothesis"
+    )
+
+
+class CogenticModifyHypothesis(CogenticBaseModel):
+    """Modify a field of an existing hypothesis."""
+
+    op: Literal["modify_hypothesis"]
+    hypothesis_name: str = Field(description="Name of the hypothesis to modify")
+    field: Literal["hypothesis", "completion_summary"] = Field(
+        description="The field to modify"
+    )
+    value: str = Field(description="The new value of the field")
+
+
+class CogenticSetHypothesisState(CogenticBaseModel):
+    """Mark the state of an existing hypothesis."""
+
+    op: Literal["set_hypothesis_state"]
+    hypothesis_name: str = Field(description="Name of the hypothesis to update")
+    state: CogenticHypothesisState = Field(description="The new state")
+
+
+class CogenticReorderHypotheses(CogenticBaseModel):
+    """Move hypotheses to the front of the plan, in the given order."""
+
+    op: Literal["reorder_hypotheses"]
+    order: list[str] = Field(
+        description="Names of the hypotheses to work on first, in order. Unlisted hypotheses keep their order after these",
+        min_length=1,
+    )
+
+
+class CogenticAddTest(CogenticBaseModel):
+    """Add a new test to a hypothesis."""
+
+    op: Literal["add_test"]
+    hypothesis_name: str | None = Field(
+        description="Name of the hypothesis to add the test to. If null, the current hypothesis"
+    )
+    test: CogenticTest = Field(description="The test to add")
+    before: str | None = Field(
+        description="Name of the test to insert the new test in front of. If null, it is inserted in front of the current test"
+    )
+
+
+class CogenticModifyTest(CogenticBaseModel):
+    """Modify a field of an existing test."""
+
+    op: Literal["modify_test"]
+    hypothesis_name: str | None = Field(
+        description="Name of the hypothesis containing the test. If null, the current hypothesis"
+    )
+    test_name: str = Field(description="Name of the test to modify")
+    field: Literal["description", "goal", "result_summary"] = Field(
+        description="The field to modify"
+    )
+    value: str = Field(description="The new value of the field")
+
+
+class CogenticSetTestState(CogenticBaseModel):
+    """Mark the state of an existing test."""
+
+    op: Literal["set_test_state"]
+    hypothesis_name: str | None = Field(
+        description="Name of the hypothesis containing the test. If null, the current hypothesis"
+    )
+    test_name: str = Field(description="Name of the test to update")
+    state: CogenticTestState = Field(description="The new state")
+
+
+class CogenticReorderTests(CogenticBaseModel):
+    """Move tests to the front of a hypothesis, in the given order."""
+
+    op: Literal["reorder_tests"]
+    hypothesis_name: str | None = Field(
+        description="Name of the hypothesis containing the tests. If null, the current hypothesis"
+    )
+    order: list[str] = Field(
+        description="Names of the tests to work on first, in order. Unlisted tests keep their order after these",
+        min_length=1,
+    )
+
+
+CogenticPatchOperation = Annotated[
+    Union[
+        CogenticAddHypothesis,
+        CogenticModifyHypothesis,
+        CogenticSetHypothesisState,
+        CogenticReorderHypotheses,
+        CogenticAddTest,
+        CogenticModifyTest,
+        CogenticSetTestState,
+        CogenticReorderTests,
+    ],
+    Field(discriminator="op"),
+]
+
+# The operations which only change tests, allowed when updating a single hypothesis
+CogenticTestPatchOperation = (
+    CogenticAddTest | CogenticModifyTest | CogenticSetTestState | CogenticReorderTests
+)
@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Literal, Sequence, TypeVar
 
 from pydantic import Field
 
@@ -8,6 +8,20 @@ from cogentic.orchestration.models.base import CogenticBaseModel
 from cogentic.orchestration.models.evidence import CogenticEvidence
 from cogentic.orchestration.models.hypothesis import CogenticHypothesis
 from cogentic.orchestration.models.issue import CogenticIssue
+from cogentic.orchestration.models.patch import (
+    CogenticAddHypothesis,
+    CogenticAddTest,
+    CogenticModifyHypothesis,
+    CogenticModifyTest,
+    CogenticPatchOperation,
+    CogenticReorderHypotheses,
+    CogenticReorderTests,
+    CogenticSetHypothesisState,
+    CogenticSetTestState,
+)
+from cogentic.orchestration.models.test import CogenticTest
+
+T = TypeVar("T")
 
 CogenticPlanState = Literal[
     "in_progress",
@@ -51,6 +65,15 @@ class CogenticPlan(CogenticBaseModel):
                 return hypothesis
         return None
 
+    def get_hypothesis(self, name: str) -> CogenticHypothesis:
+        """Get a hypothesis by name."""
+        for hypothesis in self.hypotheses:
+            if hypothesis.name == name:
+                return hypothesis
+        raise ValueError(
+            f"No hypothesis named '{name}'. Available hypotheses: {[hypothesis.name for hypothesis in self.hypotheses]}"
+        )
+
     def insert_hypotheses(
         self, to_insert: CogenticHypothesis | list[CogenticHypothesis]
     ) -> None:
@@ -61,3 +84,97 @@ class CogenticPlan(CogenticBaseModel):
             self.hypotheses[index:index] = new_hypotheses
         else:
             self.hypotheses.extend(new_hypotheses)
+
+    def apply_patch(self, operations: Sequence[CogenticPatchOperation]) -> None:
+        """Apply a list of patch operations to the plan, in order.
+
+        Hypotheses and tests added without a position are inserted in front of whichever
+        hypothesis/test was current before the patch, keeping the order they were given in.
+
+        Raises:
+            ValueError: If an operation refers to a hypothesis or test that doesn't exist, or
+                would create a duplicate name.
+        """
+        hypothesis_anchor = self.current_hypothesis
+        test_anchors = {
+            id(hypothesis): hypothesis.current_test for hypothesis in self.hypotheses
+        }
+
+        def target_hypothesis(name: str | None) -> CogenticHypothesis:
+            if name is not None:
+                return self.get_hypothesis(name)
+            if hypothesis_anchor is None:
+                raise ValueError(
+                    "There is no current hypothesis, so test operations must provide a hypothesis name."
+                )
+            return hypothesis_anchor
+
+        for operation in operations:
+            match operation:
+                case CogenticAddHypothesis():
+                    if any(
+                        h.name == operation.hypothesis.name for h in self.hypotheses
+                    ):
+                        raise ValueError(
+                            f"A hypothesis named '{operation.hypothesis.name}' already exists."
+                        )
+                    before = (
+                        self.get_hypothesis(operation.before)
+                        if operation.before is not None
+                        else hypothesis_anchor
+                    )
+                    _insert_before(self.hypotheses, before, operation.hypothesis)
+                case CogenticModifyHypothesis():
+                    hypothesis = self.get_hypothesis(operation.hypothesis_name)
+                    setattr(hypothesis, operation.field, operation.value)
+                case CogenticSetHypothesisState():
+                    self.get_hypothesis(
+                        operation.hypothesis_name
+                    ).state = operation.state
+                case CogenticReorderHypotheses():
+                    self.hypotheses[:] = _reorder(
+                        self.hypotheses,
+                        [self.get_hypothesis(n) for n in operation.order],
+                    )
+                case CogenticAddTest():
+                    hypothesis = target_hypothesis(operation.hypothesis_name)
+                    if any(t.name == operation.test.name for t in hypothesis.tests):
+                        raise ValueError(
+                            f"A test named '{operation.test.name}' already exists in hypothesis '{hypothesis.name}'."
+                        )
+                    before = (
+                        hypothesis.get_test(operation.before)
+                        if operation.before is not None
+                        else test_anchors.get(id(hypothesis), hypothesis.current_test)
+                    )
+                    _insert_before(hypothesis.tests, before, operation.test)
+                case CogenticModifyTest():
+                    hypothesis = target_hypothesis(operation.hypothesis_name)
+                    test = hypothesis.get_test(operation.test_name)
+                    setattr(test, operation.field, operation.value)
+                case CogenticSetTestState():
+                    hypothesis = target_hypothesis(operation.hypothesis_name)
+                    hypothesis.get_test(operation.test_name).state = operation.state
+                case CogenticReorderTests():
+                    hypothesis = target_hypothesis(operation.hypothesis_name)
+                    hypothesis.tests[:] = _reorder(
+                        hypothesis.tests,
+                        [hypothesis.get_test(n) for n in operation.order],
+                    )
+
+
+def _insert_before(items: list[T], before: T | None, item: T) -> None:
+    """Insert an item in front of `before` (compared by identity), or at the end if it's missing."""
+    for index, existing in enumerate(items):
+        if existing is before:
+            items.insert(index, item)
+            return
+    items.append(item)
+
+
+def _reorder(items: list[T], first: list[T]) -> list[T]:
+    """Move `first` to the front of `items`, keeping the order of the remaining items."""
+    if len({id(item) for item in first}) != len(first):
+        raise ValueError("Reorder operations cannot list the same entry twice.")
+    first_ids = {id(item) for item in first}
+    return first + [item for item in items if id(item) not in first_ids]
@@ -0,0 +1,167 @@
+import json
+import re
+from typing import Any, Literal
+
+from pydantic import BaseModel
+from pydantic_core import to_json, to_jsonable_python
+
+# How models are rendered in prompts:
+# - json: indented json, as `model_dump_json(indent=2)`
+# - compact_json: minified json, without null and default values
+# - table: markdown tables for lists of models, and `key: value` lines otherwise
+# - yaml: indented `key: value` lines, without null and default values
+CogenticRenderFormat = Literal["json", "compact_json", "table", "yaml"]
+
+# Strings which a yaml reader would take for another type, or which need quoting
+_YAML_SPECIAL = re.compile(
+    r"^(?:$|[\s\-?:,\[\]{}#&*!|>'\"%@`]|(?:true|false|null|yes|no|on|off|~)$|[-+]?[\d.])"
+    r"|:\s|\s#|:$|\s$",
+    re.IGNORECASE,
+)
+
+
+def compact_dump(value: Any) -> Any:
+    """Dump models (also within lists) to json compatible values, without null and default values."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", exclude_none=True, exclude_defaults=True)
+    if isinstance(value, (list, tuple)):
+        return [compact_dump(item) for item in value]
+    if isinstance(value, dict):
+        return {
+            key: compact_dump(item) for key, item in value.items() if item is not None
+        }
+    return to_jsonable_python(value)
+
+
+def _compact_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _cell(value: Any) -> str:
+    """Render a value as a single markdown table cell."""
+    if isinstance(value, str):
+        text = value
+    elif isinstance(value, bool) or value is None:
+        text = json.dumps(value)
+    elif isinstance(value, (dict, list)):
+        text = _compact_json(value)
+    else:
+        text = str(value)
+    return text.replace("|", "\\|").replace("\r\n", "<br>").replace("\n", "<br>")
+
+
+def _table(items: list[Any]) -> str:
+    """Render a list as a markdown table, with a column for every key of its objects."""
+    if not items:
+        return "(none)"
+    if not all(isinstance(item, dict) for item in items):
+        return "\n".join(f"- {_cell(item)}" for item in items)
+    columns = list(dict.fromkeys(key for item in items for key in item))
+    lines = [
+        "| " + " | ".join(columns) + " |",
+        "| " + " | ".join("---" for _ in columns) + " |",
+    ]
+    for item in items:
+        lines.append(
+            "| "
+            + " | ".join(_cell(item[c]) if c in item else "" for c in columns)
+            + " |"
+        )
+    return "\n".join(lines)
+
+
+def _depth(value: Any) -> int:
+    """How deeply objects and lists are nested in a value."""
+    if isinstance(value, dict):
+        return 1 + max((_depth(item) for item in value.values()), default=0)
+    if isinstance(value, list):
+        return 1 + max((_depth(item) for item in value), default=0)
+    return 0
+
+
+def _render_table(value: Any, name: str = "") -> str:
+    """Render lists of objects as tables, and objects as `key: value` lines.
+
+    Objects nesting lists of objects in their cells would be unreadable, so lists of those are rendered
+    as a section per object instead, e.g. a hypothesis with a table of its tests.
+    """
+    if isinstance(value, list):
+        if value and all(isinstance(item, dict) for item in value):
+            if any(_depth(item) > 3 for item in value):
+                return "\n\n".join(
+                    f"**{name}[{index}]**\n\n{_render_table(item)}"
+                    for index, item in enumerate(value)
+                )
+        return _table(value)
+    if not isinstance(value, dict):
+        return _cell(value)
+    lines = []
+    for key, item in value.items():
+        if isinstance(item, list) and item and isinstance(item[0], dict):
+            lines.append(f"{key}:\n\n{_render_table(item, key)}\n")
+        else:
+            lines.append(f"{key}: {_cell(item)}")
+    return "\n".join(lines).strip()
+
+
+def _yaml_scalar(value: Any) -> str:
+    if isinstance(value, str):
+        return (
+            json.dumps(value, ensure_ascii=False)
+            if _YAML_SPECIAL.search(value)
+            else value
+        )
+    return json.dumps(value)
+
+
+def _yaml_lines(value: Any, depth: int) -> list[str]:
+    pad = "  " * depth
+    lines: list[str] = []
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(item, (dict, list)) and item:
+                lines.append(f"{pad}{key}:")
+                lines.extend(_yaml_lines(item, depth + 1))
+            elif isinstance(item, str) and "\n" in item:
+                lines.append(f"{pad}{key}: |")
+                lines.extend(f"{pad}  {line}" for line in item.splitlines())
+            elif isinstance(item, (dict, list)):
+                lines.append(f"{pad}{key}: {'{}' if isinstance(item, dict) else '[]'}")
+            else:
+                lines.append(f"{pad}{key}: {_yaml_scalar(item)}")
+    elif isinstance(value, list):
+        for item in value:
+            if isinstance(item, (dict, list)) and not item:
+                lines.append(f"{pad}- {'{}' if isinstance(item, dict) else '[]'}")
+                continue
+            # The first line of the item goes on the dash, and the rest is indented under it
+            item_lines = _yaml_lines(item, depth + 1)
+            item_lines[0] = f"{pad}- {item_lines[0].lstrip()}"
+            lines.extend(item_lines)
+    elif isinstance(value, str) and "\n" in value:
+        lines.append(f"{pad}|")
+        lines.extend(f"{pad}  {line}" for line in value.splitlines())
+    else:
+        lines.append(f"{pad}{_yaml_scalar(value)}")
+    return lines
+
+
+def render(value: Any, format: CogenticRenderFormat, indent: int = 2) -> str:
+    """Render a model, or a list of models, in a prompt format, fenced as a markdown code block if needed.
+
+    Args:
+        value (Any): The model, or list of models.
+        format (CogenticRenderFormat): The format to render in.
+        indent (int): The indentation of the "json" format. Defaults to 2.
+    """
+    if format == "json":
+        # Models cache their json rendering, see CogenticBaseModel.model_dump_markdown
+        return f"```json\n{to_json(value, indent=indent).decode()}\n```"
+    dumped = compact_dump(value)
+    if format == "compact_json":
+        return f"```json\n{_compact_json(dumped)}\n```"
+    if format == "table":
+        return _render_table(dumped)
+    if format == "yaml":
+        return "```yaml\n" + "\n".join(_yaml_lines(dumped, 0)) + "\n```"
+    raise ValueError(f"Unknown render format {format}.")
@@ -1,6 +1,8 @@
 from autogen_agentchat.state import BaseGroupChatManagerState
 from pydantic import Field
 
+from cogentic.orchestration.models.budget import CogenticUsage
+from cogentic.orchestration.models.image import CogenticStoredImage
 from cogentic.orchestration.models.ledger import CogenticProgressLedger
 from cogentic.orchestration.models.plan import CogenticPlan
 
@@ -13,4 +15,6 @@ class CogenticState(BaseGroupChatManagerState):
     ledger: CogenticProgressLedger | None = Field(default=None)
     total_turns: int = Field(default=0)
     stalls: int = Field(default=0)
+    usage: CogenticUsage = Field(default_factory=CogenticUsage)
+    images: dict[str, CogenticStoredImage] = Field(default_factory=dict)
     type: str = Field(default="CogenticState")
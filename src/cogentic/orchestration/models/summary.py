@@ -0,0 +1,26 @@
+from pydantic import Field
+
+from cogentic.orchestration.models.base import CogenticBaseModel
+
+
+class CogenticSummaryOptions(CogenticBaseModel):
+    """How team members' responses are summarized for the plan's actions."""
+
+    extract_below_tokens: int = Field(
+        default=100,
+        description="Responses up to this many tokens are kept as they are, and JSON responses whose outline fits are outlined, without a model call",
+        ge=0,
+    )
+    chunk_tokens: int = Field(
+        default=4000,
+        description="Responses longer than this many tokens are split into chunks of about this size, summarized separately and then combined",
+        gt=0,
+    )
+    max_concurrency: int = Field(
+        default=4, description="Chunks summarized at the same time", gt=0
+    )
+    max_reduce_depth: int = Field(
+        default=2,
+        description="Times the summaries of chunks are summarized in chunks again when too long to combine at once. Beyond this, each summary is truncated to fit a final combining call",
+        ge=0,
+    )
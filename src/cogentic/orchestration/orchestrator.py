@@ -1,6 +1,9 @@
+import asyncio
 import logging
 import re
-from typing import Any, List, Mapping
+import time
+from contextlib import nullcontext
+from typing import Any, Awaitable, Callable, List, Mapping, Type, TypeVar
 
 from autogen_agentchat import TRACE_LOGGER_NAME
 from autogen_agentchat.base import Response
@@ -8,6 +11,7 @@ from autogen_agentchat.messages import (
     AgentEvent,
     ChatMessage,
     HandoffMessage,
+    ModelClientStreamingChunkEvent,
     MultiModalMessage,
     StopMessage,
     TextMessage,
@@ -39,37 +43,76 @@ from autogen_core.models import (
     AssistantMessage,
     ChatCompletionClient,
     LLMMessage,
+    RequestUsage,
     SystemMessage,
     UserMessage,
 )
+from pydantic import BaseModel
 
+from cogentic.orchestration.context import call_site, record_usage, reports_usage
+from cogentic.orchestration.images import CogenticImageStore
 from cogentic.orchestration.model_output import reason_and_output_model
 from cogentic.orchestration.models.action import CogenticAction
+from cogentic.orchestration.models.budget import CogenticBudget, CogenticUsage
 from cogentic.orchestration.models.evidence import CogenticInitialEvidence
 from cogentic.orchestration.models.hypothesis import CogenticInitialHypotheses
-from cogentic.orchestration.models.ledger import CogenticProgressLedger
+from cogentic.orchestration.models.image import CogenticImageOptions
+from cogentic.orchestration.models.ledger import (
+    CogenticProgressCheck,
+    CogenticProgressLedger,
+)
 from cogentic.orchestration.models.orchestration import (
     CogenticFinalAnswer,
+    CogenticHypothesisPatch,
     CogenticHypothesisUpdate,
+    CogenticInitialPlan,
     CogenticNextStep,
+    CogenticPlanPatch,
     CogenticPlanUpdate,
 )
 from cogentic.orchestration.models.plan import CogenticPlan
+from cogentic.orchestration.models.reasoning import CogenticReasonedStringAnswer
+from cogentic.orchestration.models.render import CogenticRenderFormat
 from cogentic.orchestration.models.state import CogenticState
+from cogentic.orchestration.models.summary import CogenticSummaryOptions
+from cogentic.orchestration.plan_cache import CogenticPlanCache
 from cogentic.orchestration.prompts import (
+    CogenticPromptName,
+    create_caption_image_prompt,
+    create_combine_summaries_prompt,
     create_current_state_prompt,
     create_final_answer_prompt,
     create_initial_evidence_prompt,
     create_initial_hypotheses_prompt,
+    create_initial_plan_prompt,
     create_next_step_prompt,
+    create_patch_plan_prompt,
     create_persona_prompt,
+    create_progress_check_prompt,
     create_progress_ledger_prompt,
+    create_summarize_chunk_prompt,
     create_summarize_result_prompt,
     create_update_hypothesis_on_stall_prompt,
     create_update_hypothesis_prompt,
     create_update_plan_on_stall_prompt,
     create_update_plan_prompt,
 )
+from cogentic.orchestration.routing import (
+    DEFAULT_CLIENT,
+    CogenticCallSite,
+    CogenticModelRouter,
+    CogenticRoutedClients,
+)
+from cogentic.orchestration.summarize import outline_structured, split_by_tokens
+from cogentic.orchestration.tracing import (
+    DISABLED_TRACER,
+    CogenticSpan,
+    CogenticTracer,
+    trace_span,
+    traced,
+)
+
+T = TypeVar("T", bound=BaseModel)
 
 
 class CogenticOrchestrator(BaseGroupChatManager):
@@ -89,6 +132,18 @@ class CogenticOrchestrator(BaseGroupChatManager):
         max_stalls: int,
         final_answer_prompt: str,
         use_summarized_context: bool = False,
+        use_plan_patches: bool = False,
+        use_two_stage_planning: bool = False,
+        use_tiered_ledger: bool = False,
+        progress_check_model_client: ChatCompletionClient | None = None,
+        tracer: CogenticTracer | None = None,
+        budget: CogenticBudget | None = None,
+        stream_output: bool = False,
+        plan_cache: CogenticPlanCache | None = None,
+        model_router: CogenticModelRouter | None = None,
+        prompt_formats: Mapping[CogenticPromptName, CogenticRenderFormat] | None = None,
+        image_options: CogenticImageOptions | None = None,
+        summary_options: CogenticSummaryOptions | None = None,
     ):
         super().__init__(
             group_topic_type=group_topic_type,
@@ -116,6 +171,26 @@ class CogenticOrchestrator(BaseGroupChatManager):
         self._current_stall_count: int = 0
         self._summarized_thread: List[AgentEvent | ChatMessage] = []
         self._use_summarized_context = use_summarized_context
+        self._use_plan_patches = use_plan_patches
+        self._use_two_stage_planning = use_two_stage_planning
+        self._use_tiered_ledger = use_tiered_ledger
+        self._progress_check_model_client = progress_check_model_client
+        self._tracer = tracer or DISABLED_TRACER
+        self._agent_wait_span: CogenticSpan | None = None
+        self._budget = budget
+        self._usage = CogenticUsage()
+        self._hypothesis_usage = CogenticUsage()
+        self._test_usage = CogenticUsage()
+        self._stream_output = stream_output
+        self._plan_cache = plan_cache
+        self._model_router = model_router
+        self._prompt_formats: dict[CogenticPromptName, CogenticRenderFormat] = dict(
+            prompt_formats or {}
+        )
+        self._summary_options = summary_options
+        self._image_store = (
+            CogenticImageStore(image_options) if image_options is not None else None
+        )
         self.logger = logging.getLogger(TRACE_LOGGER_NAME)
         if json_model_client is None:
             self._json_model_client = json_model_client or model_client
@@ -133,6 +208,15 @@ class CogenticOrchestrator(BaseGroupChatManager):
             )
         self._team_description = self._team_description.strip()
 
+    def _prompt_format(self, prompt: CogenticPromptName) -> CogenticRenderFormat:
+        """The format the plan is rendered in for a prompt."""
+        return self._prompt_formats.get(prompt, "json")
+
+    @property
+    def _trace_track(self) -> str:
+        """The track for this run's spans in the trace."""
+        return f"{self._name}/{self.id.key}"
+
     async def _publish_to_output(
         self,
         message: Any,
@@ -148,6 +232,17 @@ class CogenticOrchestrator(BaseGroupChatManager):
             cancellation_token=cancellation_token,
         )
 
+    @property
+    def _reasoning_chunk_handler(self) -> Callable[[str], Awaitable[None]] | None:
+        """The callback streaming our reasoning to the output topic, if enabled."""
+        return self._publish_reasoning_chunk if self._stream_output else None
+
+    async def _publish_reasoning_chunk(self, chunk: str) -> None:
+        """Publish a chunk of our reasoning to the output topic, as it is generated."""
+        await self._publish_to_output(
+            ModelClientStreamingChunkEvent(content=chunk, source=self._name)
+        )
+
     async def _publish_to_group(
         self,
         message: Any,
@@ -195,6 +290,8 @@ class CogenticOrchestrator(BaseGroupChatManager):
         self._current_stall_count = 0
         self._current_hypothesis_turns = 0
         self._current_test_turns = 0
+        self._hypothesis_usage.reset()
+        self._test_usage.reset()
         for participant_topic_type in self._participant_topic_types:
             await self._runtime.send_message(
                 GroupChatReset(),
@@ -203,6 +300,8 @@ class CogenticOrchestrator(BaseGroupChatManager):
             )
 
     @rpc
+    @traced("handle_start")
+    @reports_usage
     async def handle_start(self, message: GroupChatStart, ctx: MessageContext) -> None:  # type: ignore
         """
         Handle the start of a group chat.
@@ -211,6 +310,7 @@ class CogenticOrchestrator(BaseGroupChatManager):
 
         - Gather initial evidence from the question itself
         - Create an initial plan containing hypotheses to be verified
+          (in the same call as the evidence, unless two stage planning is used)
         - Finish by selecting a hypothesis to process
 
         """
@@ -230,9 +330,78 @@ class CogenticOrchestrator(BaseGroupChatManager):
 
         self._plan = CogenticPlan()
 
+        # Reuse the plan of the same (or a similar) question, if cached
+        cached_plan = (
+            self._plan_cache.get(self._question, self._team_description)
+            if self._plan_cache is not None
+            else None
+        )
+        if cached_plan:
+            self.logger.debug(
+                f"Reusing the cached plan of a question with similarity {cached_plan.similarity:.2f}"
+            )
+
         # Add our persona
         planning_conversation.append(SystemMessage(content=create_persona_prompt()))
 
+        if cached_plan and cached_plan.exact:
+            initial_evidence = cached_plan.evidence
+            initial_hypotheses = cached_plan.hypotheses
+        elif self._use_two_stage_planning:
+            initial_evidence, initial_hypotheses = await self._plan_in_two_stages(
+                planning_conversation,
+                cached_plan.hypotheses if cached_plan else None,
+                ctx.cancellation_token,
+            )
+        else:
+            # Collect the initial evidence and create the hypotheses in a single call,
+            # adapting the plan of a similar question if one was cached
+            similar_plan = (
+                CogenticInitialPlan(
+                    evidence=cached_plan.evidence.evidence,
+                    hypotheses=cached_plan.hypotheses.hypotheses,
+                )
+                if cached_plan
+                else None
+            )
+            planning_conversation.append(
+                UserMessage(
+                    content=create_initial_plan_prompt(
+                        self._question, self._team_description, similar_plan
+                    ),
+                    source=self._name,
+                )
+            )
+            initial_plan = await self._reason_and_output_model(
+                "initial_plan",
+                planning_conversation,
+                ctx.cancellation_token,
+                response_model=CogenticInitialPlan,
+            )
+            initial_evidence = CogenticInitialEvidence(evidence=initial_plan.evidence)
+            initial_hypotheses = CogenticInitialHypotheses(
+                hypotheses=initial_plan.hypotheses
+            )
+        self._plan.evidence.extend(initial_evidence.evidence)
+
+        if self._plan_cache is not None and not (cached_plan and cached_plan.exact):
+            self._plan_cache.put(
+                self._question,
+                self._team_description,
+                initial_evidence,
+                initial_hypotheses,
+            )
+        self._plan.hypotheses = initial_hypotheses.hypotheses
+
+        await self._process_next_hypothesis(ctx.cancellation_token)
+
+    async def _plan_in_two_stages(
+        self,
+        planning_conversation: List[LLMMessage],
+        similar_hypotheses: CogenticInitialHypotheses | None,
+        cancellation_token: CancellationToken,
+    ) -> tuple[CogenticInitialEvidence, CogenticInitialHypotheses]:
+        """Collect the initial evidence, then create hypotheses based on it, adapting those of a similar question if given."""
         # Collect initial evidence from the question.
         planning_conversation.append(
             UserMessage(
@@ -240,15 +409,12 @@ class CogenticOrchestrator(BaseGroupChatManager):
                 source=self._name,
             )
         )
-        initial_evidence = await reason_and_output_model(
-            self._model_client,
-            self._json_model_client,
-            self._get_compatible_context(planning_conversation),
-            ctx.cancellation_token,
+        initial_evidence = await self._reason_and_output_model(
+            "initial_evidence",
+            planning_conversation,
+            cancellation_token,
             response_model=CogenticInitialEvidence,
-            retries=self._max_json_retries,
         )
-        self._plan.evidence.extend(initial_evidence.evidence)
 
         # Add the fact sheet to the planning conversation
         planning_conversation.append(
@@ -261,21 +427,19 @@ class CogenticOrchestrator(BaseGroupChatManager):
         # Now, based on the question and the known facts, ask the model to create a plan
         planning_conversation.append(
             UserMessage(
-                content=create_initial_hypotheses_prompt(self._team_description),
+                content=create_initial_hypotheses_prompt(
+                    self._team_description, similar_hypotheses
+                ),
                 source=self._name,
             )
         )
-        initial_hypotheses = await reason_and_output_model(
-            self._model_client,
-            self._json_model_client,
-            self._get_compatible_context(planning_conversation),
-            ctx.cancellation_token,
+        initial_hypotheses = await self._reason_and_output_model(
+            "initial_hypotheses",
+            planning_conversation,
+            cancellation_token,
             response_model=CogenticInitialHypotheses,
-            retries=self._max_json_retries,
         )
-        self._plan.hypotheses = initial_hypotheses.hypotheses
-
-        await self._process_next_hypothesis(ctx.cancellation_token)
+        return initial_evidence, initial_hypotheses
 
     async def _process_next_hypothesis(
         self, cancellation_token: CancellationToken
@@ -296,9 +460,11 @@ class CogenticOrchestrator(BaseGroupChatManager):
         # Clear the ledger
         self._ledger = None
 
-        # Clear the orchestrator message thread
+        # Clear the orchestrator message thread, and the images it referred to
         self._message_thread.clear()
         self._summarized_thread.clear()
+        if self._image_store is not None:
+            self._image_store.clear()
 
         # Add our persona to our thread
         persona_message = TextMessage(content=create_persona_prompt(), source="system")
@@ -306,14 +472,16 @@ class CogenticOrchestrator(BaseGroupChatManager):
         self._summarized_thread.append(persona_message)
 
         # Create the initial message for the group chat
-        current_state_message = TextMessage(
-            content=create_current_state_prompt(
-                question=self._question,
-                team_description=self._team_description,
-                plan=self._plan,
-            ),
-            source=self._name,
-        )
+        with trace_span("render_current_state"):
+            current_state_message = TextMessage(
+                content=create_current_state_prompt(
+                    question=self._question,
+                    team_description=self._team_description,
+                    plan=self._plan,
+                    format=self._prompt_format("current_state"),
+                ),
+                source=self._name,
+            )
         # First message in any work thread is the state
         self._message_thread.append(current_state_message)
         self._summarized_thread.append(current_state_message)
@@ -345,6 +513,14 @@ class CogenticOrchestrator(BaseGroupChatManager):
             )
             return
 
+        # Check if we have spent our budget for the run.
+        if self._budget is not None and self._budget.total_exceeded(self._usage):
+            await self._create_final_answer(
+                f"Token budget reached ({self._usage.total_tokens} tokens used). Can we come to a conclusion?",
+                cancellation_token,
+            )
+            return
+
         self._total_turns += 1
         self._current_hypothesis_turns += 1
         self._current_test_turns += 1
@@ -355,6 +531,24 @@ class CogenticOrchestrator(BaseGroupChatManager):
                 cancellation_token=cancellation_token,
             )
 
+        # On routine turns, a quick check stands in for the full ledger
+        if self._use_tiered_ledger and self._active_step is not None:
+            progress_check = await self._check_progress(cancellation_token)
+            if progress_check.routine and not self._needs_replan():
+                assert progress_check.next_instruction
+                self._current_stall_count = max(0, self._current_stall_count - 1)
+                next_step = self._active_step.model_copy(
+                    update={
+                        "instruction_or_question": CogenticReasonedStringAnswer(
+                            reason="The work on the current test continues.",
+                            answer=progress_check.next_instruction,
+                        )
+                    }
+                )
+                return await self._execute_next_step(
+                    cancellation_token=cancellation_token, next_step=next_step
+                )
+
         # Request an update to the ledger
         self._ledger = await self._update_progress_ledger(
             cancellation_token=cancellation_token
@@ -389,6 +583,7 @@ class CogenticOrchestrator(BaseGroupChatManager):
         # Check if we're done the test/hypothesis
         if self._ledger.test_state.answer != "incomplete":
             self._current_test_turns = 0
+            self._test_usage.reset()
             self.logger.info("Current test work complete.")
 
             # Replan on completed hypothesis
@@ -462,6 +657,12 @@ class CogenticOrchestrator(BaseGroupChatManager):
             topic_id=DefaultTopicId(type=next_step.next_speaker.answer),
             cancellation_token=cancellation_token,
         )
+        if self._tracer.enabled:
+            self._agent_wait_span = self._tracer.start_span(
+                "agent_turn",
+                track=self._trace_track,
+                agent=next_step.next_speaker.answer,
+            )
 
     def _needs_replan(self) -> bool:
         """Check if we need to replan based on the current state."""
@@ -472,8 +673,126 @@ class CogenticOrchestrator(BaseGroupChatManager):
         test_turns_exceeded = self._max_turns_per_test is not None and (
             self._current_test_turns >= self._max_turns_per_test
         )
-        return stalled or hypothesis_turns_exceeded or test_turns_exceeded
+        budget_exceeded = self._budget is not None and (
+            self._budget.hypothesis_exceeded(self._hypothesis_usage)
+            or self._budget.test_exceeded(self._test_usage)
+        )
+        return (
+            stalled
+            or hypothesis_turns_exceeded
+            or test_turns_exceeded
+            or budget_exceeded
+        )
+
+    def _record_usage(self, usage: RequestUsage) -> None:
+        """Count the usage of a model call towards our budgets."""
+        self._usage.add(usage)
+        self._hypothesis_usage.add(usage)
+        self._test_usage.add(usage)
+
+    def _route(
+        self,
+        site: CogenticCallSite,
+        model_client: ChatCompletionClient | None = None,
+        json_model_client: ChatCompletionClient | None = None,
+    ) -> CogenticRoutedClients:
+        """Resolve the clients serving a call site, which default to ours unless routed elsewhere."""
+        route = (
+            self._model_router.routes.get(site)
+            if self._model_router is not None
+            else None
+        )
+        if route is None:
+            return CogenticRoutedClients(
+                DEFAULT_CLIENT,
+                model_client or self._model_client,
+                json_model_client or self._json_model_client,
+            )
+        assert self._model_router is not None
+        return self._model_router.resolve(
+            route,
+            self._model_client,
+            self._json_model_client,
+            stalls=self._current_stall_count,
+        )
 
+    async def _reason_and_output_model(
+        self,
+        site: CogenticCallSite,
+        messages: List[LLMMessage],
+        cancellation_token: CancellationToken,
+        response_model: Type[T],
+        validation_context: dict[str, Any] | None = None,
+        model_client: ChatCompletionClient | None = None,
+        json_model_client: ChatCompletionClient | None = None,
+    ) -> T:
+        """Reason and output the model from a call site, on the clients it is routed to.
+
+        Args:
+            site (CogenticCallSite): The call site making the call.
+            messages (List[LLMMessage]): The messages to send to the model.
+            cancellation_token (CancellationToken): The cancellation token for the call.
+            response_model (Type[T]): The model to output.
+            validation_context (dict[str, Any] | None): Context passed to the response model's validators. Defaults to None.
+            model_client (ChatCompletionClient | None): The reasoning client, unless routed elsewhere. Defaults to our model client.
+            json_model_client (ChatCompletionClient | None): The JSON client, unless routed elsewhere. Defaults to our JSON model client.
+        """
+        clients = self._route(site, model_client, json_model_client)
+        start = time.perf_counter()
+        error = True
+        try:
+            with call_site(site):
+                result = await reason_and_output_model(
+                    clients.model_client,
+                    clients.json_model_client,
+                    self._get_compatible_context(messages, clients.model_client),
+                    cancellation_token=cancellation_token,
+                    response_model=response_model,
+                    retries=self._max_json_retries,
+                    validation_context=validation_context,
+                    on_reasoning_chunk=self._reasoning_chunk_handler,
+                    json_model_client_for_attempt=clients.json_model_client_for_attempt,
+                )
+            error = False
+            return result
+        finally:
+            if self._model_router is not None:
+                self._model_router.record(
+                    site, clients, time.perf_counter() - start, error
+                )
+
+    @traced("progress_check")
+    async def _check_progress(
+        self, cancellation_token: CancellationToken
+    ) -> CogenticProgressCheck:
+        """Quickly check whether the current speaker can keep working, before updating the full progress ledger.
+
+        Returns:
+            CogenticProgressCheck: The progress check. Unless it's routine, the full progress ledger is needed.
+        """
+        assert self._active_step
+        context = self._work_context()
+        context.append(
+            UserMessage(
+                content=create_progress_check_prompt(
+                    speaker=self._active_step.next_speaker.answer
+                ),
+                source=self._name,
+            )
+        )
+        # The check may run on its own (smaller) model client, for both reasoning and JSON
+        progress_check = await self._reason_and_output_model(
+            "progress_check",
+            context,
+            cancellation_token,
+            response_model=CogenticProgressCheck,
+            model_client=self._progress_check_model_client,
+            json_model_client=self._progress_check_model_client,
+        )
+        self.logger.debug(f"Progress Check: {progress_check}")
+        return progress_check
+
+    @traced("progress_ledger")
     async def _update_progress_ledger(
         self, cancellation_token: CancellationToken
     ) -> CogenticProgressLedger:
@@ -482,28 +801,22 @@ class CogenticOrchestrator(BaseGroupChatManager):
         Returns:
             CogenticProgressLedger: An updated progress ledger for the current state of the group chat.
         """
-
-        # Get the active conversation (this doesn't contain previous ledger updates, just instructions/results)
-        if self._use_summarized_context:
-            context = self._thread_to_context(self._summarized_thread)
-        else:
-            context = self._thread_to_context(self._message_thread)
+        context = self._work_context()
         ledger_type = CogenticProgressLedger.with_speakers(
             choices=self._participant_topic_types
         )
         progress_ledger_prompt = create_progress_ledger_prompt()
         context.append(UserMessage(content=progress_ledger_prompt, source=self._name))
-        progress_ledger = await reason_and_output_model(
-            self._model_client,
-            self._json_model_client,
-            self._get_compatible_context(context),
-            cancellation_token=cancellation_token,
+        progress_ledger = await self._reason_and_output_model(
+            "progress_ledger",
+            context,
+            cancellation_token,
             response_model=ledger_type,
-            retries=self._max_json_retries,
         )
         self.logger.debug(f"Progress Ledger: {progress_ledger}")
         return progress_ledger
 
+    @traced("next_step")
     async def _create_next_step(
         self, cancellation_token: CancellationToken
     ) -> CogenticNextStep:
@@ -522,18 +835,17 @@ class CogenticOrchestrator(BaseGroupChatManager):
         )
         context.append(UserMessage(content=next_step_prompt, source=self._name))
         # Get the next step
-        next_step = await reason_and_output_model(
-            self._model_client,
-            self._json_model_client,
-            self._get_compatible_context(context),
-            cancellation_token=cancellation_token,
+        next_step = await self._reason_and_output_model(
+            "next_step",
+            context,
+            cancellation_token,
             response_model=next_step_type,
-            retries=self._max_json_retries,
         )
         self.logger.debug(f"Next Step: {next_step}")
 
         return next_step
 
+    @traced("replan")
     async def _replan(
         self, cancellation_token: CancellationToken, stalled=False, requested=False
     ) -> None:
@@ -544,11 +856,13 @@ class CogenticOrchestrator(BaseGroupChatManager):
         assert self._plan and self._plan.current_hypothesis
 
         persona = create_persona_prompt()
-        current_state = create_current_state_prompt(
-            question=self._question,
-            team_description=self._team_description,
-            plan=self._plan,
-        )
+        with trace_span("render_current_state"):
+            current_state = create_current_state_prompt(
+                question=self._question,
+                team_description=self._team_description,
+                plan=self._plan,
+                format=self._prompt_format("replan"),
+            )
         if stalled:
             update_hypothesis_prompt = create_update_hypothesis_on_stall_prompt()
             plan_update_prompt = create_update_plan_on_stall_prompt()
@@ -562,19 +876,39 @@ class CogenticOrchestrator(BaseGroupChatManager):
             UserMessage(content=update_hypothesis_prompt, source=self._name),
         ]
 
-        hypothesis_update = await reason_and_output_model(
-            self._model_client,
-            self._json_model_client,
-            self._get_compatible_context(messages),
-            cancellation_token=cancellation_token,
-            response_model=CogenticHypothesisUpdate,
-            retries=self._max_json_retries,
-        )
-        # Add new tests to the hypothesis
-        self._plan.current_hypothesis.insert_tests(hypothesis_update.new_tests)
+        # The hypothesis we're reviewing, even if a patch adds or reorders hypotheses
+        current_hypothesis = self._plan.current_hypothesis
+
+        if self._use_plan_patches:
+            # Ask for operations against the existing tests instead of full test objects
+            messages.append(
+                UserMessage(
+                    content=create_patch_plan_prompt(self._plan, tests_only=True),
+                    source=self._name,
+                )
+            )
+            hypothesis_patch = await self._reason_and_output_model(
+                "update_hypothesis",
+                messages,
+                cancellation_token,
+                response_model=CogenticHypothesisPatch,
+                validation_context={"plan": self._plan},
+            )
+            hypothesis_state = hypothesis_patch.hypothesis_state
+            self._plan.apply_patch(hypothesis_patch.operations)
+        else:
+            hypothesis_update = await self._reason_and_output_model(
+                "update_hypothesis",
+                messages,
+                cancellation_token,
+                response_model=CogenticHypothesisUpdate,
+            )
+            hypothesis_state = hypothesis_update.hypothesis_state
+            # Add new tests to the hypothesis
+            current_hypothesis.insert_tests(hypothesis_update.new_tests)
         # Update the state of the hypothesis.
         # NOTE: if this sets the hypothesis to anything but unverified it will change future results of self._plan.current_hypothesis!
-        self._plan.current_hypothesis.state = hypothesis_update.hypothesis_state.answer
+        current_hypothesis.state = hypothesis_state.answer
 
         # We won't update the plan if we aren't stalled, we didn't ask for a replan, and there's work left to do
         if not stalled and not requested and self._plan.current_hypothesis:
@@ -588,14 +922,26 @@ class CogenticOrchestrator(BaseGroupChatManager):
         ]
 
         # Get the plan update
-        plan_update = await reason_and_output_model(
-            self._model_client,
-            self._json_model_client,
-            self._get_compatible_context(messages),
-            cancellation_token=cancellation_token,
-            response_model=CogenticPlanUpdate,
-            retries=self._max_json_retries,
-        )
+        if self._use_plan_patches:
+            messages.append(
+                UserMessage(
+                    content=create_patch_plan_prompt(self._plan), source=self._name
+                )
+            )
+            plan_update = await self._reason_and_output_model(
+                "update_plan",
+                messages,
+                cancellation_token,
+                response_model=CogenticPlanPatch,
+                validation_context={"plan": self._plan},
+            )
+        else:
+            plan_update = await self._reason_and_output_model(
+                "update_plan",
+                messages,
+                cancellation_token,
+                response_model=CogenticPlanUpdate,
+            )
         # Update the plan state
         self._plan.state = plan_update.plan_state.answer
         if self._plan.state != "in_progress":
@@ -608,10 +954,14 @@ class CogenticOrchestrator(BaseGroupChatManager):
             return
         else:
             # Insert new hypotheses to the plan
-            self._plan.insert_hypotheses(plan_update.new_hypotheses)
+            if isinstance(plan_update, CogenticPlanPatch):
+                self._plan.apply_patch(plan_update.operations)
+            else:
+                self._plan.insert_hypotheses(plan_update.new_hypotheses)
             self.logger.info("Plan still in progress, selecting next hypothesis...")
             return await self._process_next_hypothesis(cancellation_token)
 
+    @traced("final_answer")
     async def _create_final_answer(
         self, reason: str, cancellation_token: CancellationToken
     ) -> None:
@@ -625,19 +975,18 @@ class CogenticOrchestrator(BaseGroupChatManager):
             question=self._question,
             finish_reason=reason,
             plan=self._plan,
+            format=self._prompt_format("final_answer"),
         )
         messages = [
             SystemMessage(content=persona),
             UserMessage(content=final_answer_prompt, source=self._name),
         ]
 
-        final_answer = await reason_and_output_model(
-            self._model_client,
-            self._json_model_client,
-            messages=self._get_compatible_context(messages),
-            cancellation_token=cancellation_token,
+        final_answer = await self._reason_and_output_model(
+            "final_answer",
+            messages,
+            cancellation_token,
             response_model=CogenticFinalAnswer,
-            retries=self._max_json_retries,
         )
 
         message = TextMessage(
@@ -663,18 +1012,36 @@ class CogenticOrchestrator(BaseGroupChatManager):
         )
 
     @event
+    @reports_usage
     async def handle_agent_response(
         self, message: GroupChatAgentResponse, ctx: MessageContext
     ) -> None:
         """Handle the response from an agent in our group chat."""
-        # Add this message to our ongoing work thread
-        self._message_thread.append(message.agent_response.chat_message)
+        if self._agent_wait_span is not None:
+            self._agent_wait_span.end()
+            self._agent_wait_span = None
+        # Count the participant's model usage towards our budgets
+        for agent_message in [
+            *(message.agent_response.inner_messages or []),
+            message.agent_response.chat_message,
+        ]:
+            record_usage(agent_message.models_usage)
+        # Add this message to our ongoing work thread, with its images in the store
+        chat_message = message.agent_response.chat_message
+        if self._image_store is not None and isinstance(
+            chat_message, MultiModalMessage
+        ):
+            chat_message = await self._ingest_images(
+                chat_message, ctx.cancellation_token
+            )
+        self._message_thread.append(chat_message)
         # Summarize what happened for our plan history
         await self._summarize_action(
             message.agent_response.chat_message, ctx.cancellation_token
         )
         await self._hypothesis_loop(ctx.cancellation_token)
 
+    @traced("summarize_action")
     async def _summarize_action(
         self, message: ChatMessage, cancellation_token: CancellationToken
     ):
@@ -695,17 +1062,11 @@ class CogenticOrchestrator(BaseGroupChatManager):
         assert self._plan.current_hypothesis.current_test
 
         # Get the action summary
-        action_summary_prompt = create_summarize_result_prompt(
-            response=content_str,
-        )
-        action_summary_response = await self._json_model_client.create(
-            messages=[
-                UserMessage(content=action_summary_prompt, source=self._name),
-            ],
-            cancellation_token=cancellation_token,
+        # Summaries are made by the JSON model client, unless routed elsewhere
+        clients = self._route("summarize_action", model_client=self._json_model_client)
+        action_summary = await self._summarize_response(
+            content_str, clients, cancellation_token
         )
-        assert isinstance(action_summary_response.content, str)
-        action_summary = action_summary_response.content
         # Create the action
         action = CogenticAction(
             goal=self._active_step.goal.answer,
@@ -723,11 +1084,178 @@ class CogenticOrchestrator(BaseGroupChatManager):
             )
         )
 
+    async def _summarize_response(
+        self,
+        response: str,
+        clients: CogenticRoutedClients,
+        cancellation_token: CancellationToken,
+        depth: int = 0,
+    ) -> str:
+        """Summarize a team member's response.
+
+        With summary options, small responses are kept and JSON responses outlined without a model call,
+        and long responses are summarized in chunks, which are then combined (map-reduce). Summaries too long
+        to combine at once are summarized in chunks again, up to `max_reduce_depth` times.
+        """
+        options = self._summary_options
+        if options is None:
+            return await self._summarize(
+                clients, create_summarize_result_prompt(response), cancellation_token
+            )
+
+        def count_tokens(text: str) -> int:
+            return clients.model_client.count_tokens(
+                [UserMessage(content=text, source=self._name)]
+            )
+
+        tokens = count_tokens(response)
+        if tokens <= options.extract_below_tokens:
+            return response or "No response provided."
+        outline = outline_structured(response)
+        if (
+            outline is not None
+            and count_tokens(outline) <= options.extract_below_tokens
+        ):
+            return outline
+        if tokens <= options.chunk_tokens:
+            return await self._summarize(
+                clients, create_summarize_result_prompt(response), cancellation_token
+            )
+
+        chunks = split_by_tokens(response, tokens, options.chunk_tokens)
+        semaphore = asyncio.Semaphore(options.max_concurrency)
+
+        async def summarize_chunk(index: int, chunk: str) -> str:
+            async with semaphore:
+                return await self._summarize(
+                    clients,
+                    create_summarize_chunk_prompt(chunk, index, len(chunks)),
+                    cancellation_token,
+                    stage="map",
+                )
+
+        summaries = await asyncio.gather(
+            *(
+                summarize_chunk(index, chunk)
+                for index, chunk in enumerate(chunks, start=1)
+            )
+        )
+        combine_prompt = create_combine_summaries_prompt(summaries)
+        if count_tokens(combine_prompt) > options.chunk_tokens:
+            if depth < options.max_reduce_depth:
+                # Too many chunks to combine at once, so summarize their summaries in turn
+                return await self._summarize_response(
+                    "\n\n".join(summaries), clients, cancellation_token, depth + 1
+                )
+            # The summaries aren't shrinking, so keep the start of each, to fit a final call
+            budget = max(
+                1,
+                (
+                    options.chunk_tokens
+                    - count_tokens(
+                        create_combine_summaries_prompt([""] * len(summaries))
+                    )
+                )
+                // len(summaries),
+            )
+            combine_prompt = create_combine_summaries_prompt(
+                [
+                    split_by_tokens(summary, count_tokens(summary), budget)[0]
+                    if summary
+                    else summary
+                    for summary in summaries
+                ]
+            )
+        return await self._summarize(
+            clients, combine_prompt, cancellation_token, stage="reduce"
+        )
+
+    async def _summarize(
+        self,
+        clients: CogenticRoutedClients,
+        prompt: str,
+        cancellation_token: CancellationToken,
+        stage: str | None = None,
+    ) -> str:
+        """Make a summarization call, e.g. a "map" or "reduce" stage of a long response."""
+        start = time.perf_counter()
+        error = True
+        try:
+            with (
+                call_site("summarize_action"),
+                call_site(stage, nested=True) if stage else nullcontext(),
+            ):
+                summary_response = await clients.model_client.create(
+                    messages=[UserMessage(content=prompt, source=self._name)],
+                    cancellation_token=cancellation_token,
+                )
+            error = False
+        finally:
+            if self._model_router is not None:
+                self._model_router.record(
+                    "summarize_action", clients, time.perf_counter() - start, error
+                )
+        record_usage(summary_response.usage)
+        assert isinstance(summary_response.content, str)
+        return summary_response.content
+
+    async def _ingest_images(
+        self, message: MultiModalMessage, cancellation_token: CancellationToken
+    ) -> MultiModalMessage:
+        """Store the images of a message, captioning new ones, and refer to them from the message instead."""
+        assert self._image_store is not None
+        message, new_keys = self._image_store.ingest_message(message)
+        if not self._image_store.options.caption_images:
+            return message
+        # Captions are made by our model client, unless routed elsewhere
+        clients = self._route("caption_image")
+        if not clients.model_client.model_info["vision"]:
+            return message
+        for key in new_keys:
+            start = time.perf_counter()
+            error = True
+            try:
+                with call_site("caption_image"):
+                    caption_response = await clients.model_client.create(
+                        messages=[
+                            UserMessage(
+                                content=[
+                                    create_caption_image_prompt(message.source),
+                                    self._image_store.image(key),
+                                ],
+                                source=self._name,
+                            )
+                        ],
+                        cancellation_token=cancellation_token,
+                    )
+                error = False
+            finally:
+                if self._model_router is not None:
+                    self._model_router.record(
+                        "caption_image", clients, time.perf_counter() - start, error
+                    )
+            record_usage(caption_response.usage)
+            assert isinstance(caption_response.content, str)
+            self._image_store.set_caption(key, caption_response.content)
+        return message
+
+    def _work_context(self) -> List[LLMMessage]:
+        """Get the active conversation (this doesn't contain previous ledger updates, just instructions/results)."""
+        if self._use_summarized_context:
+            return self._thread_to_context(self._summarized_thread)
+        return self._thread_to_context(self._message_thread)
+
     def _thread_to_context(
         self, thread: list[AgentEvent | ChatMessage]
     ) -> List[LLMMessage]:
         """Convert the message thread to a context for the model."""
         context: List[LLMMessage] = []
+        # Only the most recent images are sent, older ones are replaced by their captions
+        recent_images = (
+            self._image_store.recent_keys(thread)
+            if self._image_store is not None
+            else set()
+        )
         for m in thread:
             if isinstance(m, ToolCallRequestEvent | ToolCallExecutionEvent):
                 # Ignore tool call messages.
@@ -741,13 +1269,23 @@ class CogenticOrchestrator(BaseGroupChatManager):
                 assert isinstance(
                     m, (TextMessage, MultiModalMessage, ToolCallSummaryMessage)
                 )
-                context.append(UserMessage(content=m.content, source=m.source))
+                if isinstance(m, MultiModalMessage) and self._image_store is not None:
+                    content = self._image_store.resolve(m.content, recent_images)
+                    context.append(UserMessage(content=content, source=m.source))
+                else:
+                    context.append(UserMessage(content=m.content, source=m.source))
         return context
 
-    def _get_compatible_context(self, messages: List[LLMMessage]) -> List[LLMMessage]:
-        """Ensure that the messages are compatible with the underlying client, by removing images if needed."""
-        if self._model_client.model_info["vision"]:
+    def _get_compatible_context(
+        self,
+        messages: List[LLMMessage],
+        model_client: ChatCompletionClient | None = None,
+    ) -> List[LLMMessage]:
+        """Ensure that the messages are compatible with the model client (ours by default), by removing images if needed."""
+        if (model_client or self._model_client).model_info["vision"]:
             return messages
+        elif self._image_store is not None:
+            return self._image_store.replace_images(messages)
         else:
             return remove_images(messages)
 
@@ -762,6 +1300,8 @@ class CogenticOrchestrator(BaseGroupChatManager):
             plan=self._plan,
             total_turns=self._total_turns,
             stalls=self._current_stall_count,
+            usage=self._usage,
+            images=self._image_store.dump() if self._image_store is not None else {},
         )
         return state.model_dump()
 
@@ -773,6 +1313,9 @@ class CogenticOrchestrator(BaseGroupChatManager):
         self._plan = orchestrator_state.plan
         self._total_turns = orchestrator_state.total_turns
         self._current_stall_count = orchestrator_state.stalls
+        self._usage = orchestrator_state.usage
+        if self._image_store is not None:
+            self._image_store.load(orchestrator_state.images)
 
     async def select_speaker(self, thread: List[AgentEvent | ChatMessage]) -> str:
         """Not used in this orchestrator, we select next speaker in _orchestrate_step."""
@@ -781,6 +1324,8 @@ class CogenticOrchestrator(BaseGroupChatManager):
     async def reset(self) -> None:
         """Reset the group chat manager."""
         self._message_thread.clear()
+        if self._image_store is not None:
+            self._image_store.clear()
         self._total_turns = 0
         self._current_stall_count = 0
         self._question = ""
@@ -788,3 +1333,6 @@ class CogenticOrchestrator(BaseGroupChatManager):
         self._ledger = None
         self._current_hypothesis_turns = 0
         self._current_test_turns = 0
+        self._usage.reset()
+        self._hypothesis_usage.reset()
+        self._test_usage.reset()
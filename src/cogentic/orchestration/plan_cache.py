@@ -0,0 +1,262 @@
+import hashlib
+import random
+import re
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Iterator
+
+from pydantic import BaseModel, Field
+
+from cogentic.orchestration.models.evidence import CogenticInitialEvidence
+from cogentic.orchestration.models.hypothesis import CogenticInitialHypotheses
+
+# A Mersenne prime larger than the 32 bit shingle hashes, for the MinHash permutations
+_PRIME = (1 << 61) - 1
+
+
+def normalize_question(text: str) -> str:
+    """Normalize a question for matching: case, whitespace and trailing full stops or question marks are ignored.
+
+    Operators and other symbols are kept, as "33 + 22" and "33 - 22" are different questions.
+    """
+    return re.sub(r"\s+", " ", text.casefold()).strip().rstrip(".? ")
+
+
+class CogenticPlanCacheStats(BaseModel):
+    """Lookups of the plan cache, and how they were answered."""
+
+    lookups: int = 0
+    exact_hits: int = 0
+    similar_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return (
+            (self.exact_hits + self.similar_hits) / self.lookups
+            if self.lookups
+            else 0.0
+        )
+
+
+class CogenticPlanCacheEntry(BaseModel):
+    """The initial plan of a question, as cached."""
+
+    question: str = Field(description="The normalized question")
+    team: str = Field(description="Hash of the team description")
+    evidence: CogenticInitialEvidence
+    hypotheses: CogenticInitialHypotheses
+    created_at: float
+    signature: tuple[int, ...] = Field(exclude=True)
+    hits: int = 0
+
+
+class CogenticPlanCacheMatch(BaseModel):
+    """A cached plan found for a question."""
+
+    evidence: CogenticInitialEvidence
+    hypotheses: CogenticInitialHypotheses
+    similarity: float = Field(description="Estimated similarity of the questions")
+    exact: bool = Field(description="Whether it's the plan of the same question")
+
+
+class CogenticPlanCache:
+    """Caches the initial evidence and hypotheses of questions, to skip planning for repeated questions.
+
+    Questions are matched by their normalized text and the team description. A question asked before by the
+    same team reuses the cached evidence and hypotheses, skipping both planning calls. A similar question
+    (estimated with MinHash over character n-grams, locally) whose similarity reaches `similarity_threshold`
+    is planned again, with the cached evidence and hypotheses given to the model to adapt in the same planning
+    call as a miss, as a small difference in the question can change its answer.
+
+    Entries expire after `ttl` seconds, and the least recently used entries are evicted beyond `max_entries`.
+    Share a cache between teams to share the plans.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float | None = 24 * 60 * 60,
+        similarity_threshold: float | None = 0.9,
+        ngram_size: int = 5,
+        bands: int = 16,
+        rows_per_band: int = 4,
+        seed: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the plan cache.
+
+        Args:
+            max_entries (int): The maximum number of cached plans. Defaults to 1024.
+            ttl (float | None): Seconds a plan stays cached. None means forever. Defaults to a day.
+            similarity_threshold (float | None): The minimal estimated similarity (0-1) for a similar question to reuse a plan. None only reuses plans of the same question. Defaults to 0.9.
+            ngram_size (int): The length of the character n-grams compared. Defaults to 5.
+            bands (int): The number of locality sensitive hashing bands. More bands find less similar candidates. Defaults to 16.
+            rows_per_band (int): The number of MinHash values per band. The signature has bands * rows_per_band values. Defaults to 4.
+            seed (int): Seed of the MinHash permutations. Defaults to 0.
+            clock (Callable[[], float]): The clock for expiry, in seconds. Defaults to time.monotonic.
+        """
+        assert max_entries > 0, "The cache must hold at least one entry."
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self.ngram_size = ngram_size
+        self.bands = bands
+        self.rows_per_band = rows_per_band
+        self.clock = clock
+        self.stats = CogenticPlanCacheStats()
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME))
+            for _ in range(bands * rows_per_band)
+        ]
+        self._entries: OrderedDict[str, CogenticPlanCacheEntry] = OrderedDict()
+        # Keys of the entries by (band, band values) for each team
+        self._buckets: defaultdict[tuple[str, int, tuple[int, ...]], set[str]] = (
+            defaultdict(set)
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _key(self, question: str, team: str) -> str:
+        return self._hash(f"{team}\n{question}")
+
+    def _signature(self, question: str) -> tuple[int, ...]:
+        size = self.ngram_size
+        padded = f" {question} "
+        shingles = {
+            int.from_bytes(
+                hashlib.blake2b(padded[i : i + size].encode(), digest_size=4).digest()
+            )
+            for i in range(max(1, len(padded) - size + 1))
+        }
+        return tuple(
+            min((a * shingle + b) % _PRIME for shingle in shingles)
+            for a, b in self._permutations
+        )
+
+    def _bands(
+        self, team: str, signature: tuple[int, ...]
+    ) -> Iterator[tuple[str, int, tuple[int, ...]]]:
+        rows = self.rows_per_band
+        for band in range(self.bands):
+            yield (team, band, signature[band * rows : (band + 1) * rows])
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        for bucket in self._bands(entry.team, entry.signature):
+            keys = self._buckets[bucket]
+            keys.discard(key)
+            if not keys:
+                del self._buckets[bucket]
+
+    def _expired(self, entry: CogenticPlanCacheEntry) -> bool:
+        return self.ttl is not None and self.clock() - entry.created_at > self.ttl
+
+    def _hit(self, key: str, similarity: float, exact: bool) -> CogenticPlanCacheMatch:
+        entry = self._entries[key]
+        entry.hits += 1
+        self._entries.move_to_end(key)
+        # The plan is updated as the team works through it, so hand out copies
+        return CogenticPlanCacheMatch(
+            evidence=entry.evidence.model_copy(deep=True),
+            hypotheses=entry.hypotheses.model_copy(deep=True),
+            similarity=similarity,
+            exact=exact,
+        )
+
+    def get(
+        self, question: str, team_description: str
+    ) -> CogenticPlanCacheMatch | None:
+        """Find the cached plan of the question, or of the most similar question above the threshold.
+
+        Args:
+            question (str): The question.
+            team_description (str): The description of the team which will answer the question.
+        """
+        self.stats.lookups += 1
+        question = normalize_question(question)
+        team = self._hash(team_description)
+        key = self._key(question, team)
+        entry = self._entries.get(key)
+        if entry is not None and self._expired(entry):
+            self._remove(key)
+            self.stats.expirations += 1
+        elif entry is not None:
+            self.stats.exact_hits += 1
+            return self._hit(key, 1.0, exact=True)
+
+        if self.similarity_threshold is not None:
+            signature = self._signature(question)
+            candidates = set().union(
+                *(
+                    self._buckets.get(bucket, ())
+                    for bucket in self._bands(team, signature)
+                )
+            )
+            best: tuple[float, str] | None = None
+            for candidate in candidates:
+                entry = self._entries[candidate]
+                if self._expired(entry):
+                    self._remove(candidate)
+                    self.stats.expirations += 1
+                    continue
+                similarity = sum(
+                    x == y for x, y in zip(signature, entry.signature)
+                ) / len(signature)
+                if similarity >= self.similarity_threshold and (
+                    best is None or similarity > best[0]
+                ):
+                    best = (similarity, candidate)
+            if best is not None:
+                self.stats.similar_hits += 1
+                return self._hit(best[1], best[0], exact=False)
+
+        self.stats.misses += 1
+        return None
+
+    def put(
+        self,
+        question: str,
+        team_description: str,
+        evidence: CogenticInitialEvidence,
+        hypotheses: CogenticInitialHypotheses,
+    ) -> None:
+        """Cache the initial plan of a question.
+
+        Args:
+            question (str): The question.
+            team_description (str): The description of the team which planned the question.
+            evidence (CogenticInitialEvidence): The initial evidence of the question.
+            hypotheses (CogenticInitialHypotheses): The initial hypotheses of the question.
+        """
+        question = normalize_question(question)
+        team = self._hash(team_description)
+        key = self._key(question, team)
+        if key in self._entries:
+            self._remove(key)
+        entry = CogenticPlanCacheEntry(
+            question=question,
+            team=team,
+            evidence=evidence.model_copy(deep=True),
+            hypotheses=hypotheses.model_copy(deep=True),
+            created_at=self.clock(),
+            signature=self._signature(question),
+        )
+        self._entries[key] = entry
+        for bucket in self._bands(team, entry.signature):
+            self._buckets[bucket].add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._buckets.clear()
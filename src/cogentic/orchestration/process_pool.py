@@ -0,0 +1,232 @@
+import asyncio
+import functools
+import multiprocessing
+import queue
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable
+from multiprocessing.context import SpawnContext
+from multiprocessing.process import BaseProcess
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+from autogen_core import ComponentModel
+
+from cogentic.orchestration.batch import (
+    CogenticBatchMetrics,
+    CogenticBatchResult,
+    CogenticBatchRunner,
+)
+
+if TYPE_CHECKING:
+    from cogentic.orchestration.chat import CogenticGroupChat
+
+# Seconds between checks that the workers are still alive, while waiting for results
+_POLL_INTERVAL = 0.5
+
+
+def _load_team(config: dict[str, Any]) -> "CogenticGroupChat":
+    from cogentic.orchestration.chat import CogenticGroupChat
+
+    return CogenticGroupChat.load_component(ComponentModel.model_validate(config))
+
+
+def _worker(
+    worker: int,
+    team: dict[str, Any] | Callable[[], "CogenticGroupChat"],
+    runner_args: dict[str, Any],
+    tasks: "multiprocessing.Queue[tuple[int, str] | None]",
+    results: "multiprocessing.Queue[tuple[int, CogenticBatchResult | None, int]]",
+) -> None:
+    """Run the tasks from the task queue in a batch runner, until told to stop by a None task."""
+
+    async def main() -> None:
+        loop = asyncio.get_running_loop()
+        # The index of each task in the whole batch, by its index in this worker's batch
+        indices: list[int] = []
+
+        async def worker_tasks() -> AsyncIterator[str]:
+            while (message := await loop.run_in_executor(None, tasks.get)) is not None:
+                index, task = message
+                indices.append(index)
+                yield task
+
+        runner = CogenticBatchRunner(
+            team if callable(team) else functools.partial(_load_team, team),
+            **runner_args,
+        )
+        async for result in runner.run(worker_tasks()):
+            result.index = indices[result.index]
+            results.put((worker, result, runner.metrics.timeouts))
+        results.put((worker, None, runner.metrics.timeouts))
+
+    asyncio.run(main())
+
+
+class CogenticProcessPoolRunner:
+    """Runs many independent tasks in a pool of worker processes, yielding results as they complete.
+
+    Validation and prompt rendering are CPU bound, so a single event loop can only drive a limited number of
+    concurrent runs. Each worker process runs its own event loop with a `CogenticBatchRunner`, and with its own
+    model clients and connection pools. Tasks are handed out as workers have free slots, and results and
+    metrics are gathered in this process.
+
+    The team is either a `CogenticGroupChat` (or its component config), which is serialized and loaded in
+    every worker, or a factory creating teams. The factory must be picklable, e.g. a module level function,
+    and is where teams using `get_model_client` (whose clients can't be serialized) are built.
+    """
+
+    def __init__(
+        self,
+        team: "CogenticGroupChat | ComponentModel | Callable[[], CogenticGroupChat]",
+        processes: int | None = None,
+        concurrency: int = 8,
+        timeout: float | None = None,
+        retries: int = 0,
+        retry_backoff: float = 1.0,
+        batch_id: str | None = None,
+    ):
+        """Initialize the process pool runner.
+
+        Args:
+            team (CogenticGroupChat | ComponentModel | Callable[[], CogenticGroupChat]): The team to run the tasks with, its component config, or a picklable factory creating teams.
+            processes (int | None): The number of worker processes. Defaults to the number of CPUs.
+            concurrency (int): The maximum number of tasks running at once in each worker. Defaults to 8.
+            timeout (float | None): Seconds a single attempt may take. None means no limit. Defaults to None.
+            retries (int): How often a failed or timed out task is retried. Defaults to 0.
+            retry_backoff (float): Seconds to wait before the first retry, doubled for every further retry. Defaults to 1 second.
+            batch_id (str | None): Prefix of the session ids of the tasks. Defaults to a random id.
+        """
+        assert concurrency > 0, "Concurrency must be at least 1."
+        if isinstance(team, ComponentModel):
+            self._team: dict[str, Any] | Callable[[], "CogenticGroupChat"] = (
+                team.model_dump()
+            )
+        elif callable(team):
+            self._team = team
+        else:
+            self._team = team.dump_component().model_dump()
+        self.processes = processes or multiprocessing.cpu_count()
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.batch_id = batch_id or uuid4().hex[:12]
+        # Workers are spawned, which is safe with the threads of this process
+        self._context: SpawnContext = multiprocessing.get_context("spawn")
+        self.metrics = CogenticBatchMetrics()
+
+    def _start_workers(
+        self,
+        tasks: "multiprocessing.Queue[tuple[int, str] | None]",
+        results: "multiprocessing.Queue[tuple[int, CogenticBatchResult | None, int]]",
+    ) -> list[BaseProcess]:
+        workers = []
+        for worker in range(self.processes):
+            runner_args = {
+                "concurrency": self.concurrency,
+                "timeout": self.timeout,
+                "retries": self.retries,
+                "retry_backoff": self.retry_backoff,
+                "batch_id": f"{self.batch_id}-{worker}",
+            }
+            process = self._context.Process(
+                target=_worker,
+                args=(worker, self._team, runner_args, tasks, results),
+                name=f"cogentic-worker-{worker}",
+                daemon=True,
+            )
+            process.start()
+            workers.append(process)
+        return workers
+
+    async def run(
+        self, tasks: Iterable[str] | AsyncIterable[str]
+    ) -> AsyncIterator[CogenticBatchResult]:
+        """Run the tasks in the worker processes, yielding their results in the order they complete.
+
+        Tasks are taken from `tasks` as the workers have free slots, so it may be a lazy (or endless)
+        iterable. Closing the iterator terminates the workers.
+
+        Args:
+            tasks (Iterable[str] | AsyncIterable[str]): The tasks to run.
+        """
+        if isinstance(tasks, AsyncIterable):
+            source: AsyncIterator[str] = aiter(tasks)
+        else:
+
+            async def from_iterable() -> AsyncIterator[str]:
+                for task in tasks:
+                    yield task
+
+            source = from_iterable()
+
+        task_queue: "multiprocessing.Queue[tuple[int, str] | None]" = (
+            self._context.Queue()
+        )
+        result_queue: "multiprocessing.Queue[tuple[int, CogenticBatchResult | None, int]]" = self._context.Queue()
+        workers = self._start_workers(task_queue, result_queue)
+        loop = asyncio.get_running_loop()
+        metrics = self.metrics
+        started = time.perf_counter()
+        elapsed = metrics.elapsed
+        # Keep every slot busy, and a task queued for each worker
+        capacity = self.processes * (self.concurrency + 1)
+        timeouts = [0] * self.processes
+        finished = 0
+        exhausted = False
+        try:
+            while finished < self.processes:
+                while not exhausted and metrics.in_flight < capacity:
+                    try:
+                        task = await anext(source)
+                    except StopAsyncIteration:
+                        exhausted = True
+                        for _ in workers:
+                            task_queue.put(None)
+                        break
+                    task_queue.put((metrics.submitted, task))
+                    metrics.submitted += 1
+                    metrics.in_flight += 1
+                try:
+                    worker, result, timeouts[worker] = await loop.run_in_executor(
+                        None, result_queue.get, True, _POLL_INTERVAL
+                    )
+                except queue.Empty:
+                    for process in workers:
+                        if process.exitcode:
+                            raise RuntimeError(
+                                f"Worker {process.name} exited with code {process.exitcode}."
+                            )
+                    continue
+                metrics.timeouts = sum(timeouts)
+                metrics.elapsed = elapsed + time.perf_counter() - started
+                if result is None:
+                    finished += 1
+                    continue
+                metrics.in_flight -= 1
+                metrics.retries += result.attempts - 1
+                metrics.prompt_tokens += result.usage.prompt_tokens
+                metrics.completion_tokens += result.usage.completion_tokens
+                metrics.durations.append(result.duration)
+                if result.succeeded:
+                    metrics.succeeded += 1
+                else:
+                    metrics.failed += 1
+                yield result
+        finally:
+            for process in workers:
+                if process.is_alive() and finished < self.processes:
+                    process.terminate()
+            for process in workers:
+                await loop.run_in_executor(None, process.join)
+            task_queue.close()
+            result_queue.close()
+            metrics.in_flight = 0
+            metrics.elapsed = elapsed + time.perf_counter() - started
+
+    async def run_all(
+        self, tasks: Iterable[str] | AsyncIterable[str]
+    ) -> list[CogenticBatchResult]:
+        """Run the tasks, returning the results in the order of the tasks."""
+        results = [result async for result in self.run(tasks)]
+        return sorted(results, key=lambda result: result.index)
@@ -1,11 +1,18 @@
 from cogentic.orchestration.prompts.prompts import (
+    CogenticPromptName,
+    create_caption_image_prompt,
+    create_combine_summaries_prompt,
     create_current_state_prompt,
     create_final_answer_prompt,
     create_initial_evidence_prompt,
     create_initial_hypotheses_prompt,
+    create_initial_plan_prompt,
     create_next_step_prompt,
+    create_patch_plan_prompt,
     create_persona_prompt,
+    create_progress_check_prompt,
     create_progress_ledger_prompt,
+    create_summarize_chunk_prompt,
     create_summarize_result_prompt,
     create_update_hypothesis_on_stall_prompt,
     create_update_hypothesis_prompt,
@@ -14,13 +21,20 @@ from cogentic.orchestration.prompts.prompts import (
 )
 
 __all__ = [
+    "CogenticPromptName",
+    "create_caption_image_prompt",
     "create_final_answer_prompt",
     "create_current_state_prompt",
     "create_initial_evidence_prompt",
     "create_initial_hypotheses_prompt",
+    "create_initial_plan_prompt",
     "create_next_step_prompt",
+    "create_patch_plan_prompt",
     "create_summarize_result_prompt",
+    "create_summarize_chunk_prompt",
+    "create_combine_summaries_prompt",
     "create_persona_prompt",
+    "create_progress_check_prompt",
     "create_progress_ledger_prompt",
     "create_update_hypothesis_prompt",
     "create_update_hypothesis_on_stall_prompt",
@@ -1,7 +1,14 @@
 # import json
 from pathlib import Path
+from typing import Literal
 
+from cogentic.orchestration.models.hypothesis import CogenticInitialHypotheses
+from cogentic.orchestration.models.orchestration import CogenticInitialPlan
 from cogentic.orchestration.models.plan import CogenticPlan
+from cogentic.orchestration.models.render import CogenticRenderFormat
+
+# The prompts rendering the plan, whose format can be chosen
+CogenticPromptName = Literal["current_state", "replan", "final_answer"]
 
 PROMPTS_DIR = Path(__file__).parent
 
@@ -29,10 +36,46 @@ INITIAL_HYPOTHESES_PROMPT_PATH = PROMPTS_DIR / "initial_hypotheses.md"
 INITIAL_HYPOTHESES_PROMPT = INITIAL_HYPOTHESES_PROMPT_PATH.read_text()
 
 
-def create_initial_hypotheses_prompt(team_description: str) -> str:
-    return INITIAL_HYPOTHESES_PROMPT.format(
+SIMILAR_HYPOTHESES_PROMPT_PATH = PROMPTS_DIR / "similar_hypotheses.md"
+SIMILAR_HYPOTHESES_PROMPT = SIMILAR_HYPOTHESES_PROMPT_PATH.read_text()
+
+
+def create_initial_hypotheses_prompt(
+    team_description: str,
+    similar_hypotheses: CogenticInitialHypotheses | None = None,
+) -> str:
+    prompt = INITIAL_HYPOTHESES_PROMPT.format(
         team_description=team_description,
     )
+    if similar_hypotheses is not None:
+        prompt += "\n" + SIMILAR_HYPOTHESES_PROMPT.format(
+            hypotheses=similar_hypotheses.model_dump_markdown(),
+        )
+    return prompt
+
+
+INITIAL_PLAN_PROMPT_PATH = PROMPTS_DIR / "initial_plan.md"
+INITIAL_PLAN_PROMPT = INITIAL_PLAN_PROMPT_PATH.read_text()
+
+
+SIMILAR_PLAN_PROMPT_PATH = PROMPTS_DIR / "similar_plan.md"
+SIMILAR_PLAN_PROMPT = SIMILAR_PLAN_PROMPT_PATH.read_text()
+
+
+def create_initial_plan_prompt(
+    question: str,
+    team_description: str,
+    similar_plan: CogenticInitialPlan | None = None,
+) -> str:
+    prompt = INITIAL_PLAN_PROMPT.format(
+        initial_evidence=create_initial_evidence_prompt(question),
+        initial_hypotheses=create_initial_hypotheses_prompt(team_description),
+    )
+    if similar_plan is not None:
+        prompt += "\n\n" + SIMILAR_PLAN_PROMPT.format(
+            plan=similar_plan.model_dump_markdown(),
+        )
+    return prompt
 
 
 CURRENT_STATE_PROMPT_PATH = PROMPTS_DIR / "current_state.md"
@@ -43,20 +86,23 @@ def create_current_state_prompt(
     question: str,
     team_description: str,
     plan: CogenticPlan,
+    format: CogenticRenderFormat = "json",
 ) -> str:
     current_test = "No tests have work remaining."
     current_hypothesis = "No hypotheses have work remaining."
     if plan.current_hypothesis:
         if plan.current_hypothesis.current_test:
-            current_test = plan.current_hypothesis.current_test.model_dump_markdown()
-        current_hypothesis = plan.current_hypothesis.model_dump_markdown()
+            current_test = plan.current_hypothesis.current_test.model_dump_markdown(
+                format=format
+            )
+        current_hypothesis = plan.current_hypothesis.model_dump_markdown(format=format)
     return CURRENT_STATE_PROMPT.format(
         question=question,
         current_hypothesis=current_hypothesis,
         current_test=current_test,
         team_description=team_description,
-        evidence=plan.model_dump_field_as_markdown("evidence"),
-        issues=plan.model_dump_field_as_markdown("issues"),
+        evidence=plan.model_dump_field_as_markdown("evidence", format=format),
+        issues=plan.model_dump_field_as_markdown("issues", format=format),
     )
 
 
@@ -68,6 +114,17 @@ def create_progress_ledger_prompt() -> str:
     return CREATE_PROGRESS_LEDGER_PROMPT
 
 
+PROGRESS_CHECK_PROMPT_PATH = PROMPTS_DIR / "progress_check.md"
+PROGRESS_CHECK_PROMPT = PROGRESS_CHECK_PROMPT_PATH.read_text()
+
+
+def create_progress_check_prompt(speaker: str) -> str:
+    """Quickly check whether the current speaker can keep working, before the full progress ledger."""
+    return PROGRESS_CHECK_PROMPT.format(
+        speaker=speaker,
+    )
+
+
 FINAL_ANSWER_PROMPT_PATH = PROMPTS_DIR / "final_answer.md"
 FINAL_ANSWER_PROMPT = FINAL_ANSWER_PROMPT_PATH.read_text()
 
@@ -76,11 +133,12 @@ def create_final_answer_prompt(
     question: str,
     finish_reason: str,
     plan: CogenticPlan,
+    format: CogenticRenderFormat = "json",
 ) -> str:
     return FINAL_ANSWER_PROMPT.format(
         question=question,
         finish_reason=finish_reason,
-        plan=plan.model_dump_markdown(),
+        plan=plan.model_dump_markdown(format=format),
     )
 
 
@@ -118,6 +176,41 @@ def create_update_plan_on_stall_prompt() -> str:
     return UPDATE_PLAN_ON_STALL_PROMPT
 
 
+PATCH_PLAN_PROMPT_PATH = PROMPTS_DIR / "patch_plan.md"
+PATCH_PLAN_PROMPT = PATCH_PLAN_PROMPT_PATH.read_text()
+
+
+def create_plan_outline(plan: CogenticPlan) -> str:
+    """Outline the names and states of the hypotheses and tests in the plan."""
+    if not plan.hypotheses:
+        return "The plan has no hypotheses yet."
+    lines = []
+    current_hypothesis = plan.current_hypothesis
+    for hypothesis in plan.hypotheses:
+        current = " **(current)**" if hypothesis is current_hypothesis else ""
+        lines.append(f"- `{hypothesis.name}` ({hypothesis.state}){current}")
+        current_test = hypothesis.current_test
+        for test in hypothesis.tests:
+            current = " **(current)**" if test is current_test else ""
+            lines.append(f"    - `{test.name}` ({test.state}){current}")
+    return "\n".join(lines)
+
+
+def create_patch_plan_prompt(plan: CogenticPlan, tests_only: bool = False) -> str:
+    """Ask for plan or hypothesis updates as patch operations rather than full objects.
+
+    Args:
+        plan (CogenticPlan): The plan to update.
+        tests_only (bool): Whether only the tests of the current hypothesis may be changed. Defaults to False.
+    """
+    prompt = PATCH_PLAN_PROMPT.format(
+        plan_outline=create_plan_outline(plan),
+    )
+    if tests_only:
+        prompt += "\nOnly use the test operations here, on the tests of the current hypothesis. The other hypotheses are updated separately.\n"
+    return prompt
+
+
 NEXT_STEP_PROMPT_PATH = PROMPTS_DIR / "next_step.md"
 NEXT_STEP_PROMPT = NEXT_STEP_PROMPT_PATH.read_text()
 
@@ -130,6 +223,14 @@ def create_next_step_prompt(
     )
 
 
+CAPTION_IMAGE_PROMPT_PATH = PROMPTS_DIR / "caption_image.md"
+CAPTION_IMAGE_PROMPT = CAPTION_IMAGE_PROMPT_PATH.read_text()
+
+
+def create_caption_image_prompt(source: str) -> str:
+    return CAPTION_IMAGE_PROMPT.format(source=source)
+
+
 SUMMARIZE_RESULT_PROMPT_PATH = PROMPTS_DIR / "summarize_result.md"
 SUMMARIZE_RESULT_PROMPT = SUMMARIZE_RESULT_PROMPT_PATH.read_text()
 
@@ -142,3 +243,24 @@ def create_summarize_result_prompt(
     return SUMMARIZE_RESULT_PROMPT.format(
         response=response,
     )
+
+
+SUMMARIZE_CHUNK_PROMPT_PATH = PROMPTS_DIR / "summarize_chunk.md"
+SUMMARIZE_CHUNK_PROMPT = SUMMARIZE_CHUNK_PROMPT_PATH.read_text()
+
+
+def create_summarize_chunk_prompt(response: str, index: int, count: int) -> str:
+    return SUMMARIZE_CHUNK_PROMPT.format(response=response, index=index, count=count)
+
+
+COMBINE_SUMMARIES_PROMPT_PATH = PROMPTS_DIR / "combine_summaries.md"
+COMBINE_SUMMARIES_PROMPT = COMBINE_SUMMARIES_PROMPT_PATH.read_text()
+
+
+def create_combine_summaries_prompt(summaries: list[str]) -> str:
+    return COMBINE_SUMMARIES_PROMPT.format(
+        summaries="\n\n".join(
+            f"### Part {index}\n\n{summary}"
+            for index, summary in enumerate(summaries, start=1)
+        )
+    )
@@ -0,0 +1,284 @@
+import threading
+from typing import Literal, Mapping, NamedTuple, get_args
+
+from autogen_core import Component, ComponentBase, ComponentModel
+from autogen_core.models import ChatCompletionClient
+from pydantic import BaseModel, Field
+from typing_extensions import Self
+
+from cogentic.observability.metrics import CogenticHistogram
+
+# The orchestrator's call sites, which can be routed
+CogenticCallSite = Literal[
+    "initial_plan",
+    "initial_evidence",
+    "initial_hypotheses",
+    "progress_check",
+    "progress_ledger",
+    "next_step",
+    "update_hypothesis",
+    "update_plan",
+    "final_answer",
+    "summarize_action",
+    "caption_image",
+]
+
+# Names which refer to the team's own model client and JSON model client
+TEAM_MODEL_CLIENT = "model"
+TEAM_JSON_MODEL_CLIENT = "json"
+# The name in the stats of the clients serving call sites without a route
+DEFAULT_CLIENT = "default"
+
+
+class CogenticModelRoute(BaseModel):
+    """The model clients serving a call site, by name, and when to escalate to a stronger client."""
+
+    model_client: str = Field(
+        description="Name of the client reasoning at the call site"
+    )
+    json_model_client: str | None = Field(
+        default=None,
+        description="Name of the client formatting the output as JSON. Defaults to the model client",
+    )
+    escalate_to: str | None = Field(
+        default=None,
+        description="Name of a stronger client, which takes over when an escalation rule applies",
+    )
+    escalate_after_parse_failures: int | None = Field(
+        default=None,
+        description="Failed JSON attempts of a call, after which the JSON is requested from `escalate_to`",
+    )
+    escalate_after_stalls: int | None = Field(
+        default=None,
+        description="Stalls on the current hypothesis, from which `escalate_to` serves the whole call",
+    )
+
+
+class CogenticRouteStats(BaseModel):
+    """The calls made from a call site by a client."""
+
+    call_site: str
+    client: str
+    calls: int = 0
+    errors: int = 0
+    escalations: int = Field(
+        default=0, description="Calls of which (some of) the JSON was escalated"
+    )
+    latency: CogenticHistogram = Field(default_factory=CogenticHistogram)
+
+    @property
+    def mean_latency(self) -> float:
+        return self.latency.sum / self.latency.count if self.latency.count else 0.0
+
+
+class CogenticRoutedClients:
+    """The clients serving one call, resolved from a route."""
+
+    def __init__(
+        self,
+        client: str,
+        model_client: ChatCompletionClient,
+        json_model_client: ChatCompletionClient,
+        escalation_model_client: ChatCompletionClient | None = None,
+        escalate_after_parse_failures: int | None = None,
+        escalated: bool = False,
+    ):
+        self.client = client
+        self.model_client = model_client
+        self.json_model_client = json_model_client
+        self.escalation_model_client = escalation_model_client
+        self.escalate_after_parse_failures = escalate_after_parse_failures
+        self.escalated = escalated
+
+    def json_model_client_for_attempt(self, attempt: int) -> ChatCompletionClient:
+        """The client for a JSON attempt, escalating after repeated parse failures."""
+        if (
+            self.escalation_model_client is not None
+            and self.escalate_after_parse_failures is not None
+            and attempt >= self.escalate_after_parse_failures
+        ):
+            self.escalated = True
+            return self.escalation_model_client
+        return self.json_model_client
+
+
+class _RouteKey(NamedTuple):
+    call_site: str
+    client: str
+
+
+class CogenticModelRouterConfig(BaseModel):
+    """The declarative configuration for a CogenticModelRouter."""
+
+    model_clients: dict[str, ComponentModel] = Field(default_factory=dict)
+    routes: dict[CogenticCallSite, CogenticModelRoute] = Field(default_factory=dict)
+
+
+class CogenticModelRouter(
+    ComponentBase[CogenticModelRouterConfig], Component[CogenticModelRouterConfig]
+):
+    """Routes the orchestrator's call sites to model clients.
+
+    Utility work, like summarizing actions or progress checks, can run on cheaper models, while replans and
+    the final answer run on the strongest. Routes refer to clients by name: either one of `model_clients`, or
+    "model" and "json" for the team's own clients. Call sites without a route use the team's clients.
+
+    A route may escalate to a stronger client, for the JSON after repeated parse failures within a call, or
+    for the whole call while the team is stalling. The router keeps the latency of the calls of each route,
+    see `snapshot`. Share a router between teams to gather their stats.
+    """
+
+    component_type = "router"
+    component_config_schema = CogenticModelRouterConfig
+    component_provider_override = "cogentic.orchestration.routing.CogenticModelRouter"
+
+    def __init__(
+        self,
+        model_clients: Mapping[str, ChatCompletionClient] | None = None,
+        routes: Mapping[CogenticCallSite, CogenticModelRoute] | None = None,
+    ):
+        """Initialize the model router.
+
+        Args:
+            model_clients (Mapping[str, ChatCompletionClient] | None): The clients routes can refer to, by name. Defaults to None.
+            routes (Mapping[CogenticCallSite, CogenticModelRoute] | None): The route of each call site, e.g. "summarize_action" or "final_answer". Defaults to None.
+
+        Raises:
+            ValueError: If a route is given for an unknown call site, or refers to an unknown client.
+        """
+        self.model_clients = dict(model_clients or {})
+        self.routes = dict(routes or {})
+        reserved = {TEAM_MODEL_CLIENT, TEAM_JSON_MODEL_CLIENT} & set(self.model_clients)
+        if reserved:
+            raise ValueError(
+                f"Client names {sorted(reserved)} are reserved for the team's clients."
+            )
+        unknown = set(self.routes) - set(get_args(CogenticCallSite))
+        if unknown:
+            raise ValueError(
+                f"Routes were given for unknown call sites {sorted(unknown)}. The call sites are {list(get_args(CogenticCallSite))}."
+            )
+        known = {*self.model_clients, TEAM_MODEL_CLIENT, TEAM_JSON_MODEL_CLIENT}
+        for call_site, route in self.routes.items():
+            for name in (
+                route.model_client,
+                route.json_model_client,
+                route.escalate_to,
+            ):
+                if name is not None and name not in known:
+                    raise ValueError(
+                        f"The route of {call_site} refers to an unknown client {name}."
+                    )
+        self._lock = threading.Lock()
+        self._stats: dict[_RouteKey, CogenticRouteStats] = {}
+
+    def _client(
+        self,
+        name: str,
+        model_client: ChatCompletionClient,
+        json_model_client: ChatCompletionClient,
+    ) -> ChatCompletionClient:
+        if name == TEAM_MODEL_CLIENT:
+            return model_client
+        if name == TEAM_JSON_MODEL_CLIENT:
+            return json_model_client
+        return self.model_clients[name]
+
+    def resolve(
+        self,
+        route: CogenticModelRoute,
+        model_client: ChatCompletionClient,
+        json_model_client: ChatCompletionClient,
+        stalls: int = 0,
+    ) -> CogenticRoutedClients:
+        """Resolve the clients serving a call through a route.
+
+        Args:
+            route (CogenticModelRoute): The route of the call site making the call.
+            model_client (ChatCompletionClient): The team's model client.
+            json_model_client (ChatCompletionClient): The team's JSON model client.
+            stalls (int): The current number of stalls, for escalation. Defaults to 0.
+        """
+        escalation_model_client = (
+            self._client(route.escalate_to, model_client, json_model_client)
+            if route.escalate_to is not None
+            else None
+        )
+        if (
+            escalation_model_client is not None
+            and route.escalate_after_stalls is not None
+            and stalls >= route.escalate_after_stalls
+        ):
+            assert route.escalate_to is not None
+            return CogenticRoutedClients(
+                route.escalate_to,
+                escalation_model_client,
+                escalation_model_client,
+                escalated=True,
+            )
+        return CogenticRoutedClients(
+            route.model_client,
+            self._client(route.model_client, model_client, json_model_client),
+            self._client(
+                route.json_model_client or route.model_client,
+                model_client,
+                json_model_client,
+            ),
+            escalation_model_client=escalation_model_client,
+            escalate_after_parse_failures=route.escalate_after_parse_failures,
+        )
+
+    def record(
+        self,
+        call_site: str,
+        clients: CogenticRoutedClients,
+        latency: float,
+        error: bool = False,
+    ) -> None:
+        """Record a finished call of a route."""
+        with self._lock:
+            key = _RouteKey(call_site, clients.client)
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = CogenticRouteStats(call_site=call_site, client=clients.client)
+                self._stats[key] = stats
+            stats.calls += 1
+            if error:
+                stats.errors += 1
+            if clients.escalated:
+                stats.escalations += 1
+            stats.latency.observe(latency)
+
+    def snapshot(self) -> list[CogenticRouteStats]:
+        """Get a copy of the stats of each route and client."""
+        with self._lock:
+            return [
+                stats.model_copy(deep=True) for _, stats in sorted(self._stats.items())
+            ]
+
+    def reset(self) -> None:
+        """Clear the stats."""
+        with self._lock:
+            self._stats.clear()
+
+    def _to_config(self) -> CogenticModelRouterConfig:
+        return CogenticModelRouterConfig(
+            model_clients={
+                name: client.dump_component()
+                for name, client in self.model_clients.items()
+            },
+            routes={
+                call_site: route.model_copy()
+                for call_site, route in self.routes.items()
+            },
+        )
+
+    @classmethod
+    def _from_config(cls, config: CogenticModelRouterConfig) -> Self:
+        return cls(
+            model_clients={
+                name: ChatCompletionClient.load_component(client)
+                for name, client in config.model_clients.items()
+            },
+            routes=config.routes,
+        )
@@ -0,0 +1,88 @@
+import functools
+import json
+from typing import Any, Type
+
+from pydantic import BaseModel
+
+# Keys which only document the schema, or restate what the model can infer
+_STRIPPED_KEYS = {"title", "$defs", "examples"}
+
+
+def _resolve(schema: dict[str, Any], node: dict[str, Any], seen: tuple[str, ...]):
+    name = node["$ref"].rsplit("/", 1)[-1]
+    if name in seen:
+        raise ValueError(f"Can't inline the recursive model {name}.")
+    return name, schema["$defs"][name]
+
+
+def _compile(schema: dict[str, Any], node: Any, seen: tuple[str, ...] = ()) -> Any:
+    if isinstance(node, list):
+        return [_compile(schema, item, seen) for item in node]
+    if not isinstance(node, dict):
+        return node
+    if "$ref" in node:
+        name, definition = _resolve(schema, node, seen)
+        # The description of the field is more specific than the docstring of its model
+        overrides = {key: value for key, value in node.items() if key != "$ref"}
+        return _compile(schema, {**definition, **overrides}, (*seen, name))
+
+    compiled: dict[str, Any] = {}
+    for key, value in node.items():
+        if key in _STRIPPED_KEYS:
+            continue
+        if key == "discriminator":
+            # The mapping refers to the definitions, and the branches have a const of the property anyway
+            compiled[key] = {"propertyName": value["propertyName"]}
+        elif key == "properties":
+            compiled[key] = {
+                name: _compile(schema, item, seen) for name, item in value.items()
+            }
+        else:
+            compiled[key] = _compile(schema, value, seen)
+
+    # An enum or const implies its type
+    if "enum" in compiled or "const" in compiled:
+        compiled.pop("type", None)
+    # Properties without a default are required, which the format prompt tells the model
+    properties = compiled.get("properties")
+    if properties is not None and set(compiled.get("required", [])) == {
+        name for name, item in node["properties"].items() if "default" not in item
+    }:
+        compiled.pop("required", None)
+    # Optional values, e.g. {"anyOf": [{"type": "string"}, {"type": "null"}]}, become {"type": ["string", "null"]}
+    branches = compiled.get("anyOf")
+    if branches and len(branches) == 2 and {"type": "null"} in branches:
+        (branch,) = [b for b in branches if b != {"type": "null"}]
+        if isinstance(branch.get("type"), str):
+            del compiled["anyOf"]
+            compiled = {**branch, **compiled, "type": [branch["type"], "null"]}
+    return compiled
+
+
+def compile_schema(schema: dict[str, Any]) -> dict[str, Any]:
+    """Compile a JSON schema to a minimal equivalent for prompts.
+
+    References are inlined, titles (except the model's own) and types implied by enums are stripped, `required`
+    is dropped when it lists exactly the properties without a default, and optional values collapse to a list of
+    types. The schema only guides the model; responses are still validated against the full pydantic model.
+
+    Args:
+        schema (dict[str, Any]): The JSON schema, as created by `model_json_schema`.
+
+    Returns:
+        dict[str, Any]: The compiled schema.
+    """
+    compiled = _compile(schema, schema)
+    if "title" in schema:
+        compiled = {"title": schema["title"], **compiled}
+    return compiled
+
+
+@functools.lru_cache(maxsize=256)
+def response_schema(response_model: Type[BaseModel]) -> str:
+    """Get the compiled JSON schema of a response model, rendered compactly for the format prompt."""
+    return json.dumps(
+        compile_schema(response_model.model_json_schema()),
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
@@ -0,0 +1,66 @@
+import json
+import math
+from typing import Any
+
+# Outlines keep this many items of each list, and characters of each string
+OUTLINE_ITEMS = 3
+OUTLINE_STRING_LENGTH = 200
+
+
+def split_by_tokens(text: str, tokens: int, max_tokens: int) -> list[str]:
+    """Split text into chunks of up to about `max_tokens`, at line boundaries where possible.
+
+    Chunk sizes are estimated from the token count of the whole text, so it's only counted once.
+
+    Args:
+        text (str): The text to split.
+        tokens (int): The token count of the text.
+        max_tokens (int): The size of the chunks, in tokens.
+
+    Returns:
+        list[str]: The chunks, in order.
+    """
+    max_chars = max(1, math.floor(len(text) * max_tokens / max(tokens, 1)))
+    chunks: list[str] = []
+    current = ""
+    for line in text.splitlines(keepends=True):
+        if current and len(current) + len(line) > max_chars:
+            chunks.append(current)
+            current = ""
+        # Lines longer than a whole chunk are split where they are
+        while len(line) > max_chars:
+            chunks.append(line[:max_chars])
+            line = line[max_chars:]
+        current += line
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _outline(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _outline(item) for key, item in value.items()}
+    if isinstance(value, list):
+        items = [_outline(item) for item in value[:OUTLINE_ITEMS]]
+        if len(value) > OUTLINE_ITEMS:
+            items.append(f"... {len(value) - OUTLINE_ITEMS} more items")
+        return items
+    if isinstance(value, str) and len(value) > OUTLINE_STRING_LENGTH:
+        return value[:OUTLINE_STRING_LENGTH] + "..."
+    return value
+
+
+def outline_structured(text: str) -> str | None:
+    """Outline a JSON response without a model: the first items of lists, and the start of long strings.
+
+    Returns:
+        str | None: The compact JSON outline, or None if the text isn't a JSON object or array.
+    """
+    stripped = text.strip()
+    if not stripped.startswith(("{", "[")):
+        return None
+    try:
+        value = json.loads(stripped)
+    except json.JSONDecodeError:
+        return None
+    return json.dumps(_outline(value), ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,216 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Iterator, TypeVar, cast
+
+_CURRENT: ContextVar[tuple["CogenticTracer", str] | None] = ContextVar(
+    "cogentic_tracer", default=None
+)
+_NULL_CONTEXT = nullcontext()
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class CogenticSpan:
+    """A span which is ended explicitly, for work that doesn't fit in a single block (e.g. waiting on an agent)."""
+
+    __slots__ = ("_tracer", "_name", "_track", "_attributes", "_start", "_otel_span")
+
+    def __init__(
+        self,
+        tracer: "CogenticTracer",
+        name: str,
+        track: str,
+        attributes: dict[str, Any],
+        otel_span: Any = None,
+    ):
+        self._tracer = tracer
+        self._name = name
+        self._track = track
+        self._attributes = attributes
+        self._start = time.perf_counter_ns()
+        self._otel_span = otel_span
+
+    def end(self) -> None:
+        self._tracer._record(
+            self._name,
+            self._track,
+            self._start,
+            time.perf_counter_ns(),
+            self._attributes,
+        )
+        if self._otel_span is not None:
+            self._otel_span.end()
+
+
+class CogenticTracer:
+    """Collects spans for orchestrator phases, exportable as a Chrome trace (Perfetto) or to OpenTelemetry.
+
+    A disabled tracer hands out a shared no-op context, so leaving tracing off costs a method call per phase.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        use_opentelemetry: bool = False,
+        max_events: int = 100_000,
+    ):
+        """Initialize the tracer.
+
+        Args:
+            enabled (bool): Whether to record spans. Defaults to True.
+            use_opentelemetry (bool): Whether to also emit spans via OpenTelemetry. Requires `opentelemetry-api`. Defaults to False.
+            max_events (int): The maximum number of spans to keep for the Chrome trace. Older spans are dropped. Defaults to 100,000.
+        """
+        self.enabled = enabled
+        self.max_events = max_events
+        self._events: list[dict[str, Any]] = []
+        self._tracks: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._otel_tracer = None
+        if enabled and use_opentelemetry:
+            from opentelemetry import trace
+
+            self._otel_tracer = trace.get_tracer("cogentic")
+
+    def span(
+        self, name: str, track: str | None = None, **attributes: Any
+    ) -> ContextManager[None]:
+        """Trace a block of work.
+
+        Args:
+            name (str): The name of the span, e.g. the orchestrator phase.
+            track (str | None): The track (timeline) to place the span on, e.g. one per run. Defaults to the enclosing span's track.
+            **attributes: Extra attributes recorded with the span.
+        """
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._span(name, track, attributes)
+
+    @contextmanager
+    def _span(
+        self, name: str, track: str | None, attributes: dict[str, Any]
+    ) -> Iterator[None]:
+        current = _CURRENT.get()
+        if track is None:
+            track = current[1] if current else "main"
+        token = _CURRENT.set((self, track))
+        start = time.perf_counter_ns()
+        try:
+            if self._otel_tracer is not None:
+                with self._otel_tracer.start_as_current_span(
+                    name, attributes=_otel_attributes(track, attributes)
+                ):
+                    yield
+            else:
+                yield
+        finally:
+            self._record(name, track, start, time.perf_counter_ns(), attributes)
+            _CURRENT.reset(token)
+
+    def start_span(
+        self, name: str, track: str | None = None, **attributes: Any
+    ) -> CogenticSpan | None:
+        """Start a span which is ended by calling `end()` on the result. Returns None when disabled."""
+        if not self.enabled:
+            return None
+        if track is None:
+            current = _CURRENT.get()
+            track = current[1] if current else "main"
+        otel_span = None
+        if self._otel_tracer is not None:
+            otel_span = self._otel_tracer.start_span(
+                name, attributes=_otel_attributes(track, attributes)
+            )
+        return CogenticSpan(self, name, track, attributes, otel_span)
+
+    def _record(
+        self,
+        name: str,
+        track: str,
+        start_ns: int,
+        end_ns: int,
+        attributes: dict[str, Any],
+    ) -> None:
+        with self._lock:
+            tid = self._tracks.setdefault(track, len(self._tracks) + 1)
+            self._events.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": start_ns / 1000,
+                    "dur": (end_ns - start_ns) / 1000,
+                    "pid": os.getpid(),
+                    "tid": tid,
+                    "args": {k: str(v) for k, v in attributes.items()},
+                }
+            )
+            if len(self._events) > self.max_events:
+                del self._events[: len(self._events) - self.max_events]
+
+    def clear(self) -> None:
+        """Drop all recorded spans."""
+        with self._lock:
+            self._events.clear()
+            self._tracks.clear()
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Get the recorded spans in the Chrome trace event format, which Perfetto can open."""
+        with self._lock:
+            events = list(self._events)
+            tracks = dict(self._tracks)
+        pid = os.getpid()
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": track},
+            }
+            for track, tid in tracks.items()
+        ]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str | Path) -> None:
+        """Write the recorded spans to a Chrome trace json file."""
+        Path(path).write_text(json.dumps(self.to_chrome_trace()))
+
+
+def _otel_attributes(track: str, attributes: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "cogentic.track": track,
+        **{f"cogentic.{k}": str(v) for k, v in attributes.items()},
+    }
+
+
+def trace_span(name: str, **attributes: Any) -> ContextManager[None]:
+    """Trace a block of work within the current span's tracer, if there is one."""
+    current = _CURRENT.get()
+    if current is None:
+        return _NULL_CONTEXT
+    return current[0].span(name, **attributes)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Trace an async method of an object with `_tracer` and `_trace_track` attributes."""
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            if not self._tracer.enabled:
+                return await func(self, *args, **kwargs)
+            with self._tracer.span(name, track=self._trace_track):
+                return await func(self, *args, **kwargs)
+
+        return cast(F, wrapper)
+
+    return decorator
+
+
+DISABLED_TRACER = CogenticTracer(enabled=False)
@@ -0,0 +1,19 @@
+from cogentic.testing.fake_client import (
+    CogenticFakeChatCompletionClient,
+    CogenticFakeScenario,
+)
+from cogentic.testing.fake_participant import CogenticFakeParticipant
+from cogentic.testing.stub_server import (
+    CogenticStubServer,
+    CogenticStubServerConfig,
+    CogenticStubServerStats,
+)
+
+__all__ = [
+    "CogenticFakeChatCompletionClient",
+    "CogenticFakeScenario",
+    "CogenticFakeParticipant",
+    "CogenticStubServer",
+    "CogenticStubServerConfig",
+    "CogenticStubServerStats",
+]
@@ -0,0 +1,504 @@
+import asyncio
+import json
+import re
+from collections.abc import AsyncGenerator, Callable, Mapping, Sequence
+from typing import Any, Optional, Union
+
+from autogen_core import CancellationToken, Component
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    ModelFamily,
+    ModelInfo,
+    RequestUsage,
+)
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel, Field
+from typing_extensions import Self
+
+# Matches the schema embedded by the orchestrator's FORMAT_PROMPT
+_SCHEMA_HEADER = "### Response Output Schema"
+_SCHEMA_PATTERN = re.compile(r"```json\n(.*?)\n```", re.DOTALL)
+
+CogenticFakeResponse = Union[
+    Mapping[str, Any], Callable[[dict[str, Any]], Mapping[str, Any]]
+]
+
+LOREM = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua. "
+)
+
+
+class CogenticFakeScenario(BaseModel):
+    """How the fake model works through a question."""
+
+    # Size of the initial plan
+    hypotheses: int = 2
+    tests_per_hypothesis: int = 2
+    # Number of progress ledgers per test, before the test is marked complete
+    turns_per_test: int = 1
+    # Evidence gathered up front, and by every progress ledger
+    initial_evidence: int = 1
+    evidence_per_turn: int = 1
+    # Number of plan updates which add more hypotheses, before the plan is marked complete
+    replans: int = 0
+    # Mark the question as answered on this progress ledger. None means when the plan is complete.
+    answer_after_turns: int | None = None
+    # Length of generated free text (reasoning, summaries, field values) in characters
+    text_length: int = 200
+
+
+class CogenticFakeChatCompletionClientConfig(BaseModel):
+    """The declarative configuration for a CogenticFakeChatCompletionClient."""
+
+    scenario: CogenticFakeScenario = Field(default_factory=CogenticFakeScenario)
+    responses: dict[str, dict[str, Any]] = Field(default_factory=dict)
+    latency: float = 0.0
+    model_info: ModelInfo | None = None
+
+
+def _text(length: int, prefix: str = "") -> str:
+    text = prefix + LOREM * (length // len(LOREM) + 1)
+    return text[: max(length, len(prefix))]
+
+
+def _merge(base: Any, override: Any) -> Any:
+    """Deep merge `override` into `base`. Lists and scalars are replaced."""
+    if isinstance(base, dict) and isinstance(override, Mapping):
+        merged = dict(base)
+        for key, value in override.items():
+            merged[key] = _merge(base.get(key), value)
+        return merged
+    return override
+
+
+async def wait(seconds: float, cancellation_token: CancellationToken | None) -> None:
+    """Sleep like a model call would take, stopping early (with CancelledError) when cancelled."""
+    if not seconds:
+        return
+    sleep = asyncio.ensure_future(asyncio.sleep(seconds))
+    if cancellation_token is not None:
+        cancellation_token.link_future(sleep)
+    await sleep
+
+
+class _SchemaInstance:
+    """Generates an instance of a JSON schema, using the first choice wherever there is one."""
+
+    def __init__(self, schema: dict[str, Any], text_length: int):
+        self.root = schema
+        self.text_length = text_length
+        self.counter = 0
+
+    def resolve(self, node: dict[str, Any]) -> dict[str, Any]:
+        """Follow references, and pick the non-null branch of optional values."""
+        while True:
+            if "$ref" in node:
+                node = self.root["$defs"][node["$ref"].rsplit("/", 1)[-1]]
+            elif "anyOf" in node or "oneOf" in node:
+                branches = node.get("anyOf") or node["oneOf"]
+                node = next(
+                    (b for b in branches if b.get("type") != "null"), branches[0]
+                )
+            elif "allOf" in node and len(node["allOf"]) == 1:
+                node = node["allOf"][0]
+            else:
+                return node
+
+    def property(self, node: dict[str, Any], *path: str) -> dict[str, Any]:
+        """Get the (resolved) schema of a nested property."""
+        for name in path:
+            node = self.resolve(self.resolve(node)["properties"][name])
+        return self.resolve(node)
+
+    def generate(self, node: dict[str, Any], name: str = "value") -> Any:
+        node = self.resolve(node)
+        if "const" in node:
+            return node["const"]
+        if "enum" in node:
+            return node["enum"][0]
+        node_type = node.get("type")
+        if isinstance(node_type, list):
+            # Optional values of compiled schemas list their types, pick the non-null one
+            node_type = next((t for t in node_type if t != "null"), "null")
+        match node_type:
+            case "object":
+                return {
+                    key: self.generate(value, key)
+                    for key, value in node.get("properties", {}).items()
+                }
+            case "array":
+                return [
+                    self.generate(node.get("items", {}), name)
+                    for _ in range(node.get("minItems", 0))
+                ]
+            case "boolean":
+                return False
+            case "integer" | "number":
+                return node.get("minimum", 0)
+            case "null":
+                return None
+            case _:
+                # Strings are unique, so generated names don't collide
+                self.counter += 1
+                return _text(self.text_length, f"{name}-{self.counter}: ")
+
+
+class CogenticFakeChatCompletionClient(
+    ChatCompletionClient, Component[CogenticFakeChatCompletionClientConfig]
+):
+    """A scriptable offline model client, answering every Cogentic prompt with a valid response.
+
+    Reasoning requests are answered with filler text. Requests to format a response as one of the Cogentic
+    response models (the orchestrator embeds the JSON schema in its prompt) are answered with an instance of
+    that schema, following a `CogenticFakeScenario`: the plan has a fixed size, each test completes after a
+    fixed number of turns, every hypothesis is verified, and the plan is complete after a fixed number of replans.
+
+    Use the same client as the model client and the JSON model client, so it can keep track of the scenario.
+    """
+
+    component_type = "model"
+    component_config_schema = CogenticFakeChatCompletionClientConfig
+    component_provider_override = "cogentic.testing.CogenticFakeChatCompletionClient"
+
+    def __init__(
+        self,
+        scenario: CogenticFakeScenario | None = None,
+        responses: Mapping[str, CogenticFakeResponse] | None = None,
+        latency: float = 0.0,
+        model_info: ModelInfo | None = None,
+    ):
+        """Initialize the fake client.
+
+        Args:
+            scenario (CogenticFakeScenario | None): How the fake model works through the question. Defaults to CogenticFakeScenario().
+            responses (Mapping[str, CogenticFakeResponse] | None): Overrides per response model, keyed by the schema title
+                (e.g. "CogenticFinalAnswer"). Either a dict merged into the generated response, or a function taking the
+                generated response and returning the response to use. Defaults to None.
+            latency (float): Seconds every request takes. Defaults to 0.
+            model_info (ModelInfo | None): The model info to report. Defaults to a model without vision or function calling.
+        """
+        self.scenario = scenario or CogenticFakeScenario()
+        self.responses: dict[str, CogenticFakeResponse] = dict(responses or {})
+        self.latency = latency
+        self._model_info = model_info or ModelInfo(
+            vision=False,
+            function_calling=False,
+            json_output=True,
+            family=ModelFamily.UNKNOWN,
+        )
+        self.calls: list[str] = []
+        self._turns = 0
+        self._replans = 0
+        self._hypotheses = 0
+        self._actual_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        self._total_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+
+    def reset(self) -> None:
+        """Restart the scenario, and reset the usage."""
+        self.calls.clear()
+        self._turns = 0
+        self._replans = 0
+        self._hypotheses = 0
+        self._actual_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        self._total_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+
+    def _schema(
+        self, messages: Sequence[LLMMessage], extra_create_args: Mapping[str, Any]
+    ) -> dict[str, Any] | None:
+        """Find the schema the response should adhere to, if any."""
+        response_format = extra_create_args.get("response_format")
+        if isinstance(response_format, type) and issubclass(response_format, BaseModel):
+            return response_format.model_json_schema()
+        # Retries append an error message after the format prompt
+        for message in reversed(messages):
+            content = getattr(message, "content", None)
+            if isinstance(content, str) and _SCHEMA_HEADER in content:
+                match = _SCHEMA_PATTERN.search(content)
+                if match:
+                    return json.loads(match.group(1))
+        return None
+
+    def _hypothesis(self, tests: int) -> dict[str, Any]:
+        self._hypotheses += 1
+        index = self._hypotheses
+        length = self.scenario.text_length
+        return {
+            "name": f"hypothesis-{index}",
+            "hypothesis": _text(length, f"Hypothesis {index}: "),
+            "state": "unverified",
+            "completion_summary": None,
+            "tests": [
+                {
+                    "name": f"test-{index}-{j}",
+                    "description": _text(length),
+                    "goal": _text(length),
+                    "state": "incomplete",
+                    "plan": [
+                        {
+                            "name": "Fake",
+                            "action": _text(length),
+                            "rationale": _text(length),
+                        }
+                    ],
+                    "result_summary": None,
+                }
+                for j in range(1, tests + 1)
+            ],
+        }
+
+    def _reasoned(self, answer: Any) -> dict[str, Any]:
+        return {"reason": _text(self.scenario.text_length), "answer": answer}
+
+    def _next_step(self, instance: _SchemaInstance, schema: dict[str, Any]) -> dict:
+        # Rotate through the team members
+        answer = instance.property(schema, "next_speaker", "answer")
+        # A single choice is a const rather than an enum
+        speakers = answer.get("enum") or (
+            [answer["const"]] if "const" in answer else []
+        )
+        next_speaker = speakers[self._turns % len(speakers)] if speakers else "Fake"
+        return {
+            "goal": self._reasoned(_text(self.scenario.text_length)),
+            "next_speaker": self._reasoned(next_speaker),
+            "instruction_or_question": self._reasoned(_text(self.scenario.text_length)),
+        }
+
+    def _turn_outcome(self, turn: int) -> tuple[bool, bool]:
+        """Whether the question is answered, and whether the current test is complete, at a turn."""
+        scenario = self.scenario
+        answered = (
+            scenario.answer_after_turns is not None
+            and turn >= scenario.answer_after_turns
+        )
+        return answered, turn % scenario.turns_per_test == 0
+
+    def _initial_evidence(self) -> dict[str, Any]:
+        length = self.scenario.text_length
+        return {
+            "evidence": [
+                {"description": _text(length), "content": _text(length)}
+                for _ in range(self.scenario.initial_evidence)
+            ]
+        }
+
+    def _initial_hypotheses(self) -> dict[str, Any]:
+        return {
+            "hypotheses": [
+                self._hypothesis(self.scenario.tests_per_hypothesis)
+                for _ in range(self.scenario.hypotheses)
+            ]
+        }
+
+    def _scenario_response(
+        self, title: str, instance: _SchemaInstance
+    ) -> dict[str, Any] | None:
+        """The response to a Cogentic response model, following the scenario."""
+        scenario = self.scenario
+        length = scenario.text_length
+        schema = instance.root
+        if title == "CogenticInitialEvidence":
+            return self._initial_evidence()
+        if title == "CogenticInitialHypotheses":
+            return self._initial_hypotheses()
+        if title == "CogenticInitialPlan":
+            return {**self._initial_evidence(), **self._initial_hypotheses()}
+        if title.startswith("CogenticNextStep"):
+            return self._next_step(instance, schema)
+        if title == "CogenticProgressCheck":
+            # Routine turns are counted here, otherwise the full progress ledger follows and counts the turn
+            answered, test_complete = self._turn_outcome(self._turns + 1)
+            routine = not answered and not test_complete
+            if routine:
+                self._turns += 1
+            return {
+                "original_question_answered": answered,
+                "test_state": "complete" if test_complete else "incomplete",
+                "forward_progress": True,
+                "continue_with_same_speaker": routine,
+                "next_instruction": _text(length) if routine else None,
+            }
+        if title.startswith("CogenticProgressLedger"):
+            self._turns += 1
+            answered, test_complete = self._turn_outcome(self._turns)
+            return {
+                "original_question_answered": self._reasoned(answered),
+                "test_state": self._reasoned(
+                    "complete" if test_complete else "incomplete"
+                ),
+                "replan_needed": self._reasoned(False),
+                "new_test_evidence": [
+                    {
+                        "test_name": "test",
+                        "team_member_name": "Fake",
+                        "content": _text(length),
+                    }
+                    for _ in range(scenario.evidence_per_turn)
+                ],
+                "stuck_in_loop": self._reasoned(False),
+                "forward_progress": self._reasoned(True),
+                "new_issues": [],
+                "next_step": None
+                if answered
+                else self._next_step(instance, instance.property(schema, "next_step")),
+            }
+        if title == "CogenticHypothesisUpdate":
+            return {"hypothesis_state": self._reasoned("verified"), "new_tests": []}
+        if title == "CogenticHypothesisPatch":
+            return {"hypothesis_state": self._reasoned("verified"), "operations": []}
+        if title in ("CogenticPlanUpdate", "CogenticPlanPatch"):
+            if self._replans >= scenario.replans:
+                if title == "CogenticPlanUpdate":
+                    return {
+                        "plan_state": self._reasoned("completed"),
+                        "new_hypotheses": [],
+                    }
+                return {"plan_state": self._reasoned("completed"), "operations": []}
+            self._replans += 1
+            hypothesis = self._hypothesis(scenario.tests_per_hypothesis)
+            if title == "CogenticPlanUpdate":
+                return {
+                    "plan_state": self._reasoned("in_progress"),
+                    "new_hypotheses": [hypothesis],
+                }
+            return {
+                "plan_state": self._reasoned("in_progress"),
+                "operations": [
+                    {"op": "add_hypothesis", "hypothesis": hypothesis, "before": None}
+                ],
+            }
+        if title == "CogenticFinalAnswer":
+            return {
+                "result": _text(length),
+                "completed_by_team_members": True,
+                "status": "complete",
+                "failure_reason": None,
+            }
+        return None
+
+    def respond(
+        self,
+        messages: Sequence[LLMMessage],
+        extra_create_args: Mapping[str, Any] = {},
+    ) -> str:
+        """Create the content of the response to `messages`."""
+        schema = self._schema(messages, extra_create_args)
+        if schema is None:
+            self.calls.append("text")
+            return _text(self.scenario.text_length)
+
+        title = schema.get("title", "")
+        self.calls.append(title)
+        instance = _SchemaInstance(schema, self.scenario.text_length)
+        response = self._scenario_response(title, instance)
+        if response is None:
+            response = instance.generate(schema)
+        override = self.responses.get(title)
+        if callable(override):
+            response = dict(override(response))
+        elif override is not None:
+            response = _merge(response, override)
+        content = json.dumps(response)
+        if "response_format" in extra_create_args:
+            return content
+        return f"```json\n{content}\n```"
+
+    def _usage(self, messages: Sequence[LLMMessage], content: str) -> RequestUsage:
+        prompt_tokens = self.count_tokens(messages)
+        usage = RequestUsage(
+            prompt_tokens=prompt_tokens, completion_tokens=len(content) // 4
+        )
+        self._actual_usage = usage
+        self._total_usage = RequestUsage(
+            prompt_tokens=self._total_usage.prompt_tokens + usage.prompt_tokens,
+            completion_tokens=self._total_usage.completion_tokens
+            + usage.completion_tokens,
+        )
+        return usage
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        await wait(self.latency, cancellation_token)
+        content = self.respond(messages, extra_create_args)
+        return CreateResult(
+            finish_reason="stop",
+            content=content,
+            usage=self._usage(messages, content),
+            cached=False,
+        )
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        json_output: Optional[bool] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        await wait(self.latency, cancellation_token)
+        content = self.respond(messages, extra_create_args)
+        for word in re.findall(r"\S+\s*", content):
+            yield word
+        yield CreateResult(
+            finish_reason="stop",
+            content=content,
+            usage=self._usage(messages, content),
+            cached=False,
+        )
+
+    def actual_usage(self) -> RequestUsage:
+        return self._actual_usage
+
+    def total_usage(self) -> RequestUsage:
+        return self._total_usage
+
+    def count_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        # Roughly four characters per token
+        return sum(len(str(getattr(m, "content", ""))) for m in messages) // 4
+
+    def remaining_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return max(0, 128000 - self.count_tokens(messages, tools=tools))
+
+    @property
+    def capabilities(self):
+        return self._model_info
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self._model_info
+
+    def _to_config(self) -> CogenticFakeChatCompletionClientConfig:
+        responses: dict[str, dict[str, Any]] = {}
+        for title, response in self.responses.items():
+            if callable(response):
+                raise ValueError("Responses given as functions can't be serialized.")
+            responses[title] = dict(response)
+        return CogenticFakeChatCompletionClientConfig(
+            scenario=self.scenario,
+            responses=responses,
+            latency=self.latency,
+            model_info=self._model_info,
+        )
+
+    @classmethod
+    def _from_config(cls, config: CogenticFakeChatCompletionClientConfig) -> Self:
+        return cls(
+            scenario=config.scenario,
+            responses=config.responses,
+            latency=config.latency,
+            model_info=config.model_info,
+        )
@@ -0,0 +1,84 @@
+from collections.abc import Sequence
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import ChatMessage, TextMessage
+from autogen_core import CancellationToken, Component
+from pydantic import BaseModel
+from typing_extensions import Self
+
+from cogentic.testing.fake_client import LOREM, wait
+
+
+class CogenticFakeParticipantConfig(BaseModel):
+    """The declarative configuration for a CogenticFakeParticipant."""
+
+    name: str
+    description: str
+    responses: list[str]
+    latency: float = 0.0
+
+
+class CogenticFakeParticipant(BaseChatAgent, Component[CogenticFakeParticipantConfig]):
+    """An offline team member, replying to every request with canned text."""
+
+    component_config_schema = CogenticFakeParticipantConfig
+    component_provider_override = "cogentic.testing.CogenticFakeParticipant"
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "A team member who can do anything.",
+        responses: Sequence[str] | None = None,
+        response_length: int = 500,
+        latency: float = 0.0,
+    ):
+        """Initialize the fake participant.
+
+        Args:
+            name (str): The name of the participant.
+            description (str): The description of the participant. Defaults to a generic description.
+            responses (Sequence[str] | None): The replies, used in turn. Defaults to filler text.
+            response_length (int): The length of the filler text in characters. Defaults to 500.
+            latency (float): Seconds every reply takes. Defaults to 0.
+        """
+        super().__init__(name=name, description=description)
+        self.responses = (
+            list(responses)
+            if responses
+            else [(LOREM * (response_length // len(LOREM) + 1))[:response_length]]
+        )
+        self.latency = latency
+        self.turns = 0
+
+    @property
+    def produced_message_types(self) -> Sequence[type[ChatMessage]]:
+        return (TextMessage,)
+
+    async def on_messages(
+        self, messages: Sequence[ChatMessage], cancellation_token: CancellationToken
+    ) -> Response:
+        await wait(self.latency, cancellation_token)
+        content = self.responses[self.turns % len(self.responses)]
+        self.turns += 1
+        return Response(chat_message=TextMessage(content=content, source=self.name))
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        pass
+
+    def _to_config(self) -> CogenticFakeParticipantConfig:
+        return CogenticFakeParticipantConfig(
+            name=self.name,
+            description=self.description,
+            responses=self.responses,
+            latency=self.latency,
+        )
+
+    @classmethod
+    def _from_config(cls, config: CogenticFakeParticipantConfig) -> Self:
+        return cls(
+            config.name,
+            config.description,
+            responses=config.responses,
+            latency=config.latency,
+        )
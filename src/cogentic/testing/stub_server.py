@@ -0,0 +1,299 @@
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from typing import Any, Literal
+
+from autogen_core.models import LLMMessage, UserMessage
+from pydantic import BaseModel, Field
+
+from cogentic.testing.fake_client import (
+    CogenticFakeChatCompletionClient,
+    CogenticFakeScenario,
+)
+
+# Requests are attributed to a run by a marker in the task, e.g. "[run 12] What is ...?"
+RUN_MARKER = re.compile(r"\[run ([\w-]+)\]")
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 429: "Too Many Requests"}
+
+
+class CogenticStubServerConfig(BaseModel):
+    """Behaviour of the stub model server."""
+
+    # Seconds until the first token
+    latency: float = 0.0
+    # "fixed" always waits `latency`. "uniform" waits latency +- latency_spread * latency.
+    # "lognormal" has median `latency` and sigma `latency_spread`. "exponential" has mean `latency`.
+    latency_distribution: Literal["fixed", "uniform", "lognormal", "exponential"] = (
+        "fixed"
+    )
+    latency_spread: float = 0.5
+    # Completion tokens generated per second, after the first token. None means instantly.
+    tokens_per_second: float | None = None
+    # Share of requests failing with a server error, and with throttling
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    # The retry-after header of throttled requests, in seconds
+    retry_after: float = 1.0
+    # The model reported in responses, e.g. "gpt-4o-2024-08-06". None means the requested model.
+    model: str | None = None
+    scenario: CogenticFakeScenario = Field(default_factory=CogenticFakeScenario)
+    seed: int | None = None
+
+
+class CogenticStubServerStats(BaseModel):
+    """Requests served by the stub model server."""
+
+    requests: int = 0
+    streamed: int = 0
+    throttled: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+def _to_messages(messages: list[dict[str, Any]]) -> list[LLMMessage]:
+    """Convert OpenAI messages to just enough of autogen's messages for the fake client."""
+    converted: list[LLMMessage] = []
+    for message in messages:
+        content = message.get("content") or ""
+        if isinstance(content, list):
+            content = "\n".join(
+                part.get("text", "") for part in content if isinstance(part, dict)
+            )
+        converted.append(UserMessage(content=content, source=message["role"]))
+    return converted
+
+
+class CogenticStubServer:
+    """A local OpenAI compatible (chat completions only) model server, for load tests.
+
+    Responses come from a `CogenticFakeChatCompletionClient` per run, so every run works through its own
+    scenario. Runs are told apart by a "[run <id>]" marker in the task. The server adds latency, generates
+    tokens at a configured rate, and fails or throttles a share of the requests.
+    """
+
+    def __init__(self, config: CogenticStubServerConfig | None = None):
+        """Initialize the server.
+
+        Args:
+            config (CogenticStubServerConfig | None): The behaviour of the server. Defaults to CogenticStubServerConfig().
+        """
+        self.config = config or CogenticStubServerConfig()
+        self.stats = CogenticStubServerStats()
+        self._random = random.Random(self.config.seed)
+        self._runs: dict[str, CogenticFakeChatCompletionClient] = {}
+        self._server: asyncio.Server | None = None
+        self.port: int | None = None
+
+    @property
+    def endpoint(self) -> str:
+        assert self.port is not None, "The server isn't started."
+        return f"http://127.0.0.1:{self.port}"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Start serving. Port 0 picks a free port, see `port`."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self._runs.clear()
+
+    async def __aenter__(self) -> "CogenticStubServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    def _latency(self) -> float:
+        config = self.config
+        match config.latency_distribution:
+            case "uniform":
+                spread = config.latency * config.latency_spread
+                return max(0.0, self._random.uniform(-spread, spread) + config.latency)
+            case "lognormal":
+                if config.latency <= 0:
+                    return 0.0
+                return self._random.lognormvariate(0.0, config.latency_spread) * (
+                    config.latency
+                )
+            case "exponential":
+                if config.latency <= 0:
+                    return 0.0
+                return self._random.expovariate(1 / config.latency)
+            case _:
+                return config.latency
+
+    def _generation_time(self, tokens: int) -> float:
+        if not self.config.tokens_per_second:
+            return 0.0
+        return tokens / self.config.tokens_per_second
+
+    def _fake_client(
+        self, messages: list[LLMMessage]
+    ) -> CogenticFakeChatCompletionClient:
+        run = ""
+        for message in messages:
+            match = RUN_MARKER.search(str(message.content))
+            if match:
+                run = match.group(1)
+                break
+        client = self._runs.get(run)
+        if client is None:
+            client = CogenticFakeChatCompletionClient(self.config.scenario)
+            self._runs[run] = client
+        return client
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            # Connections are kept alive until the client closes them
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: dict[str, str] = {}
+                while True:
+                    line = (await reader.readline()).decode("latin-1").strip()
+                    if not line:
+                        break
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                if method != "POST" or not path.split("?")[0].endswith(
+                    "/chat/completions"
+                ):
+                    await self._respond(
+                        writer, 404, {"error": {"message": "Not found"}}
+                    )
+                    continue
+                await self._completion(writer, json.loads(body))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: dict[str, Any],
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        content = json.dumps(body).encode()
+        head = [
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'Internal Server Error')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(content)}",
+            *(f"{name}: {value}" for name, value in (headers or {}).items()),
+        ]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + content)
+        await writer.drain()
+
+    async def _completion(
+        self, writer: asyncio.StreamWriter, request: dict[str, Any]
+    ) -> None:
+        stats = self.stats
+        stats.requests += 1
+        latency = self._latency()
+        failure = self._random.random()
+        if failure < self.config.throttle_rate:
+            stats.throttled += 1
+            await self._respond(
+                writer,
+                429,
+                {"error": {"code": "429", "message": "Rate limit exceeded."}},
+                {"retry-after": f"{self.config.retry_after:g}"},
+            )
+            return
+        if failure < self.config.throttle_rate + self.config.error_rate:
+            stats.errors += 1
+            await asyncio.sleep(latency)
+            await self._respond(
+                writer, 500, {"error": {"code": "500", "message": "Server error."}}
+            )
+            return
+
+        messages = _to_messages(request.get("messages", []))
+        fake_client = self._fake_client(messages)
+        content = fake_client.respond(messages)
+        prompt_tokens = fake_client.count_tokens(messages)
+        completion_tokens = max(1, len(content) // 4)
+        stats.prompt_tokens += prompt_tokens
+        stats.completion_tokens += completion_tokens
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        completion = {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "created": int(time.time()),
+            "model": self.config.model or request.get("model", "stub"),
+        }
+
+        await asyncio.sleep(latency)
+        if not request.get("stream"):
+            await asyncio.sleep(self._generation_time(completion_tokens))
+            await self._respond(
+                writer,
+                200,
+                {
+                    **completion,
+                    "object": "chat.completion",
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": usage,
+                },
+            )
+            return
+
+        stats.streamed += 1
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+
+        async def send(data: str) -> None:
+            event = f"data: {data}\n\n".encode()
+            writer.write(f"{len(event):x}\r\n".encode() + event + b"\r\n")
+            await writer.drain()
+
+        def chunk(delta: dict[str, Any], finish_reason: str | None) -> str:
+            return json.dumps(
+                {
+                    **completion,
+                    "object": "chat.completion.chunk",
+                    "choices": [
+                        {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                    ],
+                }
+            )
+
+        # A few words per event, paced at the token rate
+        words = re.findall(r"\S+\s*", content) or [content]
+        for i in range(0, len(words), 8):
+            piece = "".join(words[i : i + 8])
+            await send(chunk({"role": "assistant", "content": piece}, None))
+            await asyncio.sleep(self._generation_time(len(piece) // 4))
+        await send(chunk({}, "stop"))
+        if (request.get("stream_options") or {}).get("include_usage"):
+            await send(json.dumps({**completion, "choices": [], "usage": usage}))
+        await send("[DONE]")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
@@ -0,0 +1,196 @@
+import asyncio
+import json
+from typing import Any, Callable
+
+import pytest
+
+from cogentic.orchestration.models.evidence import (
+    CogenticQuestionEvidence,
+    CogenticTestEvidence,
+)
+from cogentic.orchestration.models.hypothesis import CogenticHypothesis
+from cogentic.orchestration.models.plan import CogenticPlan
+from cogentic.orchestration.models.test import (
+    CogenticTest,
+    CogenticTestState,
+    CogenticTestTeamMemberPlan,
+)
+from cogentic.testing import CogenticFakeChatCompletionClient, CogenticFakeScenario
+
+# Tests of each hypothesis by name, and their states
+PlanSpec = dict[str, dict[str, CogenticTestState]]
+
+
+def _make_plan(hypotheses: PlanSpec | None = None) -> CogenticPlan:
+    if hypotheses is None:
+        hypotheses = {
+            f"h{i}": {f"Test {i}.{j}": "incomplete" for j in range(2)} for i in range(3)
+        }
+    return CogenticPlan(
+        hypotheses=[
+            CogenticHypothesis(
+                name=name,
+                # Text which needs escaping or quoting in every format
+                hypothesis=f"Hypothesis {name}: a | b – “quoted” ünïcode",
+                state="unverified",
+                completion_summary=None,
+                tests=[
+                    CogenticTest(
+                        name=test_name,
+                        description="Line one\nLine two",
+                        goal="Find the answer",
+                        state=state,
+                        plan=[
+                            CogenticTestTeamMemberPlan(
+                                name="Assistant",
+                                action="Add two integers",
+                                rationale="It has a tool for that",
+                            )
+                        ],
+                        result_summary=None,
+                    )
+                    for test_name, state in tests.items()
+                ],
+            )
+            for name, tests in hypotheses.items()
+        ],
+        evidence=[
+            CogenticQuestionEvidence(
+                description="From the question", content="33 + 22"
+            ),
+            CogenticTestEvidence(
+                test_name="Test 0.0", team_member_name="Assistant", content="55"
+            ),
+        ],
+    )
+
+
+@pytest.fixture
+def make_plan() -> Callable[[PlanSpec | None], CogenticPlan]:
+    """Create plans with the given hypotheses and tests, or three hypotheses of two tests by default."""
+    return _make_plan
+
+
+@pytest.fixture
+def plan() -> CogenticPlan:
+    """A plan of three hypotheses (h0 to h2) of two incomplete tests each ("Test 0.0" to "Test 2.1")."""
+    return _make_plan()
+
+
+class RecordingClient(CogenticFakeChatCompletionClient):
+    """Keeps the messages of every request, and the most requests made at once."""
+
+    def __init__(self, *args, delay: float = 0.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delay = delay
+        self.requests: list[list] = []
+        self.running = 0
+        self.max_running = 0
+
+    @property
+    def prompts(self) -> list[str]:
+        """The last message of every request."""
+        return [str(messages[-1].content) for messages in self.requests]
+
+    def prompts_containing(self, text: str) -> list[str]:
+        return [prompt for prompt in self.prompts if text in prompt]
+
+    async def create(self, messages, **kwargs):
+        self.requests.append(list(messages))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            return await super().create(messages, **kwargs)
+        finally:
+            self.running -= 1
+
+
+@pytest.fixture
+def recording_client() -> Callable[..., RecordingClient]:
+    """Create fake model clients which record their requests.
+
+    Takes the arguments of CogenticFakeChatCompletionClient, a one hypothesis, one test scenario by default, and
+    `delay` to keep requests running for a while.
+    """
+
+    def create(
+        scenario: CogenticFakeScenario | None = None, **kwargs: Any
+    ) -> RecordingClient:
+        return RecordingClient(
+            scenario or CogenticFakeScenario(hypotheses=1, tests_per_hypothesis=1),
+            **kwargs,
+        )
+
+    return create
+
+
+def _reasoned(answer: Any) -> dict:
+    return {"reason": "Because", "answer": answer}
+
+
+class AdderRun:
+    """The replies of the team's model clients in a scripted run, where Adder adds 33 and 22 to answer 55."""
+
+    task = "What is 33 + 22?"
+    test = {
+        "name": "add",
+        "description": "Add the numbers",
+        "goal": "Find the sum",
+        "state": "incomplete",
+        "plan": [{"name": "Adder", "action": "Add", "rationale": "Has a tool"}],
+        "result_summary": None,
+    }
+    hypothesis = {
+        "name": "sum",
+        "hypothesis": "The sum can be computed",
+        "state": "unverified",
+        "completion_summary": None,
+        "tests": [test],
+    }
+    next_step = {
+        "goal": _reasoned("Add"),
+        "next_speaker": _reasoned("Adder"),
+        "instruction_or_question": _reasoned("Add 33 and 22"),
+    }
+    ledger = {
+        "original_question_answered": _reasoned(True),
+        "test_state": _reasoned("complete"),
+        "replan_needed": _reasoned(False),
+        "new_test_evidence": [],
+        "stuck_in_loop": _reasoned(False),
+        "forward_progress": _reasoned(True),
+        "new_issues": [],
+        "next_step": None,
+    }
+    final_answer = {
+        "result": "55",
+        "completed_by_team_members": True,
+        "status": "complete",
+        "failure_reason": None,
+    }
+
+    @staticmethod
+    def json(content: dict) -> str:
+        """A reply of the JSON model client."""
+        return f"```json\n{json.dumps(content)}\n```"
+
+    def model_responses(self, final_answer: str = "Final answer") -> list[str]:
+        """The replies of the team's model client, reasoning at each step."""
+        return ["Evidence and hypotheses", "Next step", "Ledger", final_answer]
+
+    def json_responses(self) -> list[str]:
+        """The replies of the team's JSON model client, including the summary of Adder's response."""
+        return [
+            self.json({"evidence": [], "hypotheses": [self.hypothesis]}),
+            self.json(self.next_step),
+            "Added the numbers",
+            self.json(self.ledger),
+            self.json(self.final_answer),
+        ]
+
+
+@pytest.fixture
+def adder_run() -> AdderRun:
+    return AdderRun()
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+from autogen_core.models import UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from cogentic.llm import (
+    CogenticBalancedChatCompletionClient,
+    CogenticClientPool,
+    CogenticModelRegistry,
+    ModelDeployment,
+    ModelDetails,
+    get_model_client,
+)
+
+MESSAGES = [UserMessage(content="Hi", source="user")]
+
+
+class ThrottledError(Exception):
+    status_code = 429
+
+
+class BadRequestError(Exception):
+    status_code = 400
+
+
+class FakeDeployment(ReplayChatCompletionClient):
+    def __init__(self, error: Exception | None = None, delay: float = 0.0):
+        super().__init__(["Hello"] * 100)
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+
+    async def create(self, *args, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return await super().create(*args, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_fails_over_and_ejects_throttled_deployments():
+    throttled = FakeDeployment(ThrottledError())
+    healthy = FakeDeployment()
+    client = CogenticBalancedChatCompletionClient(
+        [("throttled", throttled), ("healthy", healthy)], cooldown=60
+    )
+
+    for _ in range(4):
+        result = await client.create(MESSAGES)
+        assert result.content == "Hello"
+
+    # Ejected after the first failure
+    assert throttled.calls == 1
+    assert healthy.calls == 4
+    throttled_state, healthy_state = client.snapshot()
+    assert throttled_state.failures == 1
+    assert throttled_state.ejected_until > 0
+    assert healthy_state.ewma_latency is not None
+
+
+@pytest.mark.asyncio
+async def test_request_errors_are_not_retried():
+    first = FakeDeployment(BadRequestError())
+    second = FakeDeployment(BadRequestError())
+    client = CogenticBalancedChatCompletionClient(
+        [("first", first), ("second", second)]
+    )
+
+    with pytest.raises(BadRequestError):
+        await client.create(MESSAGES)
+    assert first.calls + second.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_least_outstanding_spreads_concurrent_requests():
+    deployments = [FakeDeployment(delay=0.05) for _ in range(3)]
+    client = CogenticBalancedChatCompletionClient(
+        [(f"deployment-{i}", d) for i, d in enumerate(deployments)]
+    )
+
+    await asyncio.gather(*(client.create(MESSAGES) for _ in range(9)))
+
+    assert [d.calls for d in deployments] == [3, 3, 3]
+
+
+@pytest.mark.asyncio
+async def test_registry_replicas_share_a_balanced_client():
+    registry = CogenticModelRegistry(
+        [
+            ModelDetails(
+                name="gpt-4o",
+                info={
+                    "family": "gpt-4o",
+                    "function_calling": True,
+                    "json_output": True,
+                    "vision": True,
+                },
+                endpoint="https://east.example.com",
+                api_key="key",
+                replicas=[
+                    ModelDeployment(endpoint="https://west.example.com", api_key="key")
+                ],
+            )
+        ]
+    )
+    pool = CogenticClientPool()
+
+    first = get_model_client("gpt-4o", registry=registry, pool=pool)
+    second = get_model_client("gpt-4o", registry=registry, pool=pool)
+
+    assert isinstance(first.model_client, CogenticBalancedChatCompletionClient)
+    assert first.model_client is second.model_client
+    assert [state.name for state in first.model_client.snapshot()] == [
+        "gpt-4o@east.example.com",
+        "gpt-4o@west.example.com",
+    ]
+    assert len(pool) == 2
+    await pool.close()
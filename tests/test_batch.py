@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+from cogentic import CogenticBatchRunner, CogenticGroupChat
+from cogentic.testing import (
+    CogenticFakeChatCompletionClient,
+    CogenticFakeParticipant,
+    CogenticFakeScenario,
+)
+
+SCENARIO = CogenticFakeScenario(hypotheses=1, tests_per_hypothesis=1)
+
+
+class TeamFactory:
+    def __init__(self, participant_latency: float = 0.0, **client_kwargs):
+        self.participant_latency = participant_latency
+        self.client_kwargs = client_kwargs
+        self.teams = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def __call__(self) -> CogenticGroupChat:
+        self.teams += 1
+        factory = self
+
+        class CountingParticipant(CogenticFakeParticipant):
+            async def on_messages(self, messages, cancellation_token):
+                factory.in_flight += 1
+                factory.max_in_flight = max(factory.max_in_flight, factory.in_flight)
+                try:
+                    return await super().on_messages(messages, cancellation_token)
+                finally:
+                    factory.in_flight -= 1
+
+        return CogenticGroupChat(
+            participants=[
+                CountingParticipant("Alice", latency=self.participant_latency)
+            ],
+            model_client=CogenticFakeChatCompletionClient(
+                SCENARIO, **self.client_kwargs
+            ),
+        )
+
+
+@pytest.mark.asyncio
+async def test_batch_reuses_teams_within_the_concurrency_limit():
+    factory = TeamFactory(participant_latency=0.01)
+    runner = CogenticBatchRunner(factory, concurrency=3)
+
+    results = [
+        result async for result in runner.run(f"Question {i}" for i in range(10))
+    ]
+
+    assert sorted(result.index for result in results) == list(range(10))
+    assert all(result.succeeded and result.attempts == 1 for result in results)
+    assert all(result.usage.completion_tokens > 0 for result in results)
+    assert len({result.session_id for result in results}) == 10
+    assert factory.teams == 3
+    assert factory.max_in_flight == 3
+    metrics = runner.metrics
+    assert metrics.submitted == metrics.succeeded == metrics.completed == 10
+    assert metrics.failed == metrics.retries == metrics.in_flight == 0
+    assert metrics.completion_tokens == sum(
+        result.usage.completion_tokens for result in results
+    )
+    assert metrics.latency(50) <= metrics.latency(99)
+    assert metrics.summary()["throughput"] > 0
+
+
+@pytest.mark.asyncio
+async def test_batch_accepts_async_iterables_and_keeps_order():
+    async def questions():
+        for i in range(4):
+            await asyncio.sleep(0)
+            yield f"Question {i}"
+
+    runner = CogenticBatchRunner(TeamFactory(), concurrency=2)
+
+    results = await runner.run_all(questions())
+
+    assert [result.task for result in results] == [f"Question {i}" for i in range(4)]
+
+
+@pytest.mark.asyncio
+async def test_failed_tasks_are_retried_on_a_new_team():
+    # Every attempt fails to produce valid initial evidence
+    factory = TeamFactory(responses={"CogenticInitialPlan": lambda _: {}})
+    runner = CogenticBatchRunner(factory, concurrency=1, retries=1, retry_backoff=0)
+
+    (result,) = await runner.run_all(["Question"])
+
+    assert not result.succeeded
+    assert result.attempts == 2
+    assert "Failed to get a valid response" in (result.error or "")
+    assert factory.teams == 2
+    assert runner.metrics.failed == runner.metrics.retries == 1
+
+
+@pytest.mark.asyncio
+async def test_tasks_time_out():
+    factory = TeamFactory(participant_latency=5)
+    runner = CogenticBatchRunner(
+        factory, concurrency=2, timeout=0.2, retries=1, retry_backoff=0
+    )
+
+    results = await runner.run_all(["First", "Second"])
+
+    assert all(not result.succeeded for result in results)
+    assert all("0.2 seconds" in (result.error or "") for result in results)
+    assert runner.metrics.timeouts == 4
+    assert runner.metrics.elapsed < 2
+
+
+@pytest.mark.asyncio
+async def test_closing_the_stream_cancels_running_tasks():
+    factory = TeamFactory(participant_latency=5)
+    runner = CogenticBatchRunner(factory, concurrency=2)
+
+    stream = runner.run(["First", "Second"])
+    with pytest.raises(TimeoutError):
+        async with asyncio.timeout(0.2):
+            await anext(stream)
+    await stream.aclose()
+
+    assert runner.metrics.in_flight == 0
+    assert runner.metrics.completed == 0
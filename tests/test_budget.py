@@ -0,0 +1,65 @@
+import pytest
+from autogen_agentchat.agents import AssistantAgent
+from autogen_core.models import RequestUsage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from cogentic import CogenticGroupChat
+from cogentic.orchestration.models.budget import CogenticBudget, CogenticUsage
+
+
+def test_budget_limits():
+    budget = CogenticBudget(
+        max_tokens_per_test=100,
+        max_cost_total=1.0,
+        prompt_cost_per_1k_tokens=2.0,
+        completion_cost_per_1k_tokens=10.0,
+    )
+    usage = CogenticUsage()
+    usage.add(RequestUsage(prompt_tokens=90, completion_tokens=9))
+    assert not budget.test_exceeded(usage)
+    assert not budget.total_exceeded(usage)
+    assert not budget.hypothesis_exceeded(usage)
+
+    usage.add(RequestUsage(prompt_tokens=100, completion_tokens=70))
+    assert budget.cost(usage) == pytest.approx(1.17)
+    assert budget.test_exceeded(usage)
+    assert budget.total_exceeded(usage)
+
+
+@pytest.mark.asyncio
+async def test_run_budget_prepares_final_answer(adder_run):
+    model_client = ReplayChatCompletionClient(
+        ["Evidence and hypotheses", "Final answer"]
+    )
+    json_model_client = ReplayChatCompletionClient(
+        [
+            adder_run.json({"evidence": [], "hypotheses": [adder_run.hypothesis]}),
+            adder_run.json(
+                {
+                    "result": "Unknown",
+                    "completed_by_team_members": False,
+                    "status": "incomplete",
+                    "failure_reason": "Out of budget",
+                }
+            ),
+        ]
+    )
+    adder = AssistantAgent("Adder", model_client=ReplayChatCompletionClient(["55"]))
+
+    team = CogenticGroupChat(
+        participants=[adder],
+        model_client=model_client,
+        json_model_client=json_model_client,
+        budget=CogenticBudget(max_tokens_total=1),
+    )
+    result = await team.run(task=adder_run.task)
+
+    assert result.stop_reason is not None
+    assert result.stop_reason.startswith("Token budget reached")
+    state = await team.save_state()
+    orchestrator_state = next(
+        agent_state
+        for name, agent_state in state["agent_states"].items()
+        if name.startswith("group_chat_manager")
+    )
+    assert orchestrator_state["usage"]["prompt_tokens"] > 0
@@ -0,0 +1,58 @@
+from typing import Any
+
+import pytest
+from autogen_core.models import UserMessage
+from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from cogentic.llm.pool import CogenticClientPool, credential_key
+from cogentic.observability import CogenticChatCompletionClient
+
+
+@pytest.mark.asyncio
+async def test_pool_shares_clients_and_connections():
+    pool = CogenticClientPool(max_connections=8, keepalive_expiry=5.0)
+    http_clients = []
+
+    def create(http_client):
+        http_clients.append(http_client)
+        # http_client isn't in the client's typed config, but is passed on to the AsyncAzureOpenAI client
+        client_args: dict[str, Any] = {"http_client": http_client}
+        return AzureOpenAIChatCompletionClient(
+            model="gpt-4o",
+            azure_endpoint="https://example.openai.azure.com",
+            api_version="2024-12-01-preview",
+            api_key="secret",
+            **client_args,
+        )
+
+    key = ("gpt-4o", "https://example.openai.azure.com", credential_key("secret"))
+    first = pool.get_or_create(key, create)
+    second = pool.get_or_create(key, create)
+    other = pool.get_or_create((*key[:2], credential_key("other")), create)
+
+    assert first is second
+    assert first is not other
+    assert len(pool) == 2
+    assert "secret" not in str(key)
+    assert first._client._client is http_clients[0]  # type: ignore[attr-defined]
+
+    await pool.close()
+    assert len(pool) == 0
+    assert all(http_client.is_closed for http_client in http_clients)
+
+
+@pytest.mark.asyncio
+async def test_views_track_their_own_usage():
+    shared = ReplayChatCompletionClient(["One", "Two", "Three"])
+    first = CogenticChatCompletionClient(shared, name="shared", session_id="first")
+    second = CogenticChatCompletionClient(shared, name="shared", session_id="second")
+
+    await first.create([UserMessage(content="Hi", source="user")])
+    await first.create([UserMessage(content="Hi", source="user")])
+    await second.create([UserMessage(content="Hi", source="user")])
+
+    assert first.total_usage().prompt_tokens == 2 * second.total_usage().prompt_tokens
+    assert shared.total_usage().prompt_tokens == (
+        first.total_usage().prompt_tokens + second.total_usage().prompt_tokens
+    )
@@ -0,0 +1,134 @@
+import socket
+
+import pytest
+from autogen_agentchat.messages import (
+    MultiModalMessage,
+    TextMessage,
+    ToolCallRequestEvent,
+)
+from autogen_core import FunctionCall, Image, SingleThreadedAgentRuntime
+from autogen_core._serialization import JSON_DATA_CONTENT_TYPE, SerializationRegistry
+
+from cogentic import CogenticGroupChat
+from cogentic.distributed import (
+    CogenticParticipantRequest,
+    CogenticParticipantResponse,
+    CogenticRemoteParticipant,
+    participant_message_serializers,
+    register_participant,
+)
+from cogentic.testing import (
+    CogenticFakeChatCompletionClient,
+    CogenticFakeParticipant,
+    CogenticFakeScenario,
+)
+
+SCENARIO = CogenticFakeScenario(hypotheses=1, tests_per_hypothesis=2)
+
+
+def make_alice() -> CogenticFakeParticipant:
+    return CogenticFakeParticipant("Alice", responses=["Alice was here."])
+
+
+def _round_trip(message):
+    registry = SerializationRegistry()
+    registry.add_serializer(participant_message_serializers())
+    type_name = registry.type_name(message)
+    data = registry.serialize(
+        message, type_name=type_name, data_content_type=JSON_DATA_CONTENT_TYPE
+    )
+    return registry.deserialize(
+        data, type_name=type_name, data_content_type=JSON_DATA_CONTENT_TYPE
+    )
+
+
+def test_participant_messages_serialize():
+    request = CogenticParticipantRequest(
+        messages=[
+            TextMessage(content="Hello", source="user"),
+            MultiModalMessage(
+                content=["Look", Image.from_base64(_PIXEL)], source="orchestrator"
+            ),
+        ]
+    )
+    response = CogenticParticipantResponse(
+        chat_message=TextMessage(content="Done", source="Alice"),
+        inner_messages=[
+            ToolCallRequestEvent(
+                content=[FunctionCall(id="1", arguments="{}", name="search")],
+                source="Alice",
+            )
+        ],
+    )
+
+    loaded_request = _round_trip(request)
+    loaded_response = _round_trip(response)
+
+    assert loaded_request.model_dump() == request.model_dump()
+    assert isinstance(loaded_request.messages[1], MultiModalMessage)
+    assert isinstance(loaded_request.messages[1].content[1], Image)
+    assert loaded_response.model_dump() == response.model_dump()
+    assert isinstance(loaded_response.inner_messages[0], ToolCallRequestEvent)
+
+
+@pytest.mark.asyncio
+async def test_team_runs_with_participants_on_another_runtime():
+    workers = SingleThreadedAgentRuntime()
+    for worker in range(2):
+        await register_participant(workers, "Alice", make_alice, worker)
+    workers.start()
+    team = CogenticGroupChat(
+        participants=[
+            CogenticRemoteParticipant(
+                "Alice", "A team member who can do anything.", workers, workers=2
+            )
+        ],
+        model_client=CogenticFakeChatCompletionClient(SCENARIO),
+    )
+
+    result = await team.run(task="What is the answer?")
+    await team.reset()
+    await workers.stop_when_idle()
+
+    assert result.stop_reason and result.stop_reason.startswith("No work remaining")
+    assert [
+        message.content for message in result.messages if message.source == "Alice"
+    ] == ["Alice was here."] * 2
+
+
+@pytest.mark.asyncio
+async def test_team_runs_with_participants_on_grpc_workers():
+    pytest.importorskip("grpc")
+    from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntimeHost
+
+    from cogentic.distributed import connect, serve_participant
+
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        address = f"localhost:{s.getsockname()[1]}"
+    host = GrpcWorkerAgentRuntimeHost(address=address)
+    host.start()
+    worker = await serve_participant(address, "Alice", make_alice)
+    runtime = await connect(address)
+    team = CogenticGroupChat(
+        participants=[
+            CogenticRemoteParticipant(
+                "Alice", "A team member who can do anything.", runtime
+            )
+        ],
+        model_client=CogenticFakeChatCompletionClient(SCENARIO),
+    )
+
+    try:
+        result = await team.run(task="What is the answer?")
+    finally:
+        await runtime.stop()
+        await worker.stop()
+        await host.stop()
+
+    assert result.stop_reason and result.stop_reason.startswith("No work remaining")
+    assert any(message.source == "Alice" for message in result.messages)
+
+
+# A 1x1 transparent PNG
+_PIXEL = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
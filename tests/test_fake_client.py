@@ -0,0 +1,223 @@
+import json
+
+import pytest
+from autogen_core.models import UserMessage
+
+from cogentic import CogenticGroupChat
+from cogentic.orchestration.model_output import FORMAT_PROMPT
+from cogentic.orchestration.models.evidence import CogenticInitialEvidence
+from cogentic.orchestration.models.hypothesis import CogenticInitialHypotheses
+from cogentic.orchestration.models.ledger import (
+    CogenticProgressCheck,
+    CogenticProgressLedger,
+)
+from cogentic.orchestration.models.orchestration import (
+    CogenticFinalAnswer,
+    CogenticHypothesisPatch,
+    CogenticHypothesisUpdate,
+    CogenticInitialPlan,
+    CogenticNextStep,
+    CogenticPlanPatch,
+    CogenticPlanUpdate,
+)
+from cogentic.orchestration.models.plan import CogenticPlan
+from cogentic.testing import (
+    CogenticFakeChatCompletionClient,
+    CogenticFakeParticipant,
+    CogenticFakeScenario,
+)
+
+
+def _format_prompt(response_model) -> list[UserMessage]:
+    return [
+        UserMessage(
+            content=FORMAT_PROMPT.format(
+                response_schema=json.dumps(response_model.model_json_schema())
+            ),
+            source="user",
+        )
+    ]
+
+
+def _parse(response_model, content: str, **context):
+    assert content.startswith("```json\n")
+    return response_model.model_validate_json(
+        content.removeprefix("```json\n").removesuffix("\n```"), context=context
+    )
+
+
+@pytest.mark.parametrize(
+    "response_model",
+    [
+        CogenticInitialEvidence,
+        CogenticInitialHypotheses,
+        CogenticInitialPlan,
+        CogenticNextStep.with_speaker_choices(["Alice", "Bob"]),
+        CogenticProgressCheck,
+        CogenticProgressLedger.with_speakers(["Alice", "Bob"]),
+        CogenticHypothesisUpdate,
+        CogenticHypothesisPatch,
+        CogenticPlanUpdate,
+        CogenticPlanPatch,
+        CogenticFinalAnswer,
+    ],
+)
+def test_responses_adhere_to_the_schema(response_model):
+    client = CogenticFakeChatCompletionClient(CogenticFakeScenario(replans=1))
+    plan = CogenticPlan(hypotheses=[])
+
+    response = _parse(
+        response_model,
+        client.respond(_format_prompt(response_model)),
+        plan=plan,
+    )
+
+    assert isinstance(response, response_model)
+
+
+def test_unknown_schemas_get_a_generated_instance():
+    client = CogenticFakeChatCompletionClient()
+    content = client.respond([], {"response_format": CogenticPlan})
+
+    plan = CogenticPlan.model_validate_json(content)
+    assert plan.state == "in_progress"
+
+
+def test_responses_can_be_scripted():
+    client = CogenticFakeChatCompletionClient(
+        responses={
+            "CogenticFinalAnswer": {"result": "55"},
+            "CogenticInitialEvidence": lambda response: {
+                "evidence": response["evidence"] * 3
+            },
+        }
+    )
+
+    answer = _parse(
+        CogenticFinalAnswer, client.respond(_format_prompt(CogenticFinalAnswer))
+    )
+    evidence = _parse(
+        CogenticInitialEvidence,
+        client.respond(_format_prompt(CogenticInitialEvidence)),
+    )
+
+    assert answer.result == "55"
+    assert answer.status == "complete"
+    assert len(evidence.evidence) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_plan_patches", [False, True])
+async def test_fake_team_completes_the_scenario(use_plan_patches):
+    client = CogenticFakeChatCompletionClient(
+        CogenticFakeScenario(
+            hypotheses=2, tests_per_hypothesis=2, turns_per_test=2, replans=1
+        )
+    )
+    alice = CogenticFakeParticipant("Alice", responses=["Done"])
+    bob = CogenticFakeParticipant("Bob")
+    team = CogenticGroupChat(
+        participants=[alice, bob],
+        model_client=client,
+        use_plan_patches=use_plan_patches,
+    )
+
+    result = await team.run(task="What is the answer?")
+
+    assert result.stop_reason is not None
+    assert result.stop_reason.startswith("No work remaining")
+    # 3 hypotheses (one added by the replan), 2 tests each, 2 turns per test
+    assert client.calls.count("CogenticProgressLedgerWithSpeakers") == 12
+    assert client.calls[-1] == "CogenticFinalAnswer"
+    # Each ledger rotates to the next speaker
+    assert alice.turns and bob.turns
+    assert not any(
+        "Failed to get a valid response" in str(m.content) for m in result.messages
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "use_two_stage_planning, planning_calls",
+    [
+        (False, ["CogenticInitialPlan"]),
+        (True, ["CogenticInitialEvidence", "CogenticInitialHypotheses"]),
+    ],
+)
+async def test_planning_takes_one_or_two_calls(use_two_stage_planning, planning_calls):
+    client = CogenticFakeChatCompletionClient(
+        CogenticFakeScenario(hypotheses=2, tests_per_hypothesis=1)
+    )
+    team = CogenticGroupChat(
+        participants=[CogenticFakeParticipant("Alice")],
+        model_client=client,
+        use_two_stage_planning=use_two_stage_planning,
+    )
+
+    result = await team.run(task="What is the answer?")
+
+    assert result.stop_reason and result.stop_reason.startswith("No work remaining")
+    first_step = client.calls.index("CogenticNextStepWithSpeakerChoices")
+    assert [call for call in client.calls[:first_step] if call != "text"] == (
+        planning_calls
+    )
+    assert client.calls.count("CogenticProgressLedgerWithSpeakers") == 2
+
+
+@pytest.mark.asyncio
+async def test_tiered_ledger_skips_the_full_ledger_on_routine_turns():
+    client = CogenticFakeChatCompletionClient(
+        CogenticFakeScenario(hypotheses=2, tests_per_hypothesis=2, turns_per_test=3)
+    )
+    alice = CogenticFakeParticipant("Alice")
+    team = CogenticGroupChat(
+        participants=[alice], model_client=client, use_tiered_ledger=True
+    )
+
+    result = await team.run(task="What is the answer?")
+
+    assert result.stop_reason and result.stop_reason.startswith("No work remaining")
+    # 4 tests of 3 turns: two routine turns each, then the test completes
+    assert client.calls.count("CogenticProgressCheck") == 12
+    assert client.calls.count("CogenticProgressLedgerWithSpeakers") == 4
+    assert alice.turns == 12
+
+
+@pytest.mark.asyncio
+async def test_progress_checks_use_their_own_model_client():
+    client = CogenticFakeChatCompletionClient(
+        CogenticFakeScenario(hypotheses=1, tests_per_hypothesis=2, turns_per_test=2)
+    )
+    # Completing a test every turn, so every check escalates to the full ledger
+    check_client = CogenticFakeChatCompletionClient(
+        CogenticFakeScenario(turns_per_test=1)
+    )
+    team = CogenticGroupChat(
+        participants=[CogenticFakeParticipant("Alice")],
+        model_client=client,
+        use_tiered_ledger=True,
+        progress_check_model_client=check_client,
+    )
+
+    result = await team.run(task="What is the answer?")
+
+    assert result.stop_reason and result.stop_reason.startswith("No work remaining")
+    assert client.calls.count("CogenticProgressLedgerWithSpeakers") == 4
+    assert check_client.calls.count("CogenticProgressCheck") == 4
+    assert "CogenticProgressCheck" not in client.calls
+
+
+@pytest.mark.asyncio
+async def test_fake_team_answers_early():
+    client = CogenticFakeChatCompletionClient(
+        CogenticFakeScenario(answer_after_turns=1)
+    )
+    team = CogenticGroupChat(
+        participants=[CogenticFakeParticipant("Alice")], model_client=client
+    )
+
+    result = await team.run(task="What is the answer?")
+
+    assert client.calls.count("CogenticProgressLedgerWithSpeakers") == 1
+    assert client.calls[-1] == "CogenticFinalAnswer"
+    assert result.stop_reason
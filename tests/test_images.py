@@ -0,0 +1,167 @@
+from typing import Sequence
+
+import pytest
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import ChatMessage, MultiModalMessage
+from autogen_core import CancellationToken, ComponentModel, Image
+from autogen_core.models import ModelFamily, ModelInfo, UserMessage
+from PIL import Image as PILImage
+
+from cogentic import CogenticGroupChat
+from cogentic.orchestration import CogenticImageOptions, CogenticImageStore
+from cogentic.orchestration.images import image_key
+from cogentic.testing import (
+    CogenticFakeChatCompletionClient,
+    CogenticFakeParticipant,
+    CogenticFakeScenario,
+)
+
+VISION = ModelInfo(
+    vision=True, function_calling=False, json_output=True, family=ModelFamily.UNKNOWN
+)
+
+
+def _image(shade: int, size: tuple[int, int] = (2048, 1024)) -> Image:
+    return Image.from_pil(PILImage.new("RGB", size, (shade, 0, 0)))
+
+
+class ScreenshotParticipant(CogenticFakeParticipant):
+    """Replies with a new screenshot every turn."""
+
+    @property
+    def produced_message_types(self) -> Sequence[type[ChatMessage]]:
+        return (MultiModalMessage,)
+
+    async def on_messages(
+        self, messages: Sequence[ChatMessage], cancellation_token: CancellationToken
+    ) -> Response:
+        self.turns += 1
+        return Response(
+            chat_message=MultiModalMessage(
+                content=[f"Screenshot {self.turns}", _image(self.turns * 40)],
+                source=self.name,
+            )
+        )
+
+
+def _images(messages) -> list[Image]:
+    return [
+        item
+        for message in messages
+        if isinstance(message, UserMessage) and isinstance(message.content, list)
+        for item in message.content
+        if isinstance(item, Image)
+    ]
+
+
+def _is_caption_request(messages) -> bool:
+    return len(messages) == 1 and len(_images(messages)) == 1
+
+
+def test_images_are_downscaled_and_stored_once():
+    store = CogenticImageStore(CogenticImageOptions(max_size=512))
+    message = MultiModalMessage(content=["Look", _image(10), _image(10)], source="Bob")
+
+    stored, new_keys = store.ingest_message(message)
+
+    assert len(store) == 1 and len(new_keys) == 1
+    assert stored.content == [
+        "Look",
+        f"<image:{new_keys[0]}>",
+        f"<image:{new_keys[0]}>",
+    ]
+    assert store.image(new_keys[0]).image.size == (512, 256)
+    assert store.caption(new_keys[0]) == "[Image from Bob, 512x256]"
+    # The original message keeps its image
+    assert isinstance(message.content[1], Image)
+
+
+def test_only_recent_images_are_resolved():
+    store = CogenticImageStore(CogenticImageOptions(recent_images=1))
+    thread = [
+        store.ingest_message(
+            MultiModalMessage(content=[_image(shade, (8, 8))], source="Bob")
+        )[0]
+        for shade in (10, 20)
+    ]
+    old_key, new_key = (image_key(message.content[0]) for message in thread)
+    assert new_key is not None
+    store.set_caption(new_key, "A red square")
+
+    recent = store.recent_keys(thread)
+    resolved = [store.resolve(message.content, recent) for message in thread]
+
+    assert recent == {new_key} and old_key != new_key
+    assert isinstance(resolved[1][0], Image)
+    assert resolved[0][0] == "[Image from Bob, 8x8]"
+    # Without vision, recent images become their captions too
+    replaced = store.replace_images([UserMessage(content=resolved[1], source="Bob")])
+    assert replaced[0].content == "[Image from Bob: A red square]"
+
+
+@pytest.mark.asyncio
+async def test_vision_models_get_recent_images_and_captions_of_older_ones(
+    recording_client,
+):
+    client = recording_client(
+        CogenticFakeScenario(hypotheses=1, tests_per_hypothesis=3), model_info=VISION
+    )
+    team = CogenticGroupChat(
+        participants=[ScreenshotParticipant("Alice")],
+        model_client=client,
+        image_options=CogenticImageOptions(recent_images=1, max_size=256),
+    )
+
+    result = await team.run(task="What is the answer?")
+
+    assert result.stop_reason and result.stop_reason.startswith("No work remaining")
+    caption_requests = [m for m in client.requests if _is_caption_request(m)]
+    assert len(caption_requests) == 3
+    assert _images(caption_requests[0])[0].image.size == (256, 128)
+    # Requests working from the thread after the last screenshot
+    requests = [
+        m
+        for m in client.requests
+        if any(
+            isinstance(message.content, list) and "Screenshot 3" in message.content
+            for message in m
+        )
+    ]
+    assert requests
+    for messages in requests:
+        assert len(_images(messages)) == 1
+        assert str(messages).count("[Image from Alice: ") == 2
+
+
+@pytest.mark.asyncio
+async def test_models_without_vision_get_descriptions(recording_client):
+    client = recording_client(
+        CogenticFakeScenario(hypotheses=1, tests_per_hypothesis=2)
+    )
+    team = CogenticGroupChat(
+        participants=[ScreenshotParticipant("Alice")],
+        model_client=client,
+        image_options=CogenticImageOptions(max_size=64),
+    )
+
+    result = await team.run(task="What is the answer?")
+
+    assert result.stop_reason and result.stop_reason.startswith("No work remaining")
+    assert not any(_images(messages) for messages in client.requests)
+    assert any("[Image from Alice, 64x32]" in str(m) for m in client.requests)
+
+
+def test_image_options_round_trip_in_the_team_config():
+    team = CogenticGroupChat(
+        participants=[CogenticFakeParticipant("Alice")],
+        model_client=CogenticFakeChatCompletionClient(),
+        image_options=CogenticImageOptions(recent_images=3, format="PNG"),
+    )
+    config = team.dump_component()
+
+    loaded = CogenticGroupChat.load_component(
+        ComponentModel.model_validate_json(config.model_dump_json())
+    )
+
+    assert loaded.dump_component() == config
+    assert loaded._image_options == CogenticImageOptions(recent_images=3, format="PNG")
@@ -0,0 +1,62 @@
+import importlib
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "cogentic",
+        "cogentic.llm",
+        "cogentic.llm.api",
+        "cogentic.llm.entra",
+        "cogentic.observability",
+    ],
+)
+def test_imports_are_side_effect_free(module):
+    code = (
+        f"import sys, os; import {module}; "
+        "print(' '.join(m for m in ('autogen_agentchat', 'openai', 'azure.identity', 'dotenv', 'langfuse') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={"PATH": "", "PYTHONPATH": ":".join(sys.path)},
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_registry_is_configured_from_the_environment(monkeypatch):
+    from cogentic.llm import CogenticModelRegistry
+
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com")
+    monkeypatch.delenv("AZURE_OPENAI_API_KEY", raising=False)
+    monkeypatch.delenv("AZURE_R1_ENDPOINT", raising=False)
+    registry = CogenticModelRegistry.from_env()
+
+    assert registry.get("gpt-4o").api_key is None
+    assert "r1" not in registry
+    with pytest.raises(ValueError, match="AZURE_R1_ENDPOINT"):
+        registry.get("r1")
+
+
+@pytest.mark.parametrize("module", ["cogentic.llm.api", "cogentic.llm.entra"])
+def test_deprecated_model_modules_forward_to_the_registry(module, monkeypatch):
+    from cogentic.llm import registry
+
+    deprecated = importlib.import_module(module)
+    calls = []
+    monkeypatch.setattr(
+        registry, "get_model_client", lambda *args, **kwargs: calls.append(args)
+    )
+
+    with pytest.warns(DeprecationWarning, match="cogentic.llm.get_model_client"):
+        deprecated.get_model_client("gpt-4o")
+
+    assert calls == [("gpt-4o",)]
+    assert deprecated.ModelDetails is registry.ModelDetails
+    assert deprecated.MODELS == registry.get_model_registry().models
@@ -0,0 +1,54 @@
+import copy
+import json
+import pickle
+
+from cogentic.orchestration.models.plan import CogenticPlan
+
+
+def _expected(plan: CogenticPlan) -> str:
+    return f"```json\n{plan.model_dump_json(indent=2)}\n```"
+
+
+def test_markdown_matches_pydantic_json(plan):
+    assert plan.model_dump_markdown() == _expected(plan)
+    assert plan.model_dump_markdown(indent=4) == (
+        f"```json\n{plan.model_dump_json(indent=4)}\n```"
+    )
+
+
+def test_markdown_invalidated_on_nested_assignment_and_list_mutation(plan):
+    plan.model_dump_markdown()
+
+    test = plan.hypotheses[1].tests[0]
+    test.state = "complete"
+    test.result_summary = "Done"
+    assert plan.model_dump_markdown() == _expected(plan)
+
+    plan.hypotheses[0].tests.append(test.model_copy(update={"name": "Copied"}))
+    plan.issues.clear()
+    plan.state = "completed"
+    assert plan.model_dump_markdown() == _expected(plan)
+
+
+def test_field_markdown(plan):
+    evidence = plan.model_dump_field_as_markdown("evidence", title="Evidence")
+    dumped = plan.model_dump(mode="json")["evidence"]
+    assert evidence.startswith("## Evidence\n\n```json\n")
+    assert json.loads(evidence.split("```json\n", 1)[1][:-4]) == dumped
+    assert plan.model_dump_field_as_markdown("hypotheses", collapse_field=False) == (
+        f"```json\n{plan.model_dump_json(indent=2, include={'hypotheses'})}\n```"
+    )
+
+
+def test_markdown_tracks_copies(plan):
+    plan.model_dump_markdown()
+
+    for copied in (
+        copy.deepcopy(plan),
+        plan.model_copy(deep=True),
+        pickle.loads(pickle.dumps(plan)),
+    ):
+        copied.hypotheses[0].tests.pop()
+        copied.evidence[0].content = "Changed"
+        assert copied.model_dump_markdown() == _expected(copied)
+    assert plan.model_dump_markdown() == _expected(plan)
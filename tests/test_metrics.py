@@ -0,0 +1,66 @@
+import pytest
+from autogen_core import CancellationToken
+from autogen_core.models import UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from pydantic import BaseModel
+
+from cogentic.observability import CogenticChatCompletionClient, CogenticMetrics
+from cogentic.orchestration.context import call_site
+from cogentic.orchestration.model_output import reason_and_output_model
+
+
+class Answer(BaseModel):
+    answer: int
+
+
+@pytest.mark.asyncio
+async def test_metrics_per_call_site():
+    metrics = CogenticMetrics()
+    client = CogenticChatCompletionClient(
+        model_client=ReplayChatCompletionClient(
+            [
+                "The answer is 55.",
+                "Not json",
+                '```json\n{"answer": 55}\n```',
+                "Streamed",
+            ]
+        ),
+        name="replay",
+        metrics=metrics,
+    )
+
+    with call_site("progress_ledger"):
+        result = await reason_and_output_model(
+            client,
+            client,
+            [UserMessage(content="What is 33 + 22?", source="user")],
+            CancellationToken(),
+            response_model=Answer,
+        )
+    assert result.answer == 55
+
+    with call_site("final_answer"):
+        async for _ in client.create_stream(
+            [UserMessage(content="Stream it", source="user")]
+        ):
+            pass
+
+    snapshot = {m.call_site: m for m in metrics.snapshot()}
+    assert set(snapshot) == {"progress_ledger", "progress_ledger/json", "final_answer"}
+    assert snapshot["progress_ledger"].requests == 1
+    assert snapshot["progress_ledger"].retries == 0
+    assert snapshot["progress_ledger/json"].requests == 2
+    assert snapshot["progress_ledger/json"].retries == 1
+    assert snapshot["progress_ledger/json"].prompt_tokens > 0
+    assert snapshot["final_answer"].time_to_first_token.count == 1
+    assert snapshot["progress_ledger"].time_to_first_token.count == 0
+
+    prometheus = metrics.to_prometheus()
+    assert (
+        'cogentic_llm_retries_total{client="replay",call_site="progress_ledger/json"} 1'
+        in prometheus
+    )
+    assert (
+        'cogentic_llm_request_duration_seconds_bucket{client="replay",call_site="final_answer",le="+Inf"} 1'
+        in prometheus
+    )
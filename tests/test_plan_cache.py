@@ -0,0 +1,185 @@
+import pytest
+
+from cogentic import CogenticGroupChat
+from cogentic.orchestration import CogenticPlanCache
+from cogentic.orchestration.models.evidence import CogenticInitialEvidence
+from cogentic.orchestration.models.hypothesis import CogenticInitialHypotheses
+from cogentic.testing import (
+    CogenticFakeChatCompletionClient,
+    CogenticFakeParticipant,
+    CogenticFakeScenario,
+)
+
+TEAM = "| Name | Description |\n| Alice | Does everything |"
+QUESTION = "Which planet in the solar system has the largest number of known moons?"
+
+
+def _plan(name: str) -> tuple[CogenticInitialEvidence, CogenticInitialHypotheses]:
+    evidence = CogenticInitialEvidence.model_validate(
+        {"evidence": [{"description": "The question", "content": name}]}
+    )
+    hypotheses = CogenticInitialHypotheses.model_validate(
+        {
+            "hypotheses": [
+                {
+                    "name": name,
+                    "hypothesis": f"The answer is {name}",
+                    "state": "unverified",
+                    "completion_summary": None,
+                    "tests": [
+                        {
+                            "name": f"Check {name}",
+                            "description": "Look it up",
+                            "goal": f"Confirm {name}",
+                            "state": "incomplete",
+                            "plan": [],
+                            "result_summary": None,
+                        }
+                    ],
+                }
+            ]
+        }
+    )
+    return evidence, hypotheses
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_repeated_questions_hit_after_normalization():
+    cache = CogenticPlanCache()
+    cache.put(QUESTION, TEAM, *_plan("Saturn"))
+
+    match = cache.get(f"  {QUESTION.upper().replace('?', ' ?')} ", TEAM)
+
+    assert match and match.exact and match.similarity == 1.0
+    assert match.hypotheses.hypotheses[0].name == "Saturn"
+    assert cache.get(QUESTION, "| Name | Description |\n| Bob | Writes code |") is None
+    assert cache.stats.exact_hits == cache.stats.misses == 1
+
+
+def test_operators_and_symbols_are_kept():
+    cache = CogenticPlanCache(similarity_threshold=None)
+    cache.put("What is 33 + 22?", TEAM, *_plan("55"))
+    cache.put("Who created C++?", TEAM, *_plan("Stroustrup"))
+
+    assert cache.get("what is 33 + 22", TEAM)
+    assert cache.get("What is 33 - 22?", TEAM) is None
+    assert cache.get("Who created C#?", TEAM) is None
+
+
+def test_similar_questions_hit_above_the_threshold():
+    cache = CogenticPlanCache(similarity_threshold=0.7)
+    cache.put(QUESTION, TEAM, *_plan("Saturn"))
+
+    similar = cache.get(QUESTION.replace("known moons", "known moon"), TEAM)
+    different = cache.get("How many bones are in the adult human body?", TEAM)
+
+    assert similar and not similar.exact and 0.7 <= similar.similarity < 1.0
+    assert different is None
+    assert cache.stats.similar_hits == cache.stats.misses == 1
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_entries_expire_and_are_evicted():
+    clock = Clock()
+    cache = CogenticPlanCache(max_entries=2, ttl=60, clock=clock)
+    for name in ("first", "second", "third"):
+        cache.put(f"Question {name}", TEAM, *_plan(name))
+        clock.now += 10
+
+    assert cache.get("Question first", TEAM) is None
+    assert cache.get("Question second", TEAM)
+    clock.now += 51
+    assert cache.get("Question third", TEAM) is None
+    assert len(cache) == 1
+    assert cache.stats.evictions == cache.stats.expirations == 1
+
+
+def test_matches_are_copies():
+    cache = CogenticPlanCache()
+    cache.put(QUESTION, TEAM, *_plan("Saturn"))
+
+    match = cache.get(QUESTION, TEAM)
+    assert match
+    match.hypotheses.hypotheses[0].state = "verified"
+
+    match = cache.get(QUESTION, TEAM)
+    assert match and match.hypotheses.hypotheses[0].state == "unverified"
+
+
+@pytest.mark.asyncio
+async def test_teams_skip_planning_for_cached_questions():
+    cache = CogenticPlanCache()
+    clients = []
+    results = []
+    for _ in range(2):
+        client = CogenticFakeChatCompletionClient(
+            CogenticFakeScenario(hypotheses=1, tests_per_hypothesis=1)
+        )
+        team = CogenticGroupChat(
+            participants=[CogenticFakeParticipant("Alice")],
+            model_client=client,
+            plan_cache=cache,
+        )
+        results.append(await team.run(task=QUESTION))
+        clients.append(client)
+
+    assert all(
+        result.stop_reason and result.stop_reason.startswith("No work remaining")
+        for result in results
+    )
+    assert "CogenticInitialPlan" in clients[0].calls
+    assert "CogenticInitialPlan" not in clients[1].calls
+    assert "CogenticInitialEvidence" not in clients[1].calls
+    assert cache.stats.exact_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_similar_questions_are_planned_again_from_the_cached_plan(
+    recording_client,
+):
+    cache = CogenticPlanCache(similarity_threshold=0.7)
+    clients = []
+    for question in (QUESTION, QUESTION.replace("known moons", "known moon")):
+        client = recording_client()
+        team = CogenticGroupChat(
+            participants=[CogenticFakeParticipant("Alice")],
+            model_client=client,
+            plan_cache=cache,
+        )
+        await team.run(task=question)
+        clients.append(client)
+
+    assert cache.stats.similar_hits == 1
+    assert not clients[0].prompts_containing("Plan of a Similar Question")
+    # A similar hit makes the same single planning call as a miss
+    assert clients[1].calls.count("CogenticInitialPlan") == 1
+    assert "CogenticInitialEvidence" not in clients[1].calls
+    assert "CogenticInitialHypotheses" not in clients[1].calls
+    assert len(clients[1].prompts_containing("Plan of a Similar Question")) == 1
+
+
+@pytest.mark.asyncio
+async def test_two_stage_planning_adapts_the_cached_hypotheses(recording_client):
+    cache = CogenticPlanCache(similarity_threshold=0.7)
+    clients = []
+    for question in (QUESTION, QUESTION.replace("known moons", "known moon")):
+        client = recording_client()
+        team = CogenticGroupChat(
+            participants=[CogenticFakeParticipant("Alice")],
+            model_client=client,
+            plan_cache=cache,
+            use_two_stage_planning=True,
+        )
+        await team.run(task=question)
+        clients.append(client)
+
+    assert cache.stats.similar_hits == 1
+    assert "CogenticInitialPlan" not in clients[1].calls
+    assert len(clients[1].prompts_containing("Hypotheses of a Similar Question")) == 1
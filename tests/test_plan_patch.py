@@ -0,0 +1,195 @@
+import pytest
+from pydantic import ValidationError
+
+from cogentic.orchestration.models.hypothesis import CogenticHypothesis
+from cogentic.orchestration.models.orchestration import (
+    CogenticHypothesisPatch,
+    CogenticPlanPatch,
+)
+from cogentic.orchestration.models.plan import CogenticPlan
+from cogentic.orchestration.models.test import CogenticTest
+
+
+def _test(name: str, state: str = "incomplete") -> dict:
+    return {
+        "name": name,
+        "description": f"Description of {name}",
+        "goal": f"Goal of {name}",
+        "state": state,
+        "plan": [],
+        "result_summary": None,
+    }
+
+
+def _hypothesis(name: str, tests: list[dict], state: str = "unverified") -> dict:
+    return {
+        "name": name,
+        "hypothesis": f"Hypothesis {name}",
+        "state": state,
+        "completion_summary": None,
+        "tests": tests,
+    }
+
+
+@pytest.fixture
+def plan(make_plan) -> CogenticPlan:
+    # h1 is the current hypothesis, and t2 its current test
+    return make_plan(
+        {
+            "h1": {"t1": "complete", "t2": "incomplete", "t3": "incomplete"},
+            "h2": {"t1": "incomplete"},
+        }
+    )
+
+
+def test_apply_patch_inserts_in_order_in_front_of_current(plan):
+    plan.apply_patch(
+        CogenticPlanPatch.model_validate(
+            {
+                "plan_state": {"reason": "", "answer": "in_progress"},
+                "operations": [
+                    {
+                        "op": "add_hypothesis",
+                        "hypothesis": _hypothesis("new1", [_test("a")]),
+                        "before": None,
+                    },
+                    {
+                        "op": "add_hypothesis",
+                        "hypothesis": _hypothesis("new2", [_test("a")]),
+                        "before": None,
+                    },
+                    {
+                        "op": "add_test",
+                        "hypothesis_name": "h1",
+                        "test": _test("t4"),
+                        "before": None,
+                    },
+                    {
+                        "op": "add_test",
+                        "hypothesis_name": "h1",
+                        "test": _test("t5"),
+                        "before": None,
+                    },
+                    {
+                        "op": "set_test_state",
+                        "hypothesis_name": "h1",
+                        "test_name": "t3",
+                        "state": "abandoned",
+                    },
+                    {
+                        "op": "modify_test",
+                        "hypothesis_name": "h1",
+                        "test_name": "t2",
+                        "field": "goal",
+                        "value": "New goal",
+                    },
+                    {"op": "reorder_hypotheses", "order": ["h2"]},
+                    {
+                        "op": "reorder_tests",
+                        "hypothesis_name": "h1",
+                        "order": ["t3", "t1"],
+                    },
+                ],
+            }
+        ).operations
+    )
+    assert [h.name for h in plan.hypotheses] == ["h2", "new1", "new2", "h1"]
+    h1 = plan.get_hypothesis("h1")
+    assert [t.name for t in h1.tests] == ["t3", "t1", "t4", "t5", "t2"]
+    assert h1.get_test("t3").state == "abandoned"
+    assert h1.get_test("t2").goal == "New goal"
+
+
+def test_patch_validated_against_plan_context(plan):
+    with pytest.raises(ValidationError, match="No test named 'missing'"):
+        CogenticHypothesisPatch.model_validate(
+            {
+                "hypothesis_state": {"reason": "", "answer": "unverified"},
+                "operations": [
+                    {
+                        "op": "set_test_state",
+                        "hypothesis_name": None,
+                        "test_name": "missing",
+                        "state": "complete",
+                    }
+                ],
+            },
+            context={"plan": plan},
+        )
+    with pytest.raises(ValidationError, match="already exists"):
+        CogenticPlanPatch.model_validate(
+            {
+                "plan_state": {"reason": "", "answer": "in_progress"},
+                "operations": [
+                    {
+                        "op": "add_hypothesis",
+                        "hypothesis": _hypothesis("h2", [_test("a")]),
+                        "before": None,
+                    }
+                ],
+            },
+            context={"plan": plan},
+        )
+
+    # Completing every remaining test while leaving the hypothesis unverified leaves no work to do
+    operations = [
+        {
+            "op": "set_test_state",
+            "hypothesis_name": None,
+            "test_name": name,
+            "state": "complete",
+        }
+        for name in ("t2", "t3")
+    ]
+    with pytest.raises(ValidationError, match="must have an incomplete test"):
+        CogenticHypothesisPatch.model_validate(
+            {
+                "hypothesis_state": {"reason": "", "answer": "unverified"},
+                "operations": operations,
+            },
+            context={"plan": plan},
+        )
+
+    # Validation doesn't touch the original plan
+    assert plan.get_hypothesis("h1").get_test("t2").state == "incomplete"
+    assert isinstance(plan.get_hypothesis("h1").tests[0], CogenticTest)
+
+
+def test_hypothesis_patch_only_changes_tests_of_the_current_hypothesis(plan):
+    for operation, error in [
+        (
+            {
+                "op": "set_hypothesis_state",
+                "hypothesis_name": "h2",
+                "state": "verified",
+            },
+            "`set_hypothesis_state` isn't allowed",
+        ),
+        (
+            {
+                "op": "set_test_state",
+                "hypothesis_name": "h2",
+                "test_name": "t1",
+                "state": "complete",
+            },
+            "not those of 'h2'",
+        ),
+    ]:
+        with pytest.raises(ValidationError, match=error):
+            CogenticHypothesisPatch.model_validate(
+                {
+                    "hypothesis_state": {"reason": "", "answer": "unverified"},
+                    "operations": [operation],
+                },
+                context={"plan": plan},
+            )
+
+
+def test_hypotheses_without_names_are_named_after_their_text():
+    data = _hypothesis("h1", [_test("t1")])
+    del data["name"]
+    data["hypothesis"] = "The answer is in the first chapter of the book, near the end"
+
+    hypothesis = CogenticHypothesis.model_validate(data)
+
+    assert hypothesis.name == "The answer is in the first chapter of"
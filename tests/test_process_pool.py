@@ -0,0 +1,86 @@
+import pytest
+from autogen_core import ComponentModel
+
+from cogentic import CogenticGroupChat, CogenticProcessPoolRunner
+from cogentic.testing import (
+    CogenticFakeChatCompletionClient,
+    CogenticFakeParticipant,
+    CogenticFakeScenario,
+)
+
+
+def make_team() -> CogenticGroupChat:
+    return CogenticGroupChat(
+        participants=[CogenticFakeParticipant("Alice", latency=0.01)],
+        model_client=CogenticFakeChatCompletionClient(
+            CogenticFakeScenario(hypotheses=1, tests_per_hypothesis=1)
+        ),
+        max_turns_per_test=4,
+    )
+
+
+def test_group_chat_config_round_trips():
+    team = CogenticGroupChat(
+        participants=[CogenticFakeParticipant("Alice", latency=0.5)],
+        model_client=CogenticFakeChatCompletionClient(
+            CogenticFakeScenario(hypotheses=3),
+            responses={"CogenticFinalAnswer": {"answer": "42"}},
+        ),
+        json_model_client=CogenticFakeChatCompletionClient(latency=0.1),
+        max_turns_per_test=3,
+        use_summarized_context=True,
+        use_plan_patches=True,
+        use_tiered_ledger=True,
+        progress_check_model_client=CogenticFakeChatCompletionClient(latency=0.2),
+    )
+    config = team.dump_component()
+
+    # Through JSON, as when shipped to another process
+    loaded = CogenticGroupChat.load_component(
+        ComponentModel.model_validate_json(config.model_dump_json())
+    )
+
+    assert loaded.dump_component() == config
+    assert loaded._max_turns_per_test == 3
+    assert loaded._use_summarized_context
+    assert loaded._json_model_client is not loaded._model_client
+    assert loaded._use_tiered_ledger
+    assert isinstance(
+        loaded._progress_check_model_client, CogenticFakeChatCompletionClient
+    )
+    assert loaded._progress_check_model_client.latency == 0.2
+    assert isinstance(loaded._participants[0], CogenticFakeParticipant)
+    assert loaded._participants[0].latency == 0.5
+
+
+def test_json_model_client_defaults_to_the_model_client():
+    config = make_team().dump_component()
+
+    loaded = CogenticGroupChat.load_component(config)
+
+    assert "json_model_client" not in config.config
+    assert loaded._json_model_client is loaded._model_client
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("team", [make_team(), make_team], ids=["config", "factory"])
+async def test_process_pool_runs_tasks_in_workers(team):
+    runner = CogenticProcessPoolRunner(team, processes=2, concurrency=2)
+
+    results = await runner.run_all(f"Question {i}" for i in range(6))
+
+    assert [result.task for result in results] == [f"Question {i}" for i in range(6)]
+    assert all(result.succeeded for result in results)
+    assert all(
+        result.result
+        and result.result.stop_reason
+        and result.result.stop_reason.startswith("No work remaining")
+        for result in results
+    )
+    assert len({result.session_id for result in results}) == 6
+    metrics = runner.metrics
+    assert metrics.submitted == metrics.succeeded == 6
+    assert metrics.in_flight == metrics.failed == 0
+    assert metrics.completion_tokens == sum(
+        result.usage.completion_tokens for result in results
+    )
@@ -0,0 +1,108 @@
+import json
+
+import pytest
+from autogen_core import ComponentModel
+from autogen_core.models import UserMessage
+
+from cogentic import CogenticGroupChat
+from cogentic.orchestration.models.render import render
+from cogentic.orchestration.prompts import create_current_state_prompt
+from cogentic.testing import (
+    CogenticFakeChatCompletionClient,
+    CogenticFakeParticipant,
+    CogenticFakeScenario,
+)
+
+
+def _fenced(text: str, language: str) -> str:
+    assert text.startswith(f"```{language}\n") and text.endswith("\n```")
+    return text[len(language) + 4 : -4]
+
+
+def test_compact_json_drops_nulls_and_defaults(plan):
+
+    rendered = _fenced(render(plan, "compact_json"), "json")
+
+    assert json.loads(rendered) == plan.model_dump(
+        mode="json", exclude_none=True, exclude_defaults=True
+    )
+    assert "null" not in rendered and "\n" not in rendered
+
+
+def test_json_format_is_unchanged(plan):
+
+    assert plan.model_dump_markdown() == plan.model_dump_markdown(format="json")
+    assert render(plan, "json") == f"```json\n{plan.model_dump_json(indent=2)}\n```"
+
+
+def test_yaml_format(plan):
+    rendered = _fenced(render(plan, "yaml"), "yaml")
+
+    assert "  - name: h0\n" in rendered
+    assert 'hypothesis: "Hypothesis h0: a | b – “quoted” ünïcode"' in rendered
+    assert "description: |\n          Line one\n          Line two\n" in rendered
+    assert "null" not in rendered
+
+
+def test_yaml_format_keeps_every_line_of_list_items():
+    rendered = _fenced(render(["a\nb", "c", [], {"k": ["x\ny"]}], "yaml"), "yaml")
+
+    assert (
+        rendered == "- |\n    a\n    b\n- c\n- []\n- k:\n    - |\n        x\n        y"
+    )
+
+
+def test_table_format(plan):
+    rendered = render(plan, "table")
+
+    # Hypotheses nest tables of tests, so each gets a section
+    assert "**hypotheses[0]**" in rendered
+    assert "| name | description | goal | state | plan |" in rendered
+    assert "Line one<br>Line two" in rendered
+    assert "hypothesis: Hypothesis h0: a \\| b" in rendered
+    assert "| description | content |" in rendered
+
+
+@pytest.mark.parametrize("format", ["compact_json", "table", "yaml"])
+def test_compact_formats_shrink_the_current_state_prompt(format, plan):
+    client = CogenticFakeChatCompletionClient()
+
+    def tokens(prompt: str) -> int:
+        return client.count_tokens([UserMessage(content=prompt, source="user")])
+
+    json_prompt = create_current_state_prompt("Question?", "Team", plan)
+    compact_prompt = create_current_state_prompt("Question?", "Team", plan, format)
+
+    assert tokens(compact_prompt) < tokens(json_prompt)
+
+
+@pytest.mark.asyncio
+async def test_team_runs_with_prompt_formats():
+    client = CogenticFakeChatCompletionClient(
+        CogenticFakeScenario(hypotheses=2, tests_per_hypothesis=2)
+    )
+    team = CogenticGroupChat(
+        participants=[CogenticFakeParticipant("Alice")],
+        model_client=client,
+        prompt_formats={"current_state": "table", "replan": "yaml"},
+    )
+
+    result = await team.run(task="What is the answer?")
+
+    assert result.stop_reason and result.stop_reason.startswith("No work remaining")
+
+
+def test_prompt_formats_round_trip_in_the_team_config():
+    team = CogenticGroupChat(
+        participants=[CogenticFakeParticipant("Alice")],
+        model_client=CogenticFakeChatCompletionClient(),
+        prompt_formats={"final_answer": "compact_json"},
+    )
+    config = team.dump_component()
+
+    loaded = CogenticGroupChat.load_component(
+        ComponentModel.model_validate_json(config.model_dump_json())
+    )
+
+    assert loaded.dump_component() == config
+    assert loaded._prompt_formats == {"final_answer": "compact_json"}
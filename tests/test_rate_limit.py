@@ -0,0 +1,153 @@
+import asyncio
+import time
+
+import pytest
+from autogen_core.models import UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from cogentic.llm import (
+    CogenticClientPool,
+    CogenticModelRegistry,
+    ModelDetails,
+    get_model_client,
+)
+from cogentic.observability import (
+    CogenticChatCompletionClient,
+    CogenticMetrics,
+    CogenticRateLimiter,
+    get_rate_limiter,
+)
+from cogentic.observability.rate_limit import RATE_LIMITERS
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_is_fair_between_sessions():
+    # 100 tokens of burst, refilled at 1000 tokens per second
+    limiter = CogenticRateLimiter("test", tokens_per_minute=60_000, burst_seconds=0.1)
+    granted: list[str] = []
+
+    async def request(session: str, index: int) -> None:
+        await limiter.acquire(100, session)
+        granted.append(f"{session}{index}")
+
+    start = time.monotonic()
+    await asyncio.gather(
+        *(request("a", i) for i in range(4)), *(request("b", i) for i in range(2))
+    )
+    elapsed = time.monotonic() - start
+
+    assert granted == ["a0", "b0", "a1", "b1", "a2", "a3"]
+    assert 0.4 <= elapsed < 1.5
+    snapshot = limiter.snapshot()
+    assert snapshot.granted == 6
+    assert snapshot.queue_depth == 0
+
+
+class ThrottledError(Exception):
+    status_code = 429
+
+
+@pytest.mark.asyncio
+async def test_client_retries_throttled_requests():
+    limiter = CogenticRateLimiter("test", requests_per_minute=6000)
+    metrics = CogenticMetrics()
+    model_client = ReplayChatCompletionClient(["Hello"])
+    create = model_client.create
+    calls = 0
+
+    async def throttle_once(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ThrottledError()
+        return await create(*args, **kwargs)
+
+    model_client.create = throttle_once  # type: ignore[method-assign]
+    client = CogenticChatCompletionClient(
+        model_client=model_client,
+        name="replay",
+        metrics=metrics,
+        rate_limiter=limiter,
+    )
+
+    result = await client.create([UserMessage(content="Hi", source="user")])
+
+    assert result.content == "Hello"
+    assert calls == 2
+    assert limiter.snapshot().throttled == 1
+    assert limiter.snapshot().granted == 2
+    (site,) = metrics.snapshot()
+    assert site.errors == 1
+    assert site.queue_wait.count == 2
+
+
+@pytest.mark.asyncio
+async def test_requests_are_only_counted_with_a_token_quota():
+    model_client = ReplayChatCompletionClient(["Hello"])
+
+    def count_tokens(*args, **kwargs):
+        raise AssertionError("Counted tokens without a token quota")
+
+    model_client.count_tokens = count_tokens  # type: ignore[method-assign]
+    client = CogenticChatCompletionClient(
+        model_client=model_client,
+        name="replay",
+        rate_limiter=CogenticRateLimiter("test", requests_per_minute=6000),
+    )
+
+    result = await client.create([UserMessage(content="Hi", source="user")])
+
+    assert result.content == "Hello"
+
+
+def test_shared_limiters_take_the_latest_quotas():
+    endpoint = "https://quota.example.com"
+    try:
+        limiter = get_rate_limiter(endpoint, "gpt-4o", requests_per_minute=60)
+        assert get_rate_limiter(endpoint, "gpt-4o", requests_per_minute=60) is limiter
+
+        updated = get_rate_limiter(
+            endpoint, "gpt-4o", requests_per_minute=120, tokens_per_minute=6000
+        )
+
+        assert updated is limiter
+        assert limiter.requests_per_minute == 120
+        assert limiter.tokens_per_minute == 6000
+        assert limiter.limits_tokens
+    finally:
+        RATE_LIMITERS.pop(f"{endpoint}/gpt-4o", None)
+
+
+@pytest.mark.asyncio
+async def test_registry_only_rate_limits_deployments_with_a_quota():
+    def registry(**quota) -> CogenticModelRegistry:
+        return CogenticModelRegistry(
+            [
+                ModelDetails(
+                    name="gpt-4o",
+                    info={
+                        "family": "gpt-4o",
+                        "function_calling": True,
+                        "json_output": True,
+                        "vision": True,
+                    },
+                    endpoint="https://limited.example.com",
+                    api_key="key",
+                    **quota,
+                )
+            ]
+        )
+
+    pool = CogenticClientPool()
+    try:
+        unlimited = get_model_client("gpt-4o", registry=registry(), pool=pool)
+        limited = get_model_client(
+            "gpt-4o", registry=registry(requests_per_minute=60), pool=pool
+        )
+
+        assert unlimited.rate_limiter is None
+        assert limited.rate_limiter is not None
+        assert limited.rate_limiter.requests_per_minute == 60
+    finally:
+        RATE_LIMITERS.pop("https://limited.example.com/gpt-4o", None)
+        await pool.close()
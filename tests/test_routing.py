@@ -0,0 +1,146 @@
+import pytest
+from autogen_core import ComponentModel
+
+from cogentic import CogenticGroupChat
+from cogentic.orchestration import CogenticModelRoute, CogenticModelRouter
+from cogentic.testing import (
+    CogenticFakeChatCompletionClient,
+    CogenticFakeParticipant,
+    CogenticFakeScenario,
+)
+
+
+@pytest.mark.asyncio
+async def test_call_sites_are_routed_to_their_clients():
+    scenario = CogenticFakeScenario(hypotheses=1, tests_per_hypothesis=2)
+    client = CogenticFakeChatCompletionClient(scenario)
+    cheap_client = CogenticFakeChatCompletionClient(scenario)
+    router = CogenticModelRouter(
+        model_clients={"cheap": cheap_client},
+        routes={
+            "progress_ledger": CogenticModelRoute(model_client="cheap"),
+            "summarize_action": CogenticModelRoute(model_client="cheap"),
+        },
+    )
+    team = CogenticGroupChat(
+        participants=[CogenticFakeParticipant("Alice")],
+        model_client=client,
+        model_router=router,
+    )
+
+    result = await team.run(task="What is the answer?")
+
+    assert result.stop_reason and result.stop_reason.startswith("No work remaining")
+    assert cheap_client.calls.count("CogenticProgressLedgerWithSpeakers") == 2
+    assert "CogenticProgressLedgerWithSpeakers" not in client.calls
+    assert client.calls[-1] == "CogenticFinalAnswer"
+
+    stats = {(s.call_site, s.client): s for s in router.snapshot()}
+    assert stats["progress_ledger", "cheap"].calls == 2
+    assert stats["summarize_action", "cheap"].calls == 2
+    assert stats["final_answer", "default"].calls == 1
+    assert stats["progress_ledger", "cheap"].latency.count == 2
+    assert stats["progress_ledger", "cheap"].mean_latency > 0
+
+
+@pytest.mark.asyncio
+async def test_json_escalates_after_parse_failures():
+    client = CogenticFakeChatCompletionClient(
+        CogenticFakeScenario(hypotheses=1, tests_per_hypothesis=1)
+    )
+    # The cheap client never gets the final answer right
+    cheap_client = CogenticFakeChatCompletionClient(
+        responses={"CogenticFinalAnswer": {"status": "unknown"}}
+    )
+    router = CogenticModelRouter(
+        model_clients={"cheap": cheap_client},
+        routes={
+            "final_answer": CogenticModelRoute(
+                model_client="cheap",
+                escalate_to="model",
+                escalate_after_parse_failures=2,
+            )
+        },
+    )
+    team = CogenticGroupChat(
+        participants=[CogenticFakeParticipant("Alice")],
+        model_client=client,
+        model_router=router,
+    )
+
+    result = await team.run(task="What is the answer?")
+
+    assert result.stop_reason and result.stop_reason.startswith("No work remaining")
+    assert cheap_client.calls == ["text", "CogenticFinalAnswer", "CogenticFinalAnswer"]
+    assert client.calls[-1] == "CogenticFinalAnswer"
+    stats = {(s.call_site, s.client): s for s in router.snapshot()}
+    assert stats["final_answer", "cheap"].escalations == 1
+    assert stats["final_answer", "cheap"].errors == 0
+
+
+def test_stalls_escalate_the_whole_call():
+    client = CogenticFakeChatCompletionClient()
+    strong_client = CogenticFakeChatCompletionClient()
+    route = CogenticModelRoute(
+        model_client="model", escalate_to="strong", escalate_after_stalls=2
+    )
+    router = CogenticModelRouter(
+        model_clients={"strong": strong_client}, routes={"next_step": route}
+    )
+
+    calm = router.resolve(route, client, client, stalls=1)
+    stalled = router.resolve(route, client, client, stalls=2)
+
+    assert calm.client == "model" and not calm.escalated
+    assert calm.model_client is client
+    assert stalled.client == "strong" and stalled.escalated
+    assert stalled.model_client is stalled.json_model_client is strong_client
+
+
+def test_routes_must_refer_to_known_clients():
+    with pytest.raises(ValueError, match="unknown client"):
+        CogenticModelRouter(routes={"next_step": CogenticModelRoute(model_client="x")})
+    with pytest.raises(ValueError, match="reserved"):
+        CogenticModelRouter(model_clients={"model": CogenticFakeChatCompletionClient()})
+
+
+def test_routes_must_be_for_known_call_sites():
+    route = CogenticModelRoute(model_client="model")
+    with pytest.raises(ValueError, match="unknown call sites \\['summarise_action'\\]"):
+        CogenticModelRouter(routes={"summarise_action": route})  # type: ignore[dict-item]
+    with pytest.raises(ValueError, match="summarise_action"):
+        CogenticModelRouter.load_component(
+            ComponentModel(
+                provider="cogentic.orchestration.routing.CogenticModelRouter",
+                config={"routes": {"summarise_action": route.model_dump()}},
+            )
+        )
+
+
+def test_router_round_trips_in_the_team_config():
+    router = CogenticModelRouter(
+        model_clients={"cheap": CogenticFakeChatCompletionClient(latency=0.3)},
+        routes={
+            "summarize_action": CogenticModelRoute(model_client="cheap"),
+            "update_plan": CogenticModelRoute(
+                model_client="cheap", escalate_to="model", escalate_after_stalls=1
+            ),
+        },
+    )
+    team = CogenticGroupChat(
+        participants=[CogenticFakeParticipant("Alice")],
+        model_client=CogenticFakeChatCompletionClient(),
+        model_router=router,
+    )
+    config = team.dump_component()
+
+    loaded = CogenticGroupChat.load_component(
+        ComponentModel.model_validate_json(config.model_dump_json())
+    )
+
+    assert loaded.dump_component() == config
+    assert loaded._model_router is not None
+    assert loaded._model_router.routes == router.routes
+    cheap = loaded._model_router.model_clients["cheap"]
+    assert isinstance(cheap, CogenticFakeChatCompletionClient)
+    assert cheap.latency == 0.3
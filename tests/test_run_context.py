@@ -0,0 +1,78 @@
+import pytest
+from autogen_agentchat.agents import AssistantAgent
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from cogentic import CogenticGroupChat
+from cogentic.observability import CogenticChatCompletionClient
+from cogentic.orchestration.context import (
+    CogenticRunContext,
+    current_run,
+    run_context,
+)
+
+
+class RecordingReplayClient(ReplayChatCompletionClient):
+    def __init__(self, chat_completions, runs: list[CogenticRunContext | None]):
+        super().__init__(chat_completions)
+        self.runs = runs
+
+    async def create(self, *args, **kwargs):
+        self.runs.append(current_run())
+        return await super().create(*args, **kwargs)
+
+
+def test_run_context_inherits_session():
+    assert current_run() is None
+    with run_context(session_id="session") as outer:
+        with run_context() as inner:
+            assert inner.session_id == "session"
+            assert inner.run_id != outer.run_id
+        assert current_run() == outer
+    with run_context() as run:
+        assert run.session_id == run.run_id
+    assert current_run() is None
+
+
+@pytest.mark.asyncio
+async def test_run_attributes_orchestrator_and_participant_calls(adder_run):
+    runs: list[CogenticRunContext | None] = []
+    model_client = RecordingReplayClient(adder_run.model_responses(), runs)
+    json_model_client = RecordingReplayClient(adder_run.json_responses(), runs)
+    adder = AssistantAgent(
+        "Adder",
+        model_client=CogenticChatCompletionClient(
+            RecordingReplayClient(["55"], runs), name="adder", session_id="unused"
+        ),
+    )
+    team = CogenticGroupChat(
+        participants=[adder],
+        model_client=model_client,
+        json_model_client=json_model_client,
+    )
+
+    await team.run(task=adder_run.task, session_id="session")
+
+    assert len(runs) == 10
+    assert all(run is not None and run.session_id == "session" for run in runs)
+    assert len({run.run_id for run in runs if run is not None}) == 1
+    assert current_run() is None
+
+
+@pytest.mark.asyncio
+async def test_run_stream_does_not_leak_the_run_into_the_consumer(adder_run):
+    runs: list[CogenticRunContext | None] = []
+    team = CogenticGroupChat(
+        participants=[
+            AssistantAgent("Adder", model_client=ReplayChatCompletionClient(["55"]))
+        ],
+        model_client=RecordingReplayClient(adder_run.model_responses(), runs),
+        json_model_client=RecordingReplayClient(adder_run.json_responses(), runs),
+    )
+
+    consumer_runs = []
+    async for _ in team.run_stream(task=adder_run.task, session_id="session"):
+        consumer_runs.append(current_run())
+
+    assert consumer_runs and all(run is None for run in consumer_runs)
+    assert runs and all(run is not None and run.session_id == "session" for run in runs)
+    assert len({run.run_id for run in runs if run is not None}) == 1
@@ -0,0 +1,95 @@
+import json
+from typing import Literal, Optional
+
+import pytest
+from pydantic import BaseModel, Field
+
+from cogentic.orchestration.models.ledger import CogenticProgressLedger
+from cogentic.orchestration.models.orchestration import CogenticPlanPatch
+from cogentic.orchestration.schema import compile_schema, response_schema
+
+
+class Inner(BaseModel):
+    """Docstring of the inner model."""
+
+    choice: Literal["a", "b"] = Field(description="A choice")
+
+
+class Outer(BaseModel):
+    inner: Inner = Field(description="The inner value")
+    note: str | None = Field(default=None, description="An optional note")
+    count: int = 1
+
+
+class Node(BaseModel):
+    children: list["Node"]
+
+
+def _walk(node):
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _walk(item)
+
+
+def test_compiled_schema_is_minimal():
+    compiled = compile_schema(Outer.model_json_schema())
+
+    assert compiled == {
+        "title": "Outer",
+        "properties": {
+            "inner": {
+                "description": "The inner value",
+                "properties": {
+                    "choice": {"description": "A choice", "enum": ["a", "b"]}
+                },
+                "type": "object",
+            },
+            "note": {
+                "type": ["string", "null"],
+                "default": None,
+                "description": "An optional note",
+            },
+            "count": {"default": 1, "type": "integer"},
+        },
+        "type": "object",
+    }
+
+
+def test_response_schemas_have_no_references_or_titles():
+    ledger_type = CogenticProgressLedger.with_speakers(["Alice", "Bob"])
+
+    for model in (ledger_type, CogenticPlanPatch):
+        compiled = json.loads(response_schema(model))
+        nodes = list(_walk(compiled))[1:]
+        assert not any("$ref" in node or "title" in node for node in nodes)
+        assert "#/$defs" not in response_schema(model)
+
+
+def test_response_schemas_are_compact_and_cached():
+    ledger_type = CogenticProgressLedger.with_speakers(["Alice", "Bob"])
+    full = json.dumps(ledger_type.model_json_schema(), indent=2)
+
+    assert len(response_schema(ledger_type)) < len(full) / 2
+    # Speaker types are reused, so their schemas are only compiled once
+    assert CogenticProgressLedger.with_speakers(["Alice", "Bob"]) is ledger_type
+    assert response_schema(ledger_type) is response_schema(ledger_type)
+
+
+def test_recursive_models_are_rejected():
+    with pytest.raises(ValueError, match="recursive"):
+        compile_schema(Node.model_json_schema())
+
+
+def test_optional_models_collapse_to_a_list_of_types():
+    class Holder(BaseModel):
+        inner: Optional[Inner] = Field(description="Maybe an inner value")
+
+    compiled = compile_schema(Holder.model_json_schema())
+
+    assert compiled["properties"]["inner"]["type"] == ["object", "null"]
+    assert compiled["properties"]["inner"]["description"] == "Maybe an inner value"
+    assert "choice" in compiled["properties"]["inner"]["properties"]
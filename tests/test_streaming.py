@@ -0,0 +1,42 @@
+import pytest
+from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.base import TaskResult
+from autogen_agentchat.messages import ModelClientStreamingChunkEvent, TextMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from cogentic import CogenticGroupChat
+
+
+@pytest.mark.asyncio
+async def test_stream_output_publishes_reasoning_chunks(adder_run):
+    model_client = ReplayChatCompletionClient(
+        adder_run.model_responses(final_answer="The sum of 33 and 22 is 55")
+    )
+    json_model_client = ReplayChatCompletionClient(adder_run.json_responses())
+    adder = AssistantAgent("Adder", model_client=ReplayChatCompletionClient(["55"]))
+    team = CogenticGroupChat(
+        participants=[adder],
+        model_client=model_client,
+        json_model_client=json_model_client,
+        stream_output=True,
+    )
+
+    stream = [message async for message in team.run_stream(task=adder_run.task)]
+
+    result = stream[-1]
+    assert isinstance(result, TaskResult)
+    chunks = [m for m in stream if isinstance(m, ModelClientStreamingChunkEvent)]
+    assert all(chunk.source == "CogenticOrchestrator" for chunk in chunks)
+    streamed = "".join(chunk.content for chunk in chunks)
+    assert "Evidence" in streamed
+    assert "The sum of 33 and 22 is 55" in streamed
+    # The final answer's reasoning is streamed before the final answer itself
+    final_answer = next(
+        i
+        for i, m in enumerate(stream)
+        if isinstance(m, TextMessage) and m.source == "CogenticOrchestrator"
+    )
+    assert isinstance(stream[final_answer - 1], ModelClientStreamingChunkEvent)
+    assert not any(
+        isinstance(m, ModelClientStreamingChunkEvent) for m in result.messages
+    )
@@ -0,0 +1,131 @@
+import httpx
+import pytest
+from autogen_core.models import ModelInfo, UserMessage
+
+from cogentic import CogenticGroupChat
+from cogentic.llm import (
+    CogenticClientPool,
+    CogenticModelRegistry,
+    ModelDetails,
+    get_model_client,
+)
+from cogentic.testing import (
+    CogenticFakeParticipant,
+    CogenticFakeScenario,
+    CogenticStubServer,
+    CogenticStubServerConfig,
+)
+
+# What Azure reports for gpt-4o, which autogen checks against the model name
+MODEL_VERSION = "gpt-4o-2024-08-06"
+CHAT_COMPLETIONS = (
+    "/openai/deployments/gpt-4o/chat/completions?api-version=2024-12-01-preview"
+)
+
+
+def _registry(server: CogenticStubServer) -> CogenticModelRegistry:
+    return CogenticModelRegistry(
+        [
+            ModelDetails(
+                name="gpt-4o",
+                info=ModelInfo(
+                    family="gpt-4o",
+                    vision=True,
+                    function_calling=True,
+                    json_output=True,
+                ),
+                endpoint=server.endpoint,
+                api_key="test",
+            )
+        ]
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stream_output", [False, True])
+async def test_runs_through_the_model_client_stack(stream_output):
+    config = CogenticStubServerConfig(
+        model=MODEL_VERSION,
+        scenario=CogenticFakeScenario(hypotheses=1, tests_per_hypothesis=1),
+    )
+    pool = CogenticClientPool()
+    async with CogenticStubServer(config) as server:
+        model_client = get_model_client("gpt-4o", pool=pool, registry=_registry(server))
+        team = CogenticGroupChat(
+            participants=[CogenticFakeParticipant("Alice")],
+            model_client=model_client,
+            stream_output=stream_output,
+        )
+
+        result = await team.run(task="[run 1] What is the answer?")
+        await pool.close()
+
+    assert result.stop_reason and result.stop_reason.startswith("No work remaining")
+    assert server.stats.requests > 0
+    assert bool(server.stats.streamed) == stream_output
+    assert model_client.total_usage().completion_tokens > 0
+
+
+@pytest.mark.asyncio
+async def test_runs_get_their_own_scenario():
+    config = CogenticStubServerConfig(
+        model=MODEL_VERSION,
+        scenario=CogenticFakeScenario(hypotheses=1, tests_per_hypothesis=1),
+    )
+    pool = CogenticClientPool()
+    async with CogenticStubServer(config) as server:
+        model_client = get_model_client("gpt-4o", pool=pool, registry=_registry(server))
+        teams = [
+            CogenticGroupChat(
+                participants=[CogenticFakeParticipant("Alice")],
+                model_client=model_client,
+            )
+            for _ in range(2)
+        ]
+        results = [
+            await team.run(task=f"[run {i}] What is the answer?")
+            for i, team in enumerate(teams)
+        ]
+        await pool.close()
+
+    assert all(
+        result.stop_reason and result.stop_reason.startswith("No work remaining")
+        for result in results
+    )
+
+
+@pytest.mark.asyncio
+async def test_injects_throttling_and_errors():
+    async with CogenticStubServer(
+        CogenticStubServerConfig(throttle_rate=1.0, retry_after=7)
+    ) as server:
+        async with httpx.AsyncClient(base_url=server.endpoint) as client:
+            body = {"messages": [{"role": "user", "content": "Hi"}]}
+            throttled = await client.post(CHAT_COMPLETIONS, json=body)
+            server.config.throttle_rate = 0.0
+            server.config.error_rate = 1.0
+            failed = await client.post(CHAT_COMPLETIONS, json=body)
+            server.config.error_rate = 0.0
+            ok = await client.post(CHAT_COMPLETIONS, json=body)
+            missing = await client.post("/v1/embeddings", json=body)
+
+    assert throttled.status_code == 429
+    assert throttled.headers["retry-after"] == "7"
+    assert failed.status_code == 500
+    assert ok.json()["choices"][0]["message"]["content"]
+    assert missing.status_code == 404
+    assert server.stats.throttled == 1
+    assert server.stats.errors == 1
+
+
+@pytest.mark.asyncio
+async def test_reasoning_text_is_served():
+    pool = CogenticClientPool()
+    async with CogenticStubServer(
+        CogenticStubServerConfig(model=MODEL_VERSION)
+    ) as server:
+        model_client = get_model_client("gpt-4o", pool=pool, registry=_registry(server))
+        result = await model_client.create([UserMessage(content="Hi", source="user")])
+        await pool.close()
+
+    assert isinstance(result.content, str) and result.content
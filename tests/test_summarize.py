@@ -0,0 +1,153 @@
+import json
+
+import pytest
+from autogen_core import ComponentModel
+from autogen_core.models import UserMessage
+
+from cogentic import CogenticGroupChat
+from cogentic.orchestration import CogenticSummaryOptions
+from cogentic.orchestration.summarize import outline_structured, split_by_tokens
+from cogentic.testing import (
+    CogenticFakeChatCompletionClient,
+    CogenticFakeParticipant,
+)
+
+
+def _team(client, response: str, **kwargs) -> CogenticGroupChat:
+    return CogenticGroupChat(
+        participants=[CogenticFakeParticipant("Alice", responses=[response])],
+        model_client=client,
+        **kwargs,
+    )
+
+
+def test_split_by_tokens_keeps_lines_together():
+    text = "".join(f"line {i}\n" for i in range(100))
+
+    chunks = split_by_tokens(text, tokens=200, max_tokens=50)
+
+    assert "".join(chunks) == text
+    assert len(chunks) in (4, 5)
+    assert all(chunk.endswith("\n") for chunk in chunks)
+    # Lines longer than a chunk are split where they are
+    assert split_by_tokens("x" * 10, tokens=10, max_tokens=4) == ["xxxx", "xxxx", "xx"]
+
+
+def test_outline_structured():
+    items = [{"name": f"item-{i}", "text": "y" * 500} for i in range(10)]
+
+    outlined = outline_structured(json.dumps({"items": items}))
+    assert outlined is not None
+    outline = json.loads(outlined)
+
+    assert len(outline["items"]) == 4
+    assert outline["items"][3] == "... 7 more items"
+    assert outline["items"][0]["text"] == "y" * 200 + "..."
+    assert outline_structured("Not JSON") is None
+    assert outline_structured("{broken") is None
+
+
+@pytest.mark.asyncio
+async def test_long_responses_are_summarized_in_chunks(recording_client):
+    client = recording_client(delay=0.01)
+    # 100 lines of 400 characters
+    response = "".join(f"Paragraph {i:03d}: {'z' * 384}\n" for i in range(100))
+    team = _team(
+        client,
+        response,
+        summary_options=CogenticSummaryOptions(chunk_tokens=2000, max_concurrency=2),
+    )
+
+    result = await team.run(task="What is the answer?")
+
+    assert result.stop_reason and result.stop_reason.startswith("No work remaining")
+    # 10k tokens, in chunks of 2k tokens
+    chunk_prompts = client.prompts_containing("## Response Part")
+    assert len(chunk_prompts) == 5
+    assert "Part 1 of 5" in chunk_prompts[0]
+    assert len(client.prompts_containing("## Summaries")) == 1
+    assert client.max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_summaries_which_dont_shrink_are_truncated(recording_client, monkeypatch):
+    client = recording_client()
+    respond = client.respond
+
+    def echo(messages, extra_create_args={}):
+        # Summaries repeat their whole prompt, so they never shrink
+        if client._schema(messages, extra_create_args) is None:
+            return str(messages[-1].content)
+        return respond(messages, extra_create_args)
+
+    monkeypatch.setattr(client, "respond", echo)
+    response = "".join(f"Paragraph {i:03d}: {'z' * 384}\n" for i in range(100))
+    team = _team(
+        client,
+        response,
+        summary_options=CogenticSummaryOptions(chunk_tokens=2000, max_reduce_depth=1),
+    )
+
+    result = await team.run(task="What is the answer?")
+
+    assert result.stop_reason and result.stop_reason.startswith("No work remaining")
+
+    def prompts_ending(text: str) -> list[str]:
+        # Later prompts repeat the echoed summaries, so only count those asking for them
+        return [prompt for prompt in client.prompts if prompt.rstrip().endswith(text)]
+
+    # The 5 chunks, then the chunks of their summaries, and a single final call
+    chunk_prompts = prompts_ending(
+        "summarize this part of their response in a concise manner."
+    )
+    combine_prompts = prompts_ending(
+        "combine the summaries into a single concise summary of their response."
+    )
+    assert 5 < len(chunk_prompts) <= 12
+    assert len(combine_prompts) == 1
+    assert (
+        client.count_tokens([UserMessage(content=combine_prompts[0], source="user")])
+        <= 2000 * 1.1
+    )
+
+
+@pytest.mark.asyncio
+async def test_small_and_structured_responses_are_not_sent_to_the_model(
+    recording_client,
+):
+    for response in ["Done.", json.dumps([{"row": i} for i in range(1000)])]:
+        client = recording_client()
+        team = _team(client, response, summary_options=CogenticSummaryOptions())
+
+        result = await team.run(task="What is the answer?")
+
+        assert result.stop_reason and result.stop_reason.startswith("No work remaining")
+        assert not client.prompts_containing("summarize their response")
+        assert not client.prompts_containing("## Response Part")
+
+
+@pytest.mark.asyncio
+async def test_responses_are_summarized_at_once_by_default(recording_client):
+    client = recording_client()
+    team = _team(client, "Done. " * 10000)
+
+    await team.run(task="What is the answer?")
+
+    assert len(client.prompts_containing("Now, summarize their response")) == 1
+    assert not client.prompts_containing("## Response Part")
+
+
+def test_summary_options_round_trip_in_the_team_config():
+    team = _team(
+        CogenticFakeChatCompletionClient(),
+        "Done.",
+        summary_options=CogenticSummaryOptions(chunk_tokens=1000),
+    )
+    config = team.dump_component()
+
+    loaded = CogenticGroupChat.load_component(
+        ComponentModel.model_validate_json(config.model_dump_json())
+    )
+
+    assert loaded.dump_component() == config
+    assert loaded._summary_options == CogenticSummaryOptions(chunk_tokens=1000)
@@ -0,0 +1,55 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
+import pytest
+
+from cogentic.llm.tokens import CogenticTokenManager
+
+
+@dataclass
+class Token:
+    token: str
+    expires_on: int
+
+
+class FakeCredential:
+    def __init__(self, lifetime: float):
+        self.lifetime = lifetime
+        self.calls = 0
+
+    async def get_token(self, *scopes: str, **kwargs) -> Token:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return Token(f"token-{self.calls}", int(time.time() + self.lifetime))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_refresh():
+    credential = FakeCredential(lifetime=3600)
+    manager = CogenticTokenManager(credential)
+
+    tokens = await asyncio.gather(*(manager.get_token("scope") for _ in range(50)))
+
+    assert set(tokens) == {"token-1"}
+    assert credential.calls == 1
+    (metrics,) = manager.snapshot()
+    assert metrics.refreshes == 1
+    assert metrics.latency.count == 1
+    assert metrics.latency.sum >= 0.05
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_tokens_are_refreshed_in_the_background():
+    # Expires within `refresh_before`, but outside `expiry_margin`
+    credential = FakeCredential(lifetime=300)
+    manager = CogenticTokenManager(credential, refresh_before=600, expiry_margin=60)
+
+    assert await manager.get_token("scope") == "token-1"
+    # Served from the cache, while a refresh starts in the background
+    assert await manager.get_token("scope") == "token-1"
+    await asyncio.sleep(0.1)
+    assert await manager.get_token("scope") == "token-2"
+    assert manager.snapshot()[0].background_refreshes >= 1
+    await manager.close()
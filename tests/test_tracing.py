@@ -0,0 +1,55 @@
+import json
+
+import pytest
+from autogen_agentchat.agents import AssistantAgent
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from cogentic import CogenticGroupChat
+from cogentic.orchestration.tracing import CogenticTracer
+
+
+@pytest.mark.asyncio
+async def test_tracer_records_orchestrator_phases(tmp_path, adder_run):
+    model_client = ReplayChatCompletionClient(adder_run.model_responses())
+    json_model_client = ReplayChatCompletionClient(adder_run.json_responses())
+    adder = AssistantAgent("Adder", model_client=ReplayChatCompletionClient(["55"]))
+    tracer = CogenticTracer()
+
+    team = CogenticGroupChat(
+        participants=[adder],
+        model_client=model_client,
+        json_model_client=json_model_client,
+        tracer=tracer,
+    )
+    await team.run(task=adder_run.task)
+
+    trace_path = tmp_path / "trace.json"
+    tracer.export_chrome_trace(trace_path)
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    spans = [event for event in events if event["ph"] == "X"]
+    names = {span["name"] for span in spans}
+    assert {
+        "handle_start",
+        "next_step",
+        "agent_turn",
+        "summarize_action",
+        "progress_ledger",
+        "final_answer",
+        "validate",
+    } <= names
+    agent_turn = next(span for span in spans if span["name"] == "agent_turn")
+    assert agent_turn["args"] == {"agent": "Adder"}
+    # Every span from the run sits on the same named track
+    assert len({span["tid"] for span in spans}) == 1
+    assert any(
+        event["ph"] == "M" and event["args"]["name"].startswith("CogenticOrchestrator/")
+        for event in events
+    )
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = CogenticTracer(enabled=False)
+    with tracer.span("phase"):
+        pass
+    assert tracer.start_span("phase") is None
+    assert tracer.to_chrome_trace()["traceEvents"] == []